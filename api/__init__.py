@@ -3,5 +3,14 @@ api 패키지
 
 REST API 서버 관련 모듈을 포함합니다:
 - api_server: FastAPI 서버
+- executors: 블로킹 작업용 스레드/프로세스 풀
+- response_cache: DB 버전 기반 응답 캐시
+- export: NDJSON 스트리밍 내보내기
+- request_metrics: 라우트별 요청 지연 시간 미들웨어 및 /metrics 본문 생성
+- responses: 빠른 JSON 직렬화 (FastJSONResponse)
+- compression: gzip/brotli 응답 압축 미들웨어
+- admission: 비싼 엔드포인트 동시 실행 제한 및 부하 차단
+- benchmark_responses: 응답 직렬화/압축 벤치마크
+- launcher: 멀티 워커 운영 실행기 (fork 전 미리 로드로 메모리 공유)
 - test_api: API 테스트
 """
@@ -0,0 +1,195 @@
+"""
+엔드포인트 동시 실행 제한(admission control) 모듈
+
+부정 리뷰 전체 분석, 리포트 메일 전송처럼 비싼 요청이 한꺼번에 몰리면 CPU와 작업 풀을 모두
+차지해 추천 같은 가벼운 엔드포인트까지 시간 초과가 납니다. 라우트별로 동시에 실행할 요청 수와
+대기열 길이를 제한하고, 넘치는 요청은 오래 붙잡지 않고 바로 거절(부하 차단)합니다.
+
+- 실행 슬롯이 없으면 최대 queue_size개까지 대기열에서 기다립니다.
+- 대기열도 가득 차 있으면 즉시 429 Too Many Requests를 반환합니다.
+- 대기열에서 queue_timeout초 안에 슬롯을 얻지 못하면 503 Service Unavailable을 반환합니다.
+- 두 경우 모두 최근 처리 시간으로 추정한 Retry-After 헤더를 붙입니다.
+- 제한은 프로세스(API 워커)별로 적용됩니다 (api.launcher 워커가 N개면 서버 전체로는 N배).
+"""
+import asyncio
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, List, Sequence
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from src.metrics import metric_lines
+
+
+# 부정 리뷰 분석 동시 실행 수 / 대기열 길이
+NEGATIVE_ANALYSIS_CONCURRENCY = int(os.getenv('NEGATIVE_ANALYSIS_CONCURRENCY', '2'))
+NEGATIVE_ANALYSIS_QUEUE_SIZE = int(os.getenv('NEGATIVE_ANALYSIS_QUEUE_SIZE', '4'))
+
+# 리포트 메일 전송 동시 실행 수 / 대기열 길이
+SEND_REPORT_CONCURRENCY = int(os.getenv('SEND_REPORT_CONCURRENCY', '1'))
+SEND_REPORT_QUEUE_SIZE = int(os.getenv('SEND_REPORT_QUEUE_SIZE', '2'))
+
+# 대기열에서 실행 슬롯을 기다리는 최대 시간 (초, 지나면 503)
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv('ADMISSION_QUEUE_TIMEOUT', '10'))
+
+# Retry-After 최대값 (초)
+MAX_RETRY_AFTER = 60
+
+# 처리 시간 이동 평균 가중치 (Retry-After 추정용)
+SERVICE_TIME_SMOOTHING = 0.2
+
+
+class AdmissionLimiter:
+    """라우트 하나의 동시 실행 수와 대기열 길이를 제한하는 클래스 (이벤트 루프 안에서 사용)"""
+
+    def __init__(self, name: str, concurrency: int, queue_size: int,
+                 queue_timeout: float = ADMISSION_QUEUE_TIMEOUT):
+        """
+        AdmissionLimiter 초기화
+
+        Args:
+            name (str): 라우트 이름 (메트릭 라벨)
+            concurrency (int): 동시에 실행할 수 있는 요청 수
+            queue_size (int): 실행 슬롯을 기다릴 수 있는 요청 수 (0이면 대기 없이 거절)
+            queue_timeout (float): 대기열에서 기다리는 최대 시간 (초)
+        """
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.queue_size = max(0, queue_size)
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = {'queue_full': 0, 'timeout': 0}
+        # 요청 하나의 평균 처리 시간 (초, 첫 요청 전에는 1초로 가정)
+        self._service_seconds = 1.0
+
+    def retry_after(self) -> int:
+        """
+        대기 중인 요청이 모두 처리될 때까지의 예상 시간
+
+        Returns:
+            int: Retry-After 값 (초, 1 ~ MAX_RETRY_AFTER)
+        """
+        seconds = self._service_seconds * (self.waiting + 1) / self.concurrency
+        return min(MAX_RETRY_AFTER, max(1, math.ceil(seconds)))
+
+    def _reject(self, reason: str, status_code: int, detail: str):
+        """거절 횟수를 기록하고 Retry-After가 붙은 HTTPException 발생"""
+        self.rejected[reason] += 1
+        raise HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(self.retry_after())}
+        )
+
+    async def acquire(self) -> float:
+        """
+        실행 슬롯 획득 (대기열이 비면 바로, 아니면 queue_timeout초까지 대기)
+
+        받아들일지는 await 전에 카운터로 바로 결정하므로, 같은 이벤트 루프 틱에
+        몰려 들어온 요청도 concurrency + queue_size개를 넘으면 즉시 거절됩니다.
+
+        Returns:
+            float: 슬롯 획득 시각 (release에 전달)
+
+        Raises:
+            HTTPException: 대기열이 가득 차면 429, 대기 시간이 지나면 503 (Retry-After 포함)
+        """
+        if self.active + self.waiting >= self.concurrency + self.queue_size:
+            self._reject('queue_full', 429,
+                         "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.")
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._reject('timeout', 503,
+                         "서버가 혼잡하여 요청을 처리하지 못했습니다. "
+                         "잠시 후 다시 시도해주세요.")
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        return time.perf_counter()
+
+    def release(self, start: float):
+        """
+        실행 슬롯 반환 및 처리 시간 기록
+
+        Args:
+            start (float): acquire가 반환한 슬롯 획득 시각
+        """
+        self.active -= 1
+        self._semaphore.release()
+        self._service_seconds += SERVICE_TIME_SMOOTHING * (
+            time.perf_counter() - start - self._service_seconds
+        )
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        실행 슬롯 획득 (블록 안에서 비싼 작업 실행)
+
+        Raises:
+            HTTPException: 대기열이 가득 차면 429, 대기 시간이 지나면 503 (Retry-After 포함)
+        """
+        start = await self.acquire()
+        try:
+            yield
+        finally:
+            self.release(start)
+
+
+class SlotStreamingResponse(StreamingResponse):
+    """본문 전송이 끝나거나 중단될 때 실행 슬롯을 반환하는 스트리밍 응답 클래스"""
+
+    def __init__(self, content, release: Callable[[], None], **kwargs):
+        """
+        SlotStreamingResponse 초기화
+
+        Args:
+            content: 본문 비동기 이터레이터
+            release: 슬롯 반환 함수 (응답 전송 후 한 번 호출)
+            **kwargs: StreamingResponse 인자 (media_type 등)
+        """
+        super().__init__(content, **kwargs)
+        self._release = release
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._release()
+
+
+def admission_metric_lines(limiters: Sequence[AdmissionLimiter]) -> List[str]:
+    """
+    라우트별 실행 중/대기 중 요청 수와 거절 횟수 메트릭
+
+    Args:
+        limiters: AdmissionLimiter 목록
+
+    Returns:
+        List[str]: Prometheus 텍스트 형식 줄
+    """
+    lines = metric_lines(
+        'review_admission_in_flight', 'Requests executing on admission-limited routes.',
+        'gauge', [({'route': limiter.name}, limiter.active) for limiter in limiters]
+    )
+    lines += metric_lines(
+        'review_admission_queued',
+        'Requests waiting for an execution slot on admission-limited routes.',
+        'gauge', [({'route': limiter.name}, limiter.waiting) for limiter in limiters]
+    )
+    lines += metric_lines(
+        'review_admission_rejected_total',
+        'Requests shed by admission control (429 queue_full, 503 timeout).',
+        'counter',
+        [({'route': limiter.name, 'reason': reason}, count)
+         for limiter in limiters for reason, count in limiter.rejected.items()]
+    )
+    return lines
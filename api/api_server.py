@@ -3,23 +3,62 @@ FastAPI 기반 추천 시스템 REST API
 
 Phase 3 추천 시스템을 JSON 형태로 제공하는 RESTful API 서버입니다.
 """
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from typing import Any, List, Optional, Dict, Tuple
 import uvicorn
+from contextlib import asynccontextmanager
 from datetime import datetime
+import asyncio
 import os
+import pickle
+import sqlite3
 import sys
+import time
 from pathlib import Path
 
 # 프로젝트 루트를 Python 경로에 추가
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.recommendation_system import RecommendationSystem
-from src.analyze_negative_reviews import NegativeReviewAnalyzer
+from src.recommender_snapshot import SnapshotManager
+from src.recommendation_system import create_recommender_from_env
+from src.product_stats import load_product_stats
+from src.db import REVIEW_DB_PATH, get_connection
 from emailer.email_reporter import EmailReporter
+from api.executors import BlockingExecutors, improvement_priority_products
+from api.response_cache import ResponseCache
+from api.responses import FastJSONResponse
+from api.compression import CompressionMiddleware
+from api.admission import (
+    NEGATIVE_ANALYSIS_CONCURRENCY, NEGATIVE_ANALYSIS_QUEUE_SIZE,
+    SEND_REPORT_CONCURRENCY, SEND_REPORT_QUEUE_SIZE,
+    AdmissionLimiter, SlotStreamingResponse, admission_metric_lines
+)
+from api.export import (
+    EXPORT_CHUNK_SIZE, NDJSON_MEDIA_TYPE, customer_id_page, recommendation_rows,
+    stream_recommendations, stream_rows
+)
+from src.analyze_negative_reviews import NegativeReviewAnalyzer
+from src.job_queue import JOB_STATUSES, JOB_TYPES, JobQueue
+from src.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE, metric_lines, record_stages
+)
+from api.request_metrics import RequestMetricsMiddleware, render_metrics
+from src.job_worker import JobWorkerPool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    서버 수명 주기 관리 (시작 시 startup_event, 종료 시 shutdown_event)
+    """
+    await startup_event()
+    try:
+        yield
+    finally:
+        await shutdown_event()
 
 
 # FastAPI 앱 초기화
@@ -28,20 +67,124 @@ app = FastAPI(
     description="고객 리뷰 분석, 부정 키워드 집계, 상품 추천 기능을 제공하는 REST API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
+)
+
+# 큰 응답 본문 gzip/brotli 압축 (Accept-Encoding 협상, COMPRESSION_MIN_SIZE 이상)
+app.add_middleware(CompressionMiddleware)
+
+# 라우트별 요청 지연 시간 기록 (/metrics, 압축 시간 포함)
+app.add_middleware(RequestMetricsMiddleware)
+
+# 전역 인스턴스 (추천 시스템은 스냅샷 관리자를 통해 교체됨)
+snapshots = SnapshotManager(lambda: create_recommender_from_env(REVIEW_DB_PATH))
+profile_refresh_task = None
+
+# 추천 스냅샷 로드/형태소 분석기 초기화 백그라운드 작업과 실패 여부 (/ready)
+warmup_task = None
+warmup_failed = False
+
+# 스냅샷 로드/갱신 실패로 처리하는 예외 (DB/파일 오류, 손상되었거나 형식이 다른 아티팩트)
+SNAPSHOT_LOAD_ERRORS = (sqlite3.Error, OSError, pickle.UnpicklingError, ValueError)
+
+# 블로킹 작업용 스레드/프로세스 풀 (API_THREAD_POOL_SIZE, API_PROCESS_POOL_SIZE)
+executors = BlockingExecutors()
+
+# DB 버전 토큰을 키로 하는 응답 캐시 (ETag/304 지원)
+response_cache = ResponseCache(REVIEW_DB_PATH)
+
+# 비싼 엔드포인트의 동시 실행 제한 (넘치는 요청은 429/503 + Retry-After로 바로 거절)
+negative_analysis_limiter = AdmissionLimiter(
+    'negative-analysis', NEGATIVE_ANALYSIS_CONCURRENCY, NEGATIVE_ANALYSIS_QUEUE_SIZE
 )
+send_report_limiter = AdmissionLimiter(
+    'send-report', SEND_REPORT_CONCURRENCY, SEND_REPORT_QUEUE_SIZE
+)
+
+# 신규 리뷰를 상품 프로필에 증분 반영하는 주기 (초, 0이면 비활성화)
+PROFILE_REFRESH_INTERVAL = int(os.getenv('PROFILE_REFRESH_INTERVAL', '60'))
+
+# 배치 추천 요청 한 번에 받을 최대 고객 수
+BATCH_MAX_CUSTOMERS = int(os.getenv('BATCH_MAX_CUSTOMERS', '1000'))
 
-# 전역 인스턴스
-recommender = None
-analyzer = None
+# API 서버와 함께 실행하는 백그라운드 작업 워커 프로세스 수 (0이면 별도 실행한 워커만 사용)
+API_JOB_WORKERS = int(os.getenv('API_JOB_WORKERS', '1'))
+
+# 백그라운드 작업 큐와 워커 (서버 시작 시 생성)
+job_queue = None
+job_workers = JobWorkerPool(API_JOB_WORKERS, db_path=REVIEW_DB_PATH)
 
 
 # Pydantic 모델 정의
+class KeywordWeight(BaseModel):
+    """키워드와 프로필 가중치"""
+    keyword: str
+    weight: float
+
+
+class KeywordCount(BaseModel):
+    """키워드와 출현 빈도"""
+    keyword: str
+    count: int
+
+
+class RecommendedProduct(BaseModel):
+    """추천/유사 상품 항목 (해싱 모드에서는 top_keywords가 빈 리스트)"""
+    product_id: int
+    product_name: str
+    category: str
+    similarity_score: float
+    average_rating: float
+    review_count: int
+    top_keywords: List[KeywordWeight]
+
+
+class PriorityProduct(BaseModel):
+    """개선 우선순위 상품 항목"""
+    product_id: int
+    product_name: str
+    category: str
+    total_negative_keyword_count: int
+    negative_review_count: int
+    total_review_count: int
+    average_rating: float
+    negative_ratio: float
+    top_negative_keywords: List[KeywordCount]
+    problem_categories: Dict[str, List[KeywordCount]]
+
+
 class RecommendationResponse(BaseModel):
     """추천 응답 모델"""
     customer_id: int
-    recommendations: List[Dict]
+    recommendations: List[RecommendedProduct]
+    total_count: int
+    generated_at: str
+    strategy: str = "personalized"
+
+
+class BatchRecommendationRequest(BaseModel):
+    """배치 추천 요청 모델"""
+    customer_ids: List[int] = Field(..., min_length=1, max_length=BATCH_MAX_CUSTOMERS,
+                                    description=f"고객 ID 목록 (최대 {BATCH_MAX_CUSTOMERS}명)")
+    top_n: int = Field(default=5, ge=1, le=20, description="고객별 추천 상품 개수 (1-20)")
+    exclude_purchased: bool = Field(default=True, description="이미 리뷰 작성한 상품 제외 여부")
+    engine: str = Field(default="keyword", pattern="^(keyword|als)$",
+                        description="추천 엔진 (keyword: 키워드 프로필, als: 잠재 요인)")
+
+
+class CustomerRecommendations(BaseModel):
+    """배치 추천 응답의 고객별 항목"""
+    customer_id: int
+    recommendations: List[RecommendedProduct]
     total_count: int
+    strategy: str
+
+
+class BatchRecommendationResponse(BaseModel):
+    """배치 추천 응답 모델"""
+    results: List[CustomerRecommendations]
+    total_customers: int
     generated_at: str
 
 
@@ -49,7 +192,79 @@ class NegativeAnalysisResponse(BaseModel):
     """부정 리뷰 분석 응답 모델"""
     generated_at: str
     total_products_analyzed: int
-    improvement_priority_list: List[Dict]
+    improvement_priority_list: List[PriorityProduct]
+
+
+class NegativeAnalysisJobParams(BaseModel):
+    """negative-analysis 작업 파라미터 모델"""
+    model_config = ConfigDict(extra='forbid')
+    top_n: int = Field(default=5, ge=1, le=50, description="분석할 상품 개수 (1-50)")
+
+
+class SendReportJobParams(BaseModel):
+    """send-report 작업 파라미터 모델"""
+    model_config = ConfigDict(extra='forbid')
+    recipient_email: str = Field(..., pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$",
+                                 description="수신자 이메일 주소")
+    attach_raw_data: bool = Field(default=False, description="JSON 원본 데이터 첨부 여부")
+
+
+# 작업 종류 → 파라미터 모델 (src.job_queue.JOB_TYPES와 같은 키)
+JOB_PARAM_MODELS = {
+    'negative-analysis': NegativeAnalysisJobParams,
+    'send-report': SendReportJobParams,
+}
+
+
+class JobRequest(BaseModel):
+    """백그라운드 작업 등록 요청 모델"""
+    job_type: str = Field(..., pattern=f"^({'|'.join(JOB_TYPES)})$",
+                          description="작업 종류 (negative-analysis, send-report)")
+    params: Dict = Field(default_factory=dict,
+                         description="작업 파라미터 (negative-analysis: top_n, "
+                                     "send-report: recipient_email, attach_raw_data)")
+
+    def validated_params(self) -> Dict:
+        """
+        작업 종류별 파라미터 모델로 타입/범위를 검증하고 기본값을 채운 파라미터
+
+        Returns:
+            Dict: 검증된 파라미터
+
+        Raises:
+            ValueError: 파라미터가 올바르지 않은 경우 (API에서 400으로 변환)
+        """
+        try:
+            params = JOB_PARAM_MODELS[self.job_type].model_validate(self.params)
+        except ValidationError as e:
+            errors = '; '.join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                for error in e.errors()
+            )
+            raise ValueError(f"{self.job_type} 작업 파라미터가 올바르지 않습니다 ({errors})")
+        return params.model_dump()
+
+
+class JobResponse(BaseModel):
+    """백그라운드 작업 상태 응답 모델"""
+    job_id: str
+    job_type: str
+    status: str
+    params: Dict
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    attempts: int
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+class SimilarProductsResponse(BaseModel):
+    """유사 상품 응답 모델"""
+    product_id: int
+    similar_products: List[RecommendedProduct]
+    total_count: int
+    generated_at: str
 
 
 class HealthResponse(BaseModel):
@@ -57,6 +272,7 @@ class HealthResponse(BaseModel):
     status: str
     message: str
     timestamp: str
+    snapshot: Optional[Dict] = None
 
 
 class ErrorResponse(BaseModel):
@@ -66,42 +282,115 @@ class ErrorResponse(BaseModel):
     timestamp: str
 
 
-@app.on_event("startup")
 async def startup_event():
     """
-    서버 시작 시 추천 시스템 및 분석기 초기화
-    """
-    global recommender, analyzer
+    서버 시작 시 작업 풀/작업 워커를 시작하고 추천 시스템 워밍업을 백그라운드로 예약
     
+    프로필 로드(캐시가 없으면 전체 생성)와 Kiwi 초기화를 기다리지 않고 바로 포트를 열며,
+    /health(liveness)는 즉시, /ready(readiness)는 워밍업이 끝난 뒤 200을 반환합니다.
+    """
     print("=" * 80)
     print("추천 시스템 API 서버 초기화 중...")
     print("=" * 80)
     
-    # 추천 시스템 초기화
-    recommender = RecommendationSystem()
+    # 블로킹 작업 풀 (부정 리뷰 분석기는 프로세스 풀 워커마다 처음 요청 시 초기화)
+    executors.start()
+    print(f"✓ 작업 풀 준비 완료 (스레드: {executors.thread_workers}개, "
+          f"프로세스: {executors.process_workers}개)")
     
-    # 캐시된 프로필 로드 (없으면 생성)
-    if os.path.exists('cache/product_profiles.pkl'):
-        recommender.load_profiles()
-        print("✓ 상품 프로필 캐시 로드 완료")
-    else:
-        print("⚠️  캐시가 없습니다. 상품 프로필을 새로 생성합니다...")
-        recommender.build_all_product_profiles()
-        recommender.save_profiles()
-        print("✓ 상품 프로필 생성 및 저장 완료")
+    # 백그라운드 작업 큐 (재시작 후에도 대기 작업 유지) 및 워커 프로세스
+    global job_queue
+    job_queue = JobQueue()
+    job_workers.start()
+    print(f"✓ 백그라운드 작업 워커 시작 ({job_workers.workers}개, 큐: {job_queue.db_path})")
     
-    # 부정 리뷰 분석기 초기화
-    analyzer = NegativeReviewAnalyzer()
-    print("✓ 부정 리뷰 분석기 초기화 완료")
+    # 추천 스냅샷 로드와 형태소 분석기 초기화는 백그라운드에서 (끝나면 스냅샷 갱신 시작)
+    global warmup_task
+    warmup_task = asyncio.create_task(warm_up())
+    print("✓ 추천 시스템 워밍업 시작 (준비 상태: /ready)")
     
     print("=" * 80)
-    print("✅ API 서버 준비 완료!")
+    print("✅ API 서버 시작 완료! (liveness: /health, readiness: /ready)")
     print("=" * 80)
     print("📖 API 문서: http://localhost:8000/docs")
     print("📖 ReDoc 문서: http://localhost:8000/redoc")
     print("=" * 80)
 
 
+async def shutdown_event():
+    """
+    서버 종료 시 워밍업/스냅샷 갱신 작업, 작업 풀, 작업 워커 정리
+    """
+    for task in (warmup_task, profile_refresh_task):
+        if task is not None:
+            task.cancel()
+    executors.shutdown()
+    job_workers.stop()
+
+
+async def warm_up():
+    """
+    추천 시스템 첫 스냅샷 로드와 Kiwi 초기화 백그라운드 작업
+    
+    캐시된 프로필을 로드하고(없으면 생성 후 저장, 설정은 환경변수로 선택) 형태소 분석기를
+    미리 초기화한 뒤 스냅샷 주기적 갱신을 시작합니다. 로드에 실패하면 사유는 서버 로그에만
+    남기고(/ready는 실패 여부만 보고) 스냅샷 갱신 작업이 다음 주기에 다시 생성합니다.
+    api.launcher가 fork 전에 스냅샷을 로드한 워커 프로세스는 그 스냅샷을 그대로 사용합니다.
+    """
+    global warmup_failed, profile_refresh_task
+    start = time.perf_counter()
+    try:
+        snapshot = snapshots.current or await asyncio.to_thread(snapshots.load)
+        await asyncio.to_thread(snapshot.recommender.cleaner.warm_up)
+        print(f"✅ 추천 시스템 준비 완료 ({time.perf_counter() - start:.1f}초)")
+    except SNAPSHOT_LOAD_ERRORS as e:
+        warmup_failed = True
+        print(f"⚠️  추천 시스템 워밍업 실패: {type(e).__name__}: {e}")
+    
+    if PROFILE_REFRESH_INTERVAL > 0:
+        profile_refresh_task = asyncio.create_task(refresh_profiles_periodically())
+        print(f"✓ 추천 스냅샷 갱신 예약 ({PROFILE_REFRESH_INTERVAL}초 간격)")
+
+
+def is_ready() -> bool:
+    """워밍업이 끝나고 활성 추천 스냅샷이 있으면 True"""
+    return (warmup_task is not None and warmup_task.done()
+            and snapshots.current is not None)
+
+
+def require_snapshot():
+    """
+    현재 추천 스냅샷 조회 (워밍업 중이면 503)
+    
+    Returns:
+        RecommenderSnapshot: 활성 스냅샷
+    """
+    snapshot = snapshots.current
+    if snapshot is None:
+        raise HTTPException(
+            status_code=503,
+            detail="추천 시스템을 준비 중입니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "5"}
+        )
+    return snapshot
+
+
+async def refresh_profiles_periodically():
+    """
+    새 추천 스냅샷을 주기적으로 만들어 교체하는 백그라운드 작업
+    
+    아티팩트가 다시 저장되었으면 새로 로드하고, 아니면 현재 스냅샷의 사본에
+    신규 리뷰를 증분 반영한 뒤 교체합니다 (진행 중인 요청은 이전 스냅샷 사용).
+    워밍업과 같은 예외는 로그만 남기고 다음 주기에 다시 시도하므로 작업이 멈추지 않습니다.
+    """
+    while True:
+        await asyncio.sleep(PROFILE_REFRESH_INTERVAL)
+        try:
+            await asyncio.to_thread(snapshots.refresh)
+        except SNAPSHOT_LOAD_ERRORS as e:
+            print(f"⚠️  추천 스냅샷 갱신 실패: {type(e).__name__}: {e}")
+
+
 @app.get("/", response_model=HealthResponse)
 async def root():
     """
@@ -117,41 +406,138 @@ async def root():
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """
-    헬스 체크 엔드포인트
+    헬스 체크 엔드포인트 (liveness, 워밍업 중에도 즉시 응답)
     """
+    snapshot = snapshots.current
     return HealthResponse(
         status="healthy",
         message="모든 시스템이 정상입니다.",
-        timestamp=datetime.now().isoformat()
+        timestamp=datetime.now().isoformat(),
+        snapshot=snapshot.info() if snapshot else None
+    )
+
+
+@app.get("/ready", response_model=HealthResponse,
+         responses={503: {"model": HealthResponse}})
+async def readiness_check():
+    """
+    준비 상태 엔드포인트 (readiness)
+    
+    추천 스냅샷 로드와 형태소 분석기 초기화가 끝났으면 200, 아직이면 503을 반환합니다.
+    오케스트레이터는 200이 된 뒤에만 트래픽을 보내면 됩니다.
+    """
+    snapshot = snapshots.current
+    if is_ready():
+        return HealthResponse(
+            status="ready",
+            message="요청을 처리할 준비가 되었습니다.",
+            timestamp=datetime.now().isoformat(),
+            snapshot=snapshot.info()
+        )
+    
+    if warmup_failed and snapshot is None:
+        message = "추천 시스템 워밍업 실패, 스냅샷 갱신 시 다시 시도합니다."
+    else:
+        message = "추천 시스템을 준비 중입니다."
+    return JSONResponse(
+        status_code=503,
+        content=HealthResponse(
+            status="starting",
+            message=message,
+            timestamp=datetime.now().isoformat(),
+            snapshot=snapshot.info() if snapshot else None
+        ).model_dump(),
+        headers={"Retry-After": "5"}
     )
 
 
+def recommend_with_fallback(recommender, customer_id: int, top_n: int,
+                            exclude_purchased: bool, engine: str,
+                            diversity: Optional[str]) -> Tuple[List[Dict], str]:
+    """
+    개인화 추천 실행 후 결과가 없으면 세그먼트 추천으로 대체 (블로킹, 스레드 풀에서 호출)
+    
+    구매 이력 인덱스로 긍정 리뷰(keyword 엔진) 또는 리뷰(als 엔진)가 없는 고객임을
+    알 수 있으면 개인화 추천(DB 조회/프로필 생성)을 건너뛰고 바로 세그먼트 추천을 반환합니다.
+    
+    Args:
+        recommender: 요청 시작 시점의 스냅샷 추천 시스템
+        customer_id (int): 고객 ID
+        top_n (int): 추천할 상품 개수
+        exclude_purchased (bool): 이미 구매한 상품 제외 여부
+        engine (str): 추천 엔진
+        diversity (str): 다양성 재정렬 방식
+    
+    Returns:
+        Tuple[List[Dict], str]: (추천 상품 목록, 추천 전략)
+    """
+    # 구매 이력 인덱스는 스냅샷 기준점까지의 리뷰를 반영 (이후 리뷰는 다음 갱신 때 반영)
+    if engine == 'als':
+        # ALS 학습 이후 고객도 리뷰가 있으면 fold-in으로 개인화 추천 가능
+        cold_start = (recommender.latent_model is not None
+                      and not recommender.get_purchased_products(customer_id))
+    else:
+        cold_start = not recommender.has_positive_reviews(customer_id)
+    
+    if not cold_start:
+        recommendations = recommender.recommend_products(
+            customer_id=customer_id,
+            top_n=top_n,
+            exclude_purchased=exclude_purchased,
+            engine=engine,
+            diversity=diversity
+        )
+        if recommendations:
+            return recommendations, "personalized"
+    
+    # 긍정 리뷰가 없는 고객은 연령대/성별 세그먼트 추천으로 대체
+    recommendations = recommender.recommend_cold_start(
+        customer_id=customer_id,
+        top_n=top_n,
+        exclude_purchased=exclude_purchased
+    )
+    return recommendations, "segment"
+
+
 @app.get("/api/v1/recommend/{customer_id}", response_model=RecommendationResponse)
 async def get_recommendations(
     customer_id: int,
     top_n: int = Query(default=5, ge=1, le=20, description="추천할 상품 개수 (1-20)"),
-    exclude_purchased: bool = Query(default=True, description="이미 리뷰 작성한 상품 제외 여부")
+    exclude_purchased: bool = Query(default=True, description="이미 리뷰 작성한 상품 제외 여부"),
+    engine: str = Query(default="keyword", pattern="^(keyword|als)$",
+                        description="추천 엔진 (keyword: 키워드 프로필, als: 잠재 요인)"),
+    diversity: Optional[str] = Query(default=None, pattern="^(mmr|category)$",
+                                     description="다양성 재정렬 (mmr: 유사 상품 분산, "
+                                                 "category: 카테고리당 최대 2개)")
 ):
     """
     고객 맞춤 상품 추천 API
     
+    긍정 리뷰가 없는 고객(콜드 스타트)에게는 같은 연령대/성별 세그먼트의
+    사전 계산된 추천 목록을 반환합니다 (strategy: "segment").
+    
     Args:
         customer_id (int): 고객 ID
         top_n (int): 추천할 상품 개수 (기본값: 5, 최대: 20)
         exclude_purchased (bool): 이미 구매한 상품 제외 여부 (기본값: True)
+        engine (str): 추천 엔진 (기본값: keyword, 잠재 요인 모델 학습 후 als 사용 가능)
+        diversity (str): 다양성 재정렬 방식 (기본값: 없음, 점수 순)
     
     Returns:
         RecommendationResponse: 추천 상품 목록
     
     Example:
         GET /api/v1/recommend/100?top_n=5&exclude_purchased=true
+        GET /api/v1/recommend/100?top_n=5&engine=als
+        GET /api/v1/recommend/100?top_n=5&diversity=mmr
     """
+    snapshot = require_snapshot()
+    
     try:
-        # 추천 실행
-        recommendations = recommender.recommend_products(
-            customer_id=customer_id,
-            top_n=top_n,
-            exclude_purchased=exclude_purchased
+        # 고객 프로필 조회/유사도 계산은 스레드 풀에서 실행
+        recommendations, strategy = await executors.run_io(
+            recommend_with_fallback, snapshot.recommender,
+            customer_id, top_n, exclude_purchased, engine, diversity
         )
         
         if not recommendations:
@@ -160,15 +546,20 @@ async def get_recommendations(
                 detail=f"고객 ID {customer_id}에 대한 추천 결과가 없습니다. 긍정 리뷰가 없거나 고객이 존재하지 않을 수 있습니다."
             )
         
-        return RecommendationResponse(
-            customer_id=customer_id,
-            recommendations=recommendations,
-            total_count=len(recommendations),
-            generated_at=datetime.now().isoformat()
-        )
+        # 응답 모델(RecommendationResponse) 형식의 dict를 재검증 없이 직렬화
+        return FastJSONResponse({
+            "customer_id": customer_id,
+            "recommendations": recommendations,
+            "total_count": len(recommendations),
+            "generated_at": datetime.now().isoformat(),
+            "strategy": strategy
+        })
     
     except HTTPException:
         raise
+    except ValueError as e:
+        # 학습되지 않은 엔진 선택 등 잘못된 요청
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -176,8 +567,64 @@ async def get_recommendations(
         )
 
 
+@app.post("/api/v1/recommend/batch", response_model=BatchRecommendationResponse)
+async def get_batch_recommendations(request: BatchRecommendationRequest):
+    """
+    여러 고객 맞춤 상품 추천 API (고객마다 추천 API를 호출하지 않도록 한 번에 처리)
+    
+    전체 고객을 희소 행렬 곱 한 번으로 점수 계산하고 상품 정보는 고유 상품당 한 번만 조회합니다.
+    개인화 추천을 할 수 없는 고객은 세그먼트 추천으로 대체합니다 (strategy: "segment").
+    
+    Args:
+        request (BatchRecommendationRequest): 고객 ID 목록과 추천 옵션
+    
+    Returns:
+        BatchRecommendationResponse: 고객별 추천 상품 목록 (요청 순서, 중복 ID는 한 번만)
+    
+    Example:
+        POST /api/v1/recommend/batch
+        {"customer_ids": [1, 50, 100], "top_n": 5}
+    """
+    snapshot = require_snapshot()
+    
+    try:
+        customer_ids = list(dict.fromkeys(request.customer_ids))
+        results = await executors.run_io(
+            snapshot.recommender.recommend_products_batch,
+            customer_ids,
+            top_n=request.top_n,
+            exclude_purchased=request.exclude_purchased,
+            engine=request.engine
+        )
+        
+        # 고객 수천 명 분량의 응답이므로 모델 객체를 만들지 않고 바로 직렬화
+        return FastJSONResponse({
+            "results": [
+                {
+                    "customer_id": customer_id,
+                    "recommendations": recommendations,
+                    "total_count": len(recommendations),
+                    "strategy": strategy
+                }
+                for customer_id, (recommendations, strategy) in results.items()
+            ],
+            "total_customers": len(results),
+            "generated_at": datetime.now().isoformat()
+        })
+    
+    except ValueError as e:
+        # 학습되지 않은 엔진 선택 등 잘못된 요청
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"배치 추천 처리 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
 @app.get("/api/v1/negative-analysis", response_model=NegativeAnalysisResponse)
 async def get_negative_analysis(
+    request: Request,
     top_n: int = Query(default=5, ge=1, le=50, description="분석할 상품 개수 (1-50)")
 ):
     """
@@ -188,13 +635,23 @@ async def get_negative_analysis(
     
     Returns:
         NegativeAnalysisResponse: 개선 우선순위 상품 목록
+        (동시 분석이 많으면 429/503 + Retry-After, 캐시된 응답은 제한 없음)
     
     Example:
         GET /api/v1/negative-analysis?top_n=10
     """
+    # DB가 바뀌지 않았으면 캐시된 응답 또는 304
+    cached = response_cache.begin(request, 'negative-analysis', top_n)
+    if cached.response is not None:
+        return cached.response
+    
     try:
-        # 부정 리뷰 분석 실행
-        priority_products = analyzer.get_improvement_priority_products(top_n=top_n)
+        # 부정 리뷰 전체 분석 (Kiwi 형태소 분석)은 동시 실행 수를 제한하여 프로세스 풀에서 실행
+        async with negative_analysis_limiter.slot():
+            priority_products, stages = await executors.run_cpu(
+                improvement_priority_products, top_n, REVIEW_DB_PATH
+            )
+        record_stages(stages)
         
         if not priority_products:
             raise HTTPException(
@@ -202,11 +659,11 @@ async def get_negative_analysis(
                 detail="부정 리뷰 분석 결과가 없습니다."
             )
         
-        return NegativeAnalysisResponse(
-            generated_at=datetime.now().isoformat(),
-            total_products_analyzed=len(priority_products),
-            improvement_priority_list=priority_products
-        )
+        return cached.store({
+            "generated_at": datetime.now().isoformat(),
+            "total_products_analyzed": len(priority_products),
+            "improvement_priority_list": priority_products
+        })
     
     except HTTPException:
         raise
@@ -217,11 +674,102 @@ async def get_negative_analysis(
         )
 
 
+@app.get("/api/v1/export/recommendations")
+async def export_recommendations(
+    top_n: int = Query(default=5, ge=1, le=20, description="고객별 추천 상품 개수 (1-20)"),
+    exclude_purchased: bool = Query(default=True, description="이미 리뷰 작성한 상품 제외 여부"),
+    engine: str = Query(default="keyword", pattern="^(keyword|als)$",
+                        description="추천 엔진 (keyword: 키워드 프로필, als: 잠재 요인)")
+):
+    """
+    전체 고객 추천 NDJSON 내보내기 API (데이터 웨어하우스 적재용)
+    
+    고객 ID 순으로 EXPORT_CHUNK_SIZE명씩 배치 추천하며 한 줄에 고객 한 명씩 스트리밍합니다.
+    내보내기 동안 시작 시점의 추천 스냅샷을 계속 사용합니다.
+    
+    Args:
+        top_n (int): 고객별 추천 상품 개수
+        exclude_purchased (bool): 이미 리뷰 작성한 상품 제외 여부
+        engine (str): 추천 엔진
+    
+    Returns:
+        StreamingResponse: application/x-ndjson
+            각 줄: {"customer_id", "strategy", "total_count", "recommendations"}
+    
+    Example:
+        GET /api/v1/export/recommendations?top_n=5
+    """
+    recommender = require_snapshot().recommender
+    
+    try:
+        # 첫 청크는 응답 전에 계산하여 잘못된 요청을 400으로 응답
+        first_page = await executors.run_io(customer_id_page, 0, EXPORT_CHUNK_SIZE,
+                                            recommender.db_path)
+        results = await executors.run_io(
+            recommender.recommend_products_batch, first_page,
+            top_n=top_n, exclude_purchased=exclude_purchased, engine=engine
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"추천 내보내기 중 오류가 발생했습니다: {str(e)}"
+        )
+    
+    return StreamingResponse(
+        stream_recommendations(executors, recommender, first_page,
+                               recommendation_rows(results),
+                               top_n, exclude_purchased, engine),
+        media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+@app.get("/api/v1/export/negative-analysis")
+async def export_negative_analysis():
+    """
+    전체 상품 부정 리뷰 분석 NDJSON 내보내기 API
+    
+    부정 리뷰를 상품 ID 순으로 읽으며 상품 분석이 끝날 때마다 한 줄씩 스트리밍하므로
+    전체 분석이 끝나기 전에 첫 상품 결과가 도착합니다 (우선순위 정렬은 하지 않음).
+    
+    Returns:
+        StreamingResponse: application/x-ndjson
+            각 줄: /api/v1/negative-analysis의 improvement_priority_list 항목과 같은 형식
+            (부정 리뷰 분석과 같은 동시 실행 제한, 넘치면 429/503 + Retry-After)
+    
+    Example:
+        GET /api/v1/export/negative-analysis
+    """
+    # 전체 형태소 분석이므로 부정 리뷰 분석과 슬롯을 공유하며, 스트림이 끝날 때까지 유지
+    start = await negative_analysis_limiter.acquire()
+    try:
+        analyzer = await executors.run_io(NegativeReviewAnalyzer, REVIEW_DB_PATH)
+    except asyncio.CancelledError:
+        negative_analysis_limiter.release(start)
+        raise
+    except Exception as e:
+        negative_analysis_limiter.release(start)
+        raise HTTPException(
+            status_code=500,
+            detail=f"부정 리뷰 내보내기 중 오류가 발생했습니다: {str(e)}"
+        )
+    
+    return SlotStreamingResponse(
+        stream_rows(executors, analyzer.iter_product_analysis()),
+        release=lambda: negative_analysis_limiter.release(start),
+        media_type=NDJSON_MEDIA_TYPE
+    )
+
+
 @app.get("/api/v1/product/{product_id}/profile")
-async def get_product_profile(product_id: int):
+async def get_product_profile(product_id: int, request: Request):
     """
     특정 상품의 키워드 프로필 조회 API
     
+    해싱 모드(RECOMMENDER_HASH_FEATURES)에서는 상품 프로필을 해시 버킷으로만 보관해
+    키워드를 복원할 수 없으므로 501 Not Implemented를 반환합니다.
+    
     Args:
         product_id (int): 상품 ID
     
@@ -231,15 +779,25 @@ async def get_product_profile(product_id: int):
     Example:
         GET /api/v1/product/39/profile
     """
+    snapshot = require_snapshot()
+    if not snapshot.recommender.keyword_profiles_available:
+        raise HTTPException(
+            status_code=501,
+            detail="해싱 모드에서는 상품 키워드 프로필을 제공하지 않습니다."
+        )
+    cached = response_cache.begin(request, 'product-profile', product_id,
+                                  snapshot.version)
+    if cached.response is not None:
+        return cached.response
+    
     try:
-        if product_id not in recommender.product_profiles:
+        profile = snapshot.recommender.get_product_profile(product_id)
+        if profile is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"상품 ID {product_id}의 프로필을 찾을 수 없습니다."
             )
         
-        profile = recommender.product_profiles[product_id]
-        
         # 상위 키워드만 반환 (빈도순)
         sorted_keywords = sorted(
             profile.items(),
@@ -247,7 +805,7 @@ async def get_product_profile(product_id: int):
             reverse=True
         )[:20]
         
-        return {
+        return cached.store({
             "product_id": product_id,
             "total_keywords": len(profile),
             "top_keywords": [
@@ -255,7 +813,7 @@ async def get_product_profile(product_id: int):
                 for k, w in sorted_keywords
             ],
             "generated_at": datetime.now().isoformat()
-        }
+        })
     
     except HTTPException:
         raise
@@ -266,8 +824,63 @@ async def get_product_profile(product_id: int):
         )
 
 
+@app.get("/api/v1/product/{product_id}/similar", response_model=SimilarProductsResponse)
+async def get_similar_products(
+    product_id: int,
+    request: Request,
+    top_n: int = Query(default=10, ge=1, le=20, description="유사 상품 개수 (1-20)")
+):
+    """
+    유사 상품 조회 API ("이 상품을 좋아한 고객이 좋아한 상품")
+    
+    사전 계산된 아이템-아이템 이웃 목록에서 조회하므로 카탈로그 크기와 무관하게
+    O(K)로 응답합니다.
+    
+    Args:
+        product_id (int): 기준 상품 ID
+        top_n (int): 유사 상품 개수 (기본값: 10, 최대: 20)
+    
+    Returns:
+        SimilarProductsResponse: 유사 상품 목록
+    
+    Example:
+        GET /api/v1/product/39/similar?top_n=5
+    """
+    snapshot = require_snapshot()
+    cached = response_cache.begin(request, 'similar', product_id, top_n,
+                                  snapshot.version)
+    if cached.response is not None:
+        return cached.response
+    
+    try:
+        similar_products = await executors.run_io(
+            snapshot.recommender.get_similar_products, product_id, top_n=top_n
+        )
+        
+        if not similar_products:
+            raise HTTPException(
+                status_code=404,
+                detail=f"상품 ID {product_id}의 유사 상품을 찾을 수 없습니다."
+            )
+        
+        return cached.store({
+            "product_id": product_id,
+            "similar_products": similar_products,
+            "total_count": len(similar_products),
+            "generated_at": datetime.now().isoformat()
+        })
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"유사 상품 조회 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
 @app.get("/api/v1/customer/{customer_id}/profile")
-async def get_customer_profile(customer_id: int):
+async def get_customer_profile(customer_id: int, request: Request):
     """
     특정 고객의 키워드 프로필 조회 API
     
@@ -280,8 +893,17 @@ async def get_customer_profile(customer_id: int):
     Example:
         GET /api/v1/customer/100/profile
     """
+    # 고객 프로필은 DB 리뷰와 스냅샷의 어휘/IDF로 결정됨
+    snapshot = require_snapshot()
+    cached = response_cache.begin(request, 'customer-profile', customer_id,
+                                  snapshot.version)
+    if cached.response is not None:
+        return cached.response
+    
     try:
-        profile = recommender.build_customer_profile(customer_id)
+        profile = await executors.run_io(
+            snapshot.recommender.build_customer_profile, customer_id
+        )
         
         if not profile:
             raise HTTPException(
@@ -296,7 +918,7 @@ async def get_customer_profile(customer_id: int):
             reverse=True
         )[:20]
         
-        return {
+        return cached.store({
             "customer_id": customer_id,
             "total_keywords": len(profile),
             "top_keywords": [
@@ -304,7 +926,7 @@ async def get_customer_profile(customer_id: int):
                 for k, w in sorted_keywords
             ],
             "generated_at": datetime.now().isoformat()
-        }
+        })
     
     except HTTPException:
         raise
@@ -315,8 +937,30 @@ async def get_customer_profile(customer_id: int):
         )
 
 
+def load_stats_overview(db_path: str) -> Tuple[Dict, int]:
+    """
+    통계 개요용 집계 조회 (블로킹, 스레드 풀에서 호출)
+    
+    Args:
+        db_path (str): 데이터베이스 파일 경로 (REVIEW_DB_PATH)
+    
+    Returns:
+        Tuple[Dict, int]: (product_stats 합계, 리뷰 작성 고객 수)
+    """
+    # 리뷰/감성 합계는 사전 집계된 product_stats 테이블에서 계산
+    overview = load_product_stats(db_path).overview()
+    
+    cursor = get_connection(db_path).cursor()
+    
+    # 고객 수만 리뷰 테이블에서 조회
+    cursor.execute("SELECT COUNT(DISTINCT customer_id) FROM reviews")
+    total_customers = cursor.fetchone()[0]
+    
+    return overview, total_customers
+
+
 @app.get("/api/v1/stats/overview")
-async def get_stats_overview():
+async def get_stats_overview(request: Request):
     """
     전체 통계 개요 API
     
@@ -326,31 +970,23 @@ async def get_stats_overview():
     Example:
         GET /api/v1/stats/overview
     """
+    cached = response_cache.begin(request, 'stats-overview')
+    if cached.response is not None:
+        return cached.response
+    
     try:
-        import sqlite3
-        
-        conn = sqlite3.connect('data/reviews.db')
-        cursor = conn.cursor()
-        
-        # 전체 통계 조회
-        cursor.execute("""
-            SELECT 
-                COUNT(DISTINCT customer_id) as total_customers,
-                COUNT(DISTINCT product_id) as total_products,
-                COUNT(*) as total_reviews,
-                AVG(rating) as avg_rating,
-                SUM(CASE WHEN sentiment = 'Positive' THEN 1 ELSE 0 END) as positive_count,
-                SUM(CASE WHEN sentiment = 'Negative' THEN 1 ELSE 0 END) as negative_count,
-                SUM(CASE WHEN sentiment = 'Neutral' THEN 1 ELSE 0 END) as neutral_count
-            FROM reviews
-        """)
-        
-        stats = cursor.fetchone()
-        conn.close()
+        overview, total_customers = await executors.run_io(
+            load_stats_overview, REVIEW_DB_PATH
+        )
         
-        total_customers, total_products, total_reviews, avg_rating, positive, negative, neutral = stats
+        total_products = overview['total_products']
+        total_reviews = overview['total_reviews']
+        avg_rating = overview['average_rating']
+        positive = overview['positive_count']
+        negative = overview['negative_count']
+        neutral = overview['neutral_count']
         
-        return {
+        return cached.store({
             "overview": {
                 "total_customers": total_customers,
                 "total_products": total_products,
@@ -372,7 +1008,7 @@ async def get_stats_overview():
                 }
             },
             "generated_at": datetime.now().isoformat()
-        }
+        })
     
     except Exception as e:
         raise HTTPException(
@@ -394,7 +1030,7 @@ async def send_email_report(
         attach_raw_data (bool): JSON 원본 데이터 첨부 여부 (기본값: False)
     
     Returns:
-        JSON: 전송 결과
+        JSON: 전송 결과 (동시 전송이 많으면 429/503 + Retry-After)
     
     Example:
         POST /api/v1/send-report?recipient_email=user@example.com&attach_raw_data=true
@@ -410,12 +1046,15 @@ async def send_email_report(
             app_password=APP_PASSWORD
         )
         
-        # 리포트 전송
-        reporter.send_dashboard_report(
-            recipient_email=recipient_email,
-            api_base_url="http://localhost:8000",
-            attach_raw_data=attach_raw_data
-        )
+        # 리포트 전송 (이 서버 API 호출 + SMTP 전송이므로 이벤트 루프를 막지 않도록 스레드 풀에서 실행,
+        # 동시 전송 수 제한)
+        async with send_report_limiter.slot():
+            await executors.run_io(
+                reporter.send_dashboard_report,
+                recipient_email=recipient_email,
+                api_base_url="http://localhost:8000",
+                attach_raw_data=attach_raw_data
+            )
         
         return {
             "status": "success",
@@ -424,6 +1063,8 @@ async def send_email_report(
             "sent_at": datetime.now().isoformat()
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -431,6 +1072,113 @@ async def send_email_report(
         )
 
 
+def job_response(job: Dict) -> JobResponse:
+    """작업 큐 레코드를 응답 모델로 변환 (시각은 ISO 형식)"""
+    def isoformat(timestamp: Optional[float]) -> Optional[str]:
+        return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+    
+    return JobResponse(**{
+        **job,
+        'created_at': isoformat(job['created_at']),
+        'started_at': isoformat(job['started_at']),
+        'finished_at': isoformat(job['finished_at']),
+    })
+
+
+@app.post("/api/v1/jobs", response_model=JobResponse, status_code=202)
+async def create_job(job_request: JobRequest, response: Response):
+    """
+    백그라운드 작업 등록 API
+    
+    부정 리뷰 전체 분석이나 리포트 이메일 전송을 요청 안에서 처리하지 않고 작업 큐에 넣은 뒤
+    바로 202를 반환합니다. 진행 상태와 결과는 Location 헤더의 작업 조회 API로 확인합니다.
+    
+    Args:
+        job_request (JobRequest): 작업 종류와 파라미터
+    
+    Returns:
+        JobResponse: 등록된 작업 (status: "queued")
+    
+    Example:
+        POST /api/v1/jobs
+        {"job_type": "negative-analysis", "params": {"top_n": 10}}
+    """
+    try:
+        params = job_request.validated_params()
+        job_id = await executors.run_io(job_queue.enqueue, job_request.job_type, params)
+        job = await executors.run_io(job_queue.get, job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"작업 등록 중 오류가 발생했습니다: {str(e)}"
+        )
+    
+    response.headers['Location'] = f"/api/v1/jobs/{job_id}"
+    return job_response(job)
+
+
+@app.get("/api/v1/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """
+    백그라운드 작업 상태 및 결과 조회 API
+    
+    Args:
+        job_id (str): 작업 ID
+    
+    Returns:
+        JobResponse: 작업 상태 (queued/running/succeeded/failed), 성공 시 result, 실패 시 error
+    
+    Example:
+        GET /api/v1/jobs/3f2b9c...
+    """
+    try:
+        job = await executors.run_io(job_queue.get, job_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"작업 조회 중 오류가 발생했습니다: {str(e)}"
+        )
+    
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"작업 ID {job_id}를 찾을 수 없습니다."
+        )
+    
+    return job_response(job)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus 메트릭 엔드포인트
+    
+    라우트별 요청 지연 시간, 추천/부정 리뷰 분석의 단계별 소요 시간
+    (sql, tokenize, profile, scoring, enrichment 등), 응답 캐시 적중률, 응답 압축량,
+    추천 스냅샷/아티팩트 버전, 상태별 백그라운드 작업 수, 동시 실행 제한 라우트의
+    실행/대기 요청 수와 거절 횟수를 내보냅니다.
+    
+    Returns:
+        PlainTextResponse: Prometheus 텍스트 형식 (text/plain; version=0.0.4)
+    """
+    extra_lines = admission_metric_lines(
+        (negative_analysis_limiter, send_report_limiter)
+    )
+    if job_queue is not None:
+        counts = await executors.run_io(job_queue.counts)
+        extra_lines += metric_lines(
+            'review_jobs', 'Background jobs by status.', 'gauge',
+            [({'status': status}, counts.get(status, 0)) for status in JOB_STATUSES]
+        )
+    
+    return PlainTextResponse(
+        render_metrics(response_cache.stats(), snapshots.current, extra_lines),
+        media_type=METRICS_CONTENT_TYPE
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """
@@ -456,6 +1204,7 @@ def main():
     print("서버 주소: http://localhost:8000")
     print("API 문서: http://localhost:8000/docs")
     print("ReDoc 문서: http://localhost:8000/redoc")
+    print("운영 환경(멀티 워커): python -m api.launcher")
     print("=" * 80)
     print("\n종료하려면 Ctrl+C를 누르세요.\n")
     
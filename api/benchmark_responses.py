@@ -0,0 +1,208 @@
+"""
+API 응답 직렬화/압축 벤치마크 모듈
+
+부정 리뷰 분석, 배치 추천, 추천 NDJSON 내보내기 응답을 실제 데이터로 만든 뒤
+직렬화 방식별 CPU 시간(기존 jsonable_encoder + json.dumps, 응답 모델 생성 후 직렬화,
+api.responses.dumps)과 인코딩별 전송 크기/압축 시간(identity, gzip, br)을 측정합니다.
+
+실행:
+    python -m api.benchmark_responses
+"""
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+
+from src.analyze_negative_reviews import NegativeReviewAnalyzer
+from src.db import REVIEW_DB_PATH
+from src.recommendation_system import create_recommender_from_env
+from src.recommender_snapshot import SnapshotManager
+from api.api_server import BatchRecommendationResponse, NegativeAnalysisResponse
+from api.compression import available_encodings, compress_body
+from api.export import recommendation_rows
+from api.responses import dumps, orjson
+
+
+# 배치 추천/내보내기 벤치마크 고객 수
+BENCH_CUSTOMERS = int(os.getenv('BENCH_CUSTOMERS', '1000'))
+
+# 측정 반복 횟수 (중앙값 사용)
+BENCH_REPEAT = int(os.getenv('BENCH_REPEAT', '7'))
+
+
+def median_ms(func: Callable, repeat: int = BENCH_REPEAT) -> float:
+    """
+    함수 실행 시간 중앙값
+
+    Args:
+        func: 측정할 함수 (인자 없음)
+        repeat (int): 반복 횟수
+
+    Returns:
+        float: 중앙값 (밀리초)
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(timings), 2)
+
+
+def build_payloads(db_path: str = REVIEW_DB_PATH) -> Dict[str, Dict]:
+    """
+    벤치마크 응답 데이터 생성
+
+    Args:
+        db_path (str): 데이터베이스 파일 경로
+
+    Returns:
+        Dict[str, Dict]: {이름: {'content', 'model'}} (model은 응답 모델 클래스, 없으면 None)
+    """
+    analyzer = NegativeReviewAnalyzer(db_path)
+    priority_products = analyzer.get_improvement_priority_products(top_n=50)
+    recommender = SnapshotManager(
+        lambda: create_recommender_from_env(db_path)
+    ).load().recommender
+    customer_ids = list(range(1, BENCH_CUSTOMERS + 1))
+    results = recommender.recommend_products_batch(customer_ids, top_n=10)
+    generated_at = datetime.now().isoformat()
+
+    return {
+        'negative-analysis (top_n=50)': {
+            'content': {
+                'generated_at': generated_at,
+                'total_products_analyzed': len(priority_products),
+                'improvement_priority_list': priority_products,
+            },
+            'model': NegativeAnalysisResponse,
+        },
+        f'recommend/batch ({BENCH_CUSTOMERS}명, top_n=10)': {
+            'content': {
+                'results': [
+                    {
+                        'customer_id': customer_id,
+                        'recommendations': recommendations,
+                        'total_count': len(recommendations),
+                        'strategy': strategy,
+                    }
+                    for customer_id, (recommendations, strategy) in results.items()
+                ],
+                'total_customers': len(results),
+                'generated_at': generated_at,
+            },
+            'model': BatchRecommendationResponse,
+        },
+        f'export/recommendations NDJSON ({BENCH_CUSTOMERS}명)': {
+            'rows': results,
+            'model': None,
+        },
+    }
+
+
+def benchmark_payload(payload: Dict) -> Dict:
+    """
+    응답 하나의 직렬화 방식별 시간과 인코딩별 크기/압축 시간 측정
+
+    Args:
+        payload (Dict): build_payloads()의 항목
+
+    Returns:
+        Dict: {'serialization': {방식: ms}, 'encodings': {인코딩: {'bytes', 'ms'}}}
+    """
+    serialization = {}
+    if 'rows' in payload:
+        rows = payload['rows']
+        serialization['json.dumps (줄별)'] = median_ms(lambda: b''.join(
+            (json.dumps({'customer_id': customer_id, 'strategy': strategy,
+                         'total_count': len(recommendations),
+                         'recommendations': recommendations},
+                        ensure_ascii=False) + '\n').encode('utf-8')
+            for customer_id, (recommendations, strategy) in rows.items()
+        ))
+        serialization['dumps (줄별)'] = median_ms(lambda: recommendation_rows(rows))
+        body = recommendation_rows(rows)
+    else:
+        content, model = payload['content'], payload['model']
+        serialization['jsonable_encoder + json.dumps'] = median_ms(
+            lambda: json.dumps(jsonable_encoder(content),
+                               ensure_ascii=False).encode('utf-8')
+        )
+        serialization['응답 모델 생성 + model_dump_json'] = median_ms(
+            lambda: model(**content).model_dump_json().encode('utf-8')
+        )
+        serialization['dumps'] = median_ms(lambda: dumps(content))
+        body = dumps(content)
+
+    encodings = {'identity': {'bytes': len(body), 'ms': 0.0}}
+    for encoding in available_encodings():
+        encodings[encoding] = {
+            'bytes': len(compress_body(body, encoding)),
+            'ms': median_ms(lambda: compress_body(body, encoding)),
+        }
+
+    return {'serialization': serialization, 'encodings': encodings}
+
+
+def print_report(results: Dict[str, Dict]):
+    """
+    벤치마크 결과 출력
+
+    Args:
+        results: {응답 이름: benchmark_payload() 결과}
+    """
+    print("\n" + "=" * 80)
+    json_backend = 'orjson' if orjson is not None else 'pydantic-core'
+    print(f"응답 직렬화/압축 벤치마크 (JSON: {json_backend}, "
+          f"인코딩: {', '.join(available_encodings())})")
+    print("=" * 80)
+
+    for name, result in results.items():
+        print(f"\n[{name}]")
+        baseline = max(result['serialization'].values())
+        for method, ms in result['serialization'].items():
+            speedup = baseline / ms if ms else float('inf')
+            print(f"  직렬화 {method:<36} {ms:>9.2f}ms  (x{speedup:.1f})")
+
+        raw = result['encodings']['identity']['bytes']
+        for encoding, sizes in result['encodings'].items():
+            print(f"  전송 {encoding:<10} {sizes['bytes']:>12,} bytes "
+                  f"({sizes['bytes'] / raw * 100:5.1f}%)  압축 {sizes['ms']:.2f}ms")
+
+
+def save_report(results: Dict[str, Dict],
+                output_path: str = 'reports/response_benchmark.json'):
+    """
+    벤치마크 결과를 JSON으로 저장
+
+    Args:
+        results: {응답 이름: benchmark_payload() 결과}
+        output_path: 저장 경로
+    """
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'generated_at': datetime.now().isoformat(),
+            'json_backend': 'orjson' if orjson is not None else 'pydantic-core',
+            'results': results,
+        }, f, ensure_ascii=False, indent=2)
+
+    print(f"\n✓ 벤치마크 결과 저장: {output_path}")
+
+
+def main():
+    """메인 실행 함수"""
+    payloads = build_payloads()
+    results: Dict[str, Dict] = {
+        name: benchmark_payload(payload) for name, payload in payloads.items()
+    }
+    print_report(results)
+    save_report(results)
+
+
+if __name__ == '__main__':
+    main()
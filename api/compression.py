@@ -0,0 +1,319 @@
+"""
+응답 압축 모듈
+
+Accept-Encoding 헤더로 brotli(br) 또는 gzip을 협상하여 COMPRESSION_MIN_SIZE 이상인
+JSON/NDJSON/텍스트 응답 본문을 압축하는 ASGI 미들웨어를 제공합니다.
+brotli 패키지가 설치되어 있지 않으면 gzip만 사용합니다.
+
+- ETag가 붙은 응답(응답 캐시)은 (ETag, 인코딩)별 압축 결과를 보관하여 재압축하지 않습니다.
+- 압축한 응답의 ETag는 약한 ETag(W/"...")로 바꾸며, If-None-Match는 약한 비교로 처리됩니다.
+- 스트리밍(NDJSON) 응답은 청크마다 flush하여 압축하므로 첫 바이트 지연이 늘지 않습니다.
+- 큰 본문은 이벤트 루프를 막지 않도록 스레드 풀에서 압축합니다.
+"""
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성 (없으면 gzip만 사용)
+    brotli = None
+
+
+# 이 크기(바이트) 미만의 응답 본문은 압축하지 않음
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+
+# gzip 압축 레벨 (1-9)
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', '5'))
+
+# brotli 압축 품질 (0-11)
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', '4'))
+
+# (ETag, 인코딩)별로 보관할 압축 본문 수 (LRU)
+COMPRESSED_CACHE_SIZE = int(os.getenv('COMPRESSED_CACHE_SIZE', '256'))
+
+# 이 크기(바이트) 이상의 본문/청크는 스레드 풀에서 압축
+THREADED_COMPRESSION_SIZE = 256 * 1024
+
+# 압축 대상 Content-Type 접두사
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """서버가 지원하는 인코딩 (선호 순서)"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encoding: Optional[str],
+                       encodings: Optional[Sequence[str]] = None) -> Optional[str]:
+    """
+    Accept-Encoding 헤더에서 응답 인코딩 선택
+
+    q값이 가장 높은 인코딩을 고르고, 같으면 서버 선호 순서(br, gzip)를 따릅니다.
+
+    Args:
+        accept_encoding (str): Accept-Encoding 헤더 값
+        encodings: 후보 인코딩 (기본값: available_encodings())
+
+    Returns:
+        str: 'br' 또는 'gzip' (압축하지 않으면 None)
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in encodings or available_encodings():
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class StreamCompressor:
+    """gzip/brotli 스트리밍 압축기 (청크마다 flush)"""
+
+    def __init__(self, encoding: str):
+        """
+        StreamCompressor 초기화
+
+        Args:
+            encoding (str): 'br' 또는 'gzip'
+        """
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            # wbits=31: gzip 헤더/트레일러 포함
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool = False) -> bytes:
+        """
+        청크 압축
+
+        Args:
+            data (bytes): 원본 청크
+            final (bool): 마지막 청크 여부 (압축 스트림 종료)
+
+        Returns:
+            bytes: 지금까지 받은 데이터를 모두 풀 수 있는 압축 바이트
+        """
+        if self.encoding == 'br':
+            out = self._compressor.process(data)
+            tail = self._compressor.finish() if final else self._compressor.flush()
+            return out + tail
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(
+            zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        )
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """
+    본문 전체 압축
+
+    Args:
+        body (bytes): 원본 본문
+        encoding (str): 'br' 또는 'gzip'
+
+    Returns:
+        bytes: 압축된 본문
+    """
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return StreamCompressor(encoding).compress(body, final=True)
+
+
+class CompressionStats:
+    """인코딩별 압축 응답 수와 원본/압축 바이트 합계 (메트릭용, 스레드 안전)"""
+
+    def __init__(self):
+        self._totals: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def record(self, encoding: str, raw_bytes: int, compressed_bytes: int,
+               responses: int = 0):
+        """압축 결과 기록 (responses: 새로 시작한 응답 수)"""
+        with self._lock:
+            totals = self._totals.setdefault(encoding, [0, 0, 0])
+            totals[0] += responses
+            totals[1] += raw_bytes
+            totals[2] += compressed_bytes
+
+    def snapshot(self) -> Dict[str, Tuple[int, int, int]]:
+        """
+        Returns:
+            Dict[str, Tuple[int, int, int]]: {encoding: (응답 수, 원본 바이트, 압축 바이트)}
+        """
+        with self._lock:
+            return {
+                encoding: tuple(totals) for encoding, totals in self._totals.items()
+            }
+
+
+# 전역 압축 통계 (/metrics)
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """Accept-Encoding 협상으로 응답 본문을 gzip/brotli 압축하는 ASGI 미들웨어"""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE,
+                 cache_size: int = COMPRESSED_CACHE_SIZE):
+        """
+        CompressionMiddleware 초기화
+
+        Args:
+            app: 감쌀 ASGI 앱
+            minimum_size (int): 압축할 최소 본문 크기 (바이트)
+            cache_size (int): (ETag, 인코딩)별로 보관할 압축 본문 수
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get('accept-encoding'))
+        responder = _CompressionResponder(self, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+    def cached_body(self, etag: str, encoding: str) -> Optional[bytes]:
+        """보관된 압축 본문 조회"""
+        with self._lock:
+            body = self._cache.get((etag, encoding))
+            if body is not None:
+                self._cache.move_to_end((etag, encoding))
+            return body
+
+    def store_body(self, etag: str, encoding: str, body: bytes):
+        """압축 본문 보관 (가장 오래 안 쓴 항목부터 제거)"""
+        with self._lock:
+            self._cache[(etag, encoding)] = body
+            self._cache.move_to_end((etag, encoding))
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+class _CompressionResponder:
+    """응답 하나의 시작 메시지를 보류했다가 본문 크기에 따라 압축 여부를 결정하는 send 래퍼"""
+
+    def __init__(self, middleware: CompressionMiddleware, send,
+                 encoding: Optional[str]):
+        self.middleware = middleware
+        self._send = send
+        self.encoding = encoding
+        self.start_message = None
+        self.compressor: Optional[StreamCompressor] = None
+        # 'pending': 첫 본문 대기, 'identity': 그대로 전달, 'stream': 스트리밍 압축
+        self.mode = 'pending'
+
+    async def send(self, message):
+        message_type = message['type']
+
+        if message_type == 'http.response.start':
+            headers = MutableHeaders(scope=message)
+            content_type = headers.get('content-type', '')
+            compressible = content_type.startswith(COMPRESSIBLE_TYPES)
+            if compressible or message['status'] == 304:
+                # 같은 URL이라도 Accept-Encoding에 따라 본문이 달라짐 (중간 캐시용)
+                headers.add_vary_header('Accept-Encoding')
+            if (self.encoding is None or not compressible
+                    or 'content-encoding' in headers
+                    or message['status'] in (204, 304)):
+                self.mode = 'identity'
+                await self._send(message)
+            else:
+                self.start_message = message
+            return
+
+        if message_type != 'http.response.body' or self.mode == 'identity':
+            await self._send(message)
+            return
+
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+
+        if self.mode == 'pending':
+            if not more_body:
+                await self._send_complete(body)
+                return
+            self._begin_stream()
+            await self._send(self.start_message)
+
+        compressed = await self._run(self.compressor.compress, body, not more_body)
+        compression_stats.record(self.encoding, len(body), len(compressed))
+        await self._send({'type': 'http.response.body', 'body': compressed,
+                          'more_body': more_body})
+
+    async def _send_complete(self, body: bytes):
+        """본문이 한 번에 온 응답: 작으면 그대로, 크면 압축 (ETag가 있으면 압축 결과 재사용)"""
+        self.mode = 'identity'
+        if len(body) < self.middleware.minimum_size:
+            await self._send(self.start_message)
+            await self._send({'type': 'http.response.body', 'body': body})
+            return
+
+        headers = MutableHeaders(scope=self.start_message)
+        etag = headers.get('etag')
+        compressed = self.middleware.cached_body(etag, self.encoding) if etag else None
+        if compressed is None:
+            compressed = await self._run(compress_body, body, self.encoding)
+            if etag:
+                self.middleware.store_body(etag, self.encoding, compressed)
+        compression_stats.record(self.encoding, len(body), len(compressed), responses=1)
+
+        self._set_encoding_headers(headers)
+        headers['Content-Length'] = str(len(compressed))
+        await self._send(self.start_message)
+        await self._send({'type': 'http.response.body', 'body': compressed})
+
+    def _begin_stream(self):
+        """스트리밍 응답 압축 시작 (전체 길이를 모르므로 Content-Length 제거)"""
+        self.mode = 'stream'
+        self.compressor = StreamCompressor(self.encoding)
+        compression_stats.record(self.encoding, 0, 0, responses=1)
+
+        headers = MutableHeaders(scope=self.start_message)
+        self._set_encoding_headers(headers)
+        if 'content-length' in headers:
+            del headers['content-length']
+
+    def _set_encoding_headers(self, headers: MutableHeaders):
+        """Content-Encoding 설정 및 ETag를 약한 ETag로 변경"""
+        headers['Content-Encoding'] = self.encoding
+        etag = headers.get('etag')
+        if etag and not etag.startswith('W/'):
+            # 압축 표현은 바이트가 다르므로 약한 ETag로 표시
+            headers['ETag'] = 'W/' + etag
+
+    async def _run(self, func, data: bytes, *args) -> bytes:
+        """큰 데이터는 스레드 풀에서 압축 (zlib/brotli는 GIL을 놓음)"""
+        if len(data) >= THREADED_COMPRESSION_SIZE:
+            return await run_in_threadpool(func, data, *args)
+        return func(data, *args)
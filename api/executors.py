@@ -0,0 +1,122 @@
+"""
+API 블로킹 작업 실행기 모듈
+
+엔드포인트는 async def이므로 sqlite3 조회, Kiwi 형태소 분석, smtplib 전송 같은
+블로킹 작업을 이벤트 루프에서 직접 실행하면 그동안 다른 요청이 모두 멈춥니다.
+I/O 위주 작업은 크기가 제한된 스레드 풀에서, 순수 파이썬 CPU 작업(부정 리뷰 전체 분석)은
+프로세스 풀에서 실행합니다. 풀 크기는 환경변수로 설정합니다.
+"""
+import asyncio
+import functools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Callable, List, Optional, Tuple
+
+from src.analyze_negative_reviews import NegativeReviewAnalyzer
+from src.db import REVIEW_DB_PATH
+from src.metrics import capture_stages
+
+
+# DB 조회/추천/이메일 등 I/O 위주 작업용 스레드 수
+API_THREAD_POOL_SIZE = int(os.getenv('API_THREAD_POOL_SIZE', '8'))
+
+# 부정 리뷰 분석 등 CPU 작업용 프로세스 수 (0이면 스레드 풀에서 실행)
+API_PROCESS_POOL_SIZE = int(os.getenv('API_PROCESS_POOL_SIZE', '2'))
+
+
+class BlockingExecutors:
+    """블로킹 작업을 스레드/프로세스 풀로 넘기는 클래스"""
+
+    def __init__(self, thread_workers: int = API_THREAD_POOL_SIZE,
+                 process_workers: int = API_PROCESS_POOL_SIZE):
+        """
+        BlockingExecutors 초기화 (풀은 start에서 생성)
+
+        Args:
+            thread_workers (int): 스레드 풀 크기
+            process_workers (int): 프로세스 풀 크기 (0이면 사용 안 함)
+        """
+        self.thread_workers = max(1, thread_workers)
+        self.process_workers = max(0, process_workers)
+        self.thread_pool: Optional[ThreadPoolExecutor] = None
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        """풀 생성 (서버 시작 시)"""
+        self.thread_pool = ThreadPoolExecutor(
+            max_workers=self.thread_workers, thread_name_prefix='api-io'
+        )
+        if self.process_workers > 0:
+            # 이벤트 루프와 스레드가 도는 프로세스를 fork하지 않도록 spawn 사용
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=self.process_workers, mp_context=get_context('spawn')
+            )
+
+    def shutdown(self):
+        """풀 종료 (서버 종료 시)"""
+        for pool in (self.thread_pool, self.process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self.thread_pool = None
+        self.process_pool = None
+
+    async def _run(self, pool: Optional[Executor], func: Callable, *args, **kwargs):
+        """풀에서 함수를 실행하고 결과를 기다림 (풀이 없으면 기본 실행기 사용)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            pool, functools.partial(func, *args, **kwargs)
+        )
+
+    async def run_io(self, func: Callable, *args, **kwargs):
+        """
+        I/O 위주 블로킹 함수를 스레드 풀에서 실행
+
+        Args:
+            func: 실행할 함수 (sqlite3/numpy/smtplib 호출 등)
+
+        Returns:
+            func의 반환값
+        """
+        return await self._run(self.thread_pool, func, *args, **kwargs)
+
+    async def run_cpu(self, func: Callable, *args, **kwargs):
+        """
+        CPU 위주 함수를 프로세스 풀에서 실행 (프로세스 풀이 없으면 스레드 풀)
+
+        Args:
+            func: 실행할 모듈 수준 함수 (인자와 반환값은 피클 가능해야 함)
+
+        Returns:
+            func의 반환값
+        """
+        pool = self.process_pool or self.thread_pool
+        return await self._run(pool, func, *args, **kwargs)
+
+
+# 프로세스(워커)별 부정 리뷰 분석기 (Kiwi 초기화는 워커당 한 번)
+_analyzer = None
+
+
+def improvement_priority_products(
+    top_n: int, db_path: str = REVIEW_DB_PATH
+) -> Tuple[List[dict], List[tuple]]:
+    """
+    개선 우선순위 상품 분석 (프로세스 풀 워커에서 실행)
+
+    워커 프로세스의 메트릭은 API 프로세스에서 볼 수 없으므로 단계별 소요 시간을
+    결과와 함께 돌려보내 호출한 쪽에서 src.metrics.record_stages로 기록합니다.
+
+    Args:
+        top_n (int): 상위 N개 상품
+        db_path (str): 데이터베이스 파일 경로
+
+    Returns:
+        Tuple: (개선 우선순위 상품 리스트, 단계별 소요 시간 [(operation, stage, seconds), ...])
+    """
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = NegativeReviewAnalyzer(db_path)
+    with capture_stages() as stages:
+        products = _analyzer.get_improvement_priority_products(top_n=top_n)
+    return products, stages
@@ -0,0 +1,143 @@
+"""
+NDJSON 스트리밍 내보내기 모듈
+
+전체 고객 추천이나 전체 상품 부정 리뷰 분석을 하나의 JSON 본문으로 만들지 않고
+한 줄에 한 건씩(NDJSON) StreamingResponse로 흘려보냅니다.
+고객은 ID 범위 단위 청크로 읽어 배치 추천하고 청크를 다 보낸 뒤 다음 청크를 계산하므로
+전체 고객 수와 관계없이 서버 메모리는 청크 크기만큼만 쓰고 첫 바이트가 바로 나갑니다.
+"""
+import os
+from typing import AsyncIterator, Dict, Iterator, List
+
+from src.db import get_connection
+from api.executors import BlockingExecutors
+from api.responses import dumps
+
+
+# 추천 내보내기에서 한 번에 배치 추천하는 고객 수
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '500'))
+
+# NDJSON 응답 미디어 타입
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+# 제너레이터 종료 표시
+_END = object()
+
+
+def ndjson_line(row: Dict) -> bytes:
+    """
+    한 건을 NDJSON 한 줄로 직렬화
+
+    Args:
+        row (Dict): 직렬화할 항목
+
+    Returns:
+        bytes: 줄바꿈으로 끝나는 UTF-8 JSON
+    """
+    return dumps(row) + b'\n'
+
+
+def customer_id_page(after_id: int, limit: int, db_path: str) -> List[int]:
+    """
+    고객 ID 범위 페이지 조회 (키셋 페이지네이션, 기본 키 범위 탐색)
+
+    Args:
+        after_id (int): 이 ID보다 큰 고객부터
+        limit (int): 최대 고객 수
+        db_path (str): 데이터베이스 파일 경로 (추천 시스템의 db_path)
+
+    Returns:
+        List[int]: 오름차순 고객 ID 리스트 (마지막 페이지 이후는 빈 리스트)
+    """
+    rows = get_connection(db_path).execute(
+        "SELECT customer_id FROM customers WHERE customer_id > ? "
+        "ORDER BY customer_id LIMIT ?",
+        (after_id, limit)
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def recommendation_rows(results: Dict) -> bytes:
+    """
+    recommend_products_batch 결과를 고객별 NDJSON 줄로 변환
+
+    Args:
+        results (Dict): {customer_id: (추천 상품 리스트, 추천 전략)}
+
+    Returns:
+        bytes: 청크의 NDJSON 줄들
+    """
+    return b''.join(
+        ndjson_line({
+            'customer_id': customer_id,
+            'strategy': strategy,
+            'total_count': len(recommendations),
+            'recommendations': recommendations,
+        })
+        for customer_id, (recommendations, strategy) in results.items()
+    )
+
+
+async def stream_recommendations(executors: BlockingExecutors, recommender,
+                                 first_page: List[int], first_chunk: bytes,
+                                 top_n: int, exclude_purchased: bool,
+                                 engine: str) -> AsyncIterator[bytes]:
+    """
+    전체 고객 추천을 청크 단위로 계산하며 NDJSON으로 내보냄
+
+    첫 청크는 엔드포인트가 응답 전에 계산하므로(잘못된 요청은 400으로 응답)
+    여기서는 그대로 보낸 뒤 다음 고객 페이지부터 이어서 계산합니다.
+
+    Args:
+        executors (BlockingExecutors): DB 조회/추천 계산용 실행기
+        recommender (RecommendationSystem): 내보내기 동안 고정할 스냅샷의 추천 시스템
+        first_page: 첫 청크의 고객 ID 리스트
+        first_chunk: 첫 청크의 NDJSON 줄들
+        top_n: 고객별 추천 상품 개수
+        exclude_purchased: 이미 리뷰 작성한 상품 제외 여부
+        engine: 추천 엔진
+
+    Yields:
+        bytes: 청크별 NDJSON 줄들
+    """
+    yield first_chunk
+
+    page = first_page
+    while len(page) == EXPORT_CHUNK_SIZE:
+        page = await executors.run_io(customer_id_page, page[-1], EXPORT_CHUNK_SIZE,
+                                      recommender.db_path)
+        if not page:
+            break
+        results = await executors.run_io(
+            recommender.recommend_products_batch, page,
+            top_n=top_n, exclude_purchased=exclude_purchased, engine=engine
+        )
+        yield recommendation_rows(results)
+
+
+async def stream_rows(executors: BlockingExecutors,
+                      rows: Iterator[Dict]) -> AsyncIterator[bytes]:
+    """
+    블로킹 제너레이터를 스레드 풀에서 한 건씩 진행하며 NDJSON으로 내보냄
+
+    클라이언트가 중간에 연결을 끊어도 제너레이터를 닫아 DB 연결을 정리합니다.
+
+    Args:
+        executors (BlockingExecutors): 블로킹 작업 실행기
+        rows: 항목을 하나씩 생성하는 제너레이터 (DB 조회/형태소 분석 등 블로킹)
+
+    Yields:
+        bytes: 항목별 NDJSON 줄
+    """
+    try:
+        while True:
+            row = await executors.run_io(next, rows, _END)
+            if row is _END:
+                break
+            yield ndjson_line(row)
+    finally:
+        try:
+            rows.close()
+        except ValueError:
+            # 스레드에서 next()가 아직 실행 중이면 끝난 뒤 가비지 수집 때 닫힘
+            pass
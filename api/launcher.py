@@ -0,0 +1,219 @@
+"""
+멀티 워커 API 서버 실행 모듈 (운영용)
+
+`uvicorn --workers N`은 워커마다 api.api_server를 새로 import하므로 추천 스냅샷(아티팩트)과
+Kiwi 형태소 분석기 모델(프로세스당 약 500MB)이 워커 수만큼 메모리에 올라갑니다.
+이 모듈의 마스터 프로세스는 스냅샷 로드와 Kiwi 초기화를 먼저 한 번 끝낸 뒤 워커를 fork하므로,
+워커들은 읽기 전용 데이터를 copy-on-write 페이지로 공유하고 각자 수정한 부분만 따로 가집니다.
+
+- 마스터가 포트를 열고 API 워커 API_WORKERS개가 같은 소켓에서 요청을 받습니다.
+- 백그라운드 작업 워커(API_JOB_WORKERS)는 API 워커마다 띄우지 않고 마스터가 한 번만 실행합니다.
+- 워커 프로세스가 CPU 병렬성을 제공하므로 부정 리뷰 분석은 기본적으로 워커의 스레드 풀에서
+  공유 Kiwi로 실행합니다 (API_PROCESS_POOL_SIZE 기본값 0, spawn 프로세스는 Kiwi를 따로 로드함).
+- 종료된 워커는 마스터가 다시 fork하며, SIGTERM/SIGINT는 워커에 전달해 정상 종료합니다.
+- fork를 지원하지 않는 플랫폼(Windows)에서는 단일 프로세스로 실행합니다.
+
+실행:
+    API_WORKERS=4 python -m api.launcher
+"""
+import gc
+import os
+import signal
+import socket
+import time
+from typing import Dict
+
+# API 워커 프로세스 수
+API_WORKERS = int(os.getenv('API_WORKERS', str(os.cpu_count() or 1)))
+
+# 서버 주소/포트
+API_HOST = os.getenv('API_HOST', '0.0.0.0')
+API_PORT = int(os.getenv('API_PORT', '8000'))
+
+# 워커 종료 대기 시간 (초, 지나면 강제 종료)
+WORKER_SHUTDOWN_TIMEOUT = 30.0
+
+# 백그라운드 작업 워커는 마스터가 실행 (api.api_server를 import하기 전에 워커 쪽 설정을 0으로)
+JOB_WORKERS = int(os.getenv('API_JOB_WORKERS', '1'))
+os.environ['API_JOB_WORKERS'] = '0'
+os.environ.setdefault('API_PROCESS_POOL_SIZE', '0')
+
+import uvicorn  # noqa: E402
+
+
+def preload():
+    """
+    fork 전에 API 앱, 추천 스냅샷, Kiwi 형태소 분석기를 로드
+
+    Returns:
+        module: 스냅샷이 로드된 api.api_server 모듈
+    """
+    from api import api_server
+    from src.db import close_connections
+    from src.text_cleaner import shared_cleaner
+
+    start = time.perf_counter()
+    api_server.snapshots.load()
+    shared_cleaner().warm_up()
+    # SQLite 연결은 fork한 프로세스끼리 공유하면 안 되므로 닫음 (워커가 새로 연결)
+    # 미리 로드는 메인 스레드에서만 DB를 읽으므로 메인 스레드 연결이 모두 닫힘
+    close_connections()
+    print(f"✓ 추천 스냅샷/형태소 분석기 로드 완료 ({time.perf_counter() - start:.1f}초)")
+    return api_server
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """
+    워커들이 함께 사용할 리스닝 소켓 생성
+
+    Args:
+        host (str): 바인딩 주소
+        port (int): 포트
+
+    Returns:
+        socket.socket: 리스닝 소켓
+    """
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def fork_worker(api_server, sock: socket.socket, host: str, port: int) -> int:
+    """
+    API 워커 프로세스 fork (자식은 uvicorn 서버를 실행하고 종료)
+
+    Args:
+        api_server: preload()가 반환한 api.api_server 모듈
+        sock (socket.socket): 리스닝 소켓
+        host (str): 서버 주소 (로그용)
+        port (int): 포트 (로그용)
+
+    Returns:
+        int: 워커 프로세스 ID
+    """
+    pid = os.fork()
+    if pid:
+        return pid
+
+    exit_code = 1
+    try:
+        # 마스터의 신호 처리기 대신 uvicorn의 정상 종료 처리 사용
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        config = uvicorn.Config(api_server.app, host=host, port=port, log_level="info")
+        uvicorn.Server(config).run(sockets=[sock])
+        exit_code = 0
+    finally:
+        # 마스터에서 물려받은 atexit/멀티프로세싱 정리 코드를 실행하지 않도록 바로 종료
+        os._exit(exit_code)
+
+
+def stop_workers(workers: Dict[int, int], timeout: float = WORKER_SHUTDOWN_TIMEOUT):
+    """
+    워커에 SIGTERM을 보내고 종료 대기 (timeout이 지나면 SIGKILL)
+
+    Args:
+        workers: {프로세스 ID: 워커 번호}
+        timeout (float): 종료 대기 시간 (초)
+    """
+    for pid in workers:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    deadline = time.monotonic() + timeout
+    remaining = set(workers)
+    while remaining and time.monotonic() < deadline:
+        for pid in list(remaining):
+            try:
+                if os.waitpid(pid, os.WNOHANG)[0]:
+                    remaining.discard(pid)
+            except ChildProcessError:
+                remaining.discard(pid)
+        time.sleep(0.1)
+
+    for pid in remaining:
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+
+
+def run(workers: int = API_WORKERS, host: str = API_HOST, port: int = API_PORT):
+    """
+    마스터 프로세스 실행: 미리 로드 → 작업 워커 시작 → API 워커 fork → 감시
+
+    Args:
+        workers (int): API 워커 프로세스 수
+        host (str): 서버 주소
+        port (int): 포트
+    """
+    print("=" * 80)
+    print(f"멀티 워커 API 서버 시작 (워커 {workers}개, http://{host}:{port})")
+    print("=" * 80)
+
+    if not hasattr(os, 'fork'):
+        print("⚠️  fork를 지원하지 않는 플랫폼입니다. 단일 프로세스로 실행합니다.")
+        os.environ['API_JOB_WORKERS'] = str(JOB_WORKERS)
+        uvicorn.run("api.api_server:app", host=host, port=port, log_level="info")
+        return
+
+    api_server = preload()
+
+    from src.db import REVIEW_DB_PATH
+    from src.job_worker import JobWorkerPool
+
+    # 미리 로드한 객체를 GC 대상에서 빼서 GC가 객체 헤더를 건드려 공유 페이지가 복사되는 것을 방지
+    gc.freeze()
+
+    # 작업 워커도 fork로 시작해 Kiwi를 공유 (리스닝 소켓을 물려받지 않도록 소켓 생성 전에)
+    job_workers = JobWorkerPool(JOB_WORKERS, db_path=REVIEW_DB_PATH,
+                                start_method='fork')
+    job_workers.start()
+    print(f"✓ 백그라운드 작업 워커 시작 ({job_workers.workers}개)")
+
+    sock = bind_socket(host, port)
+
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    children: Dict[int, int] = {}
+    for idx in range(max(1, workers)):
+        children[fork_worker(api_server, sock, host, port)] = idx
+    print(f"✓ API 워커 시작 (PID: {', '.join(map(str, children))})")
+
+    try:
+        while not stopping:
+            for pid, idx in list(children.items()):
+                if not os.waitpid(pid, os.WNOHANG)[0]:
+                    continue
+                del children[pid]
+                if stopping:
+                    break
+                # 예기치 않게 종료된 워커는 미리 로드한 상태에서 다시 fork
+                print(f"⚠️  API 워커 {idx} (PID {pid}) 종료됨, 다시 시작합니다.")
+                time.sleep(1.0)
+                children[fork_worker(api_server, sock, host, port)] = idx
+            time.sleep(0.5)
+    finally:
+        print("\n서버 종료 중...")
+        stop_workers(children)
+        job_workers.stop()
+        sock.close()
+
+    print("=" * 80)
+    print("✅ 멀티 워커 API 서버 종료")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    run()
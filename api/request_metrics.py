@@ -0,0 +1,145 @@
+"""
+API 요청 메트릭 모듈
+
+라우트별 요청 지연 시간 히스토그램을 기록하는 ASGI 미들웨어와
+/metrics 엔드포인트가 반환할 Prometheus 텍스트를 만드는 함수를 제공합니다.
+처리 단계별 시간(src.metrics)과 응답 캐시 적중률, 응답 압축량, 추천 스냅샷/아티팩트 버전을 함께 내보냅니다.
+"""
+import time
+from typing import Dict, List, Optional
+
+from src.metrics import STAGE_SECONDS, Histogram, metric_lines
+from api.compression import compression_stats
+
+
+# 라우트별 요청 처리 시간 (스트리밍 응답은 본문 전송 완료까지)
+REQUEST_SECONDS = Histogram(
+    'review_api_request_duration_seconds',
+    'HTTP request latency by route template.',
+    ('method', 'route', 'status')
+)
+
+# 어떤 라우트에도 맞지 않는 요청의 라우트 라벨 (경로별 라벨 폭증 방지)
+UNMATCHED_ROUTE = 'unmatched'
+
+
+class RequestMetricsMiddleware:
+    """요청마다 라우트 템플릿/메서드/상태 코드별 처리 시간을 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        """
+        RequestMetricsMiddleware 초기화
+
+        Args:
+            app: 감쌀 ASGI 앱
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {'code': 500}
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 라우터가 매칭한 라우트는 scope['route']에 기록됨 (/product/{product_id} 형태)
+            route = scope.get('route')
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                scope['method'],
+                getattr(route, 'path', UNMATCHED_ROUTE),
+                status['code']
+            )
+
+
+def render_metrics(cache_stats: Dict, snapshot=None,
+                   extra_lines: Optional[List[str]] = None) -> str:
+    """
+    /metrics 응답 본문 생성
+
+    Args:
+        cache_stats (Dict): ResponseCache.stats() 결과
+        snapshot (RecommenderSnapshot): 현재 추천 스냅샷 (없으면 None)
+        extra_lines: 추가로 내보낼 메트릭 줄
+
+    Returns:
+        str: Prometheus 텍스트 형식 메트릭
+    """
+    lines = REQUEST_SECONDS.collect() + STAGE_SECONDS.collect()
+
+    lookups = cache_stats['hits'] + cache_stats['misses'] + cache_stats['not_modified']
+    answered = cache_stats['hits'] + cache_stats['not_modified']
+    lines += metric_lines(
+        'review_response_cache_requests_total',
+        'Response cache lookups by result.',
+        'counter',
+        [({'result': result}, cache_stats[result])
+         for result in ('hits', 'misses', 'not_modified')]
+    )
+    lines += metric_lines(
+        'review_response_cache_entries', 'Entries in the response cache.',
+        'gauge', [({}, cache_stats['entries'])]
+    )
+    lines += metric_lines(
+        'review_response_cache_hit_ratio',
+        'Share of cache lookups answered from cache or with 304 Not Modified.',
+        'gauge', [({}, answered / lookups if lookups else 0)]
+    )
+
+    compression = compression_stats.snapshot()
+    lines += metric_lines(
+        'review_response_compressed_total', 'Compressed responses by content encoding.',
+        'counter',
+        [({'encoding': encoding}, totals[0])
+         for encoding, totals in sorted(compression.items())]
+    )
+    lines += metric_lines(
+        'review_response_compression_bytes_total',
+        'Response body bytes before (raw) and after (compressed) compression.',
+        'counter',
+        [({'encoding': encoding, 'kind': kind}, totals[index])
+         for encoding, totals in sorted(compression.items())
+         for index, kind in ((1, 'raw'), (2, 'compressed'))]
+    )
+
+    if snapshot is not None:
+        recommender = snapshot.recommender
+        lines += metric_lines(
+            'review_recommender_snapshot_version',
+            'Version of the active recommender snapshot (increments on every swap).',
+            'gauge', [({}, snapshot.version)]
+        )
+        lines += metric_lines(
+            'review_recommender_last_review_rowid',
+            'Last review rowid reflected in the active recommender snapshot.',
+            'gauge', [({}, snapshot.last_review_rowid or 0)]
+        )
+        lines += metric_lines(
+            'review_recommender_info',
+            'Active recommender snapshot and artifact metadata.',
+            'gauge',
+            [({
+                # 스냅샷이 로드/저장한 아티팩트 형식 (아직 저장 전이면 none)
+                'artifact_format': recommender.format_version or 'none',
+                'source': snapshot.source,
+                'weighting': recommender.weighting,
+                'als': 'true' if recommender.latent_model is not None else 'false',
+            }, 1)]
+        )
+        lines += metric_lines(
+            'review_recommender_products',
+            'Products in the active recommender snapshot.',
+            'gauge', [({}, len(recommender.product_ids))]
+        )
+
+    lines += extra_lines or []
+    return '\n'.join(lines) + '\n'
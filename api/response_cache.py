@@ -0,0 +1,170 @@
+"""
+API 응답 캐시 모듈
+
+통계/부정 리뷰 분석/프로필 엔드포인트는 DB가 바뀌기 전까지 같은 결과를 반환하므로
+(엔드포인트, 파라미터, DB 버전 토큰)을 키로 직렬화된 응답 본문을 캐시합니다.
+응답에는 ETag/Last-Modified 헤더를 붙이고, If-None-Match가 현재 ETag와 같으면
+본문 없이 304로 응답합니다. Last-Modified는 DB에 저장된 마지막 변경 시각이라
+모든 워커가 같은 값을 보냅니다.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from email.utils import formatdate
+from typing import Any, Optional, Tuple
+
+from fastapi import Request, Response
+
+from src.db import REVIEW_DB_PATH, DatabaseVersion
+from api.responses import dumps
+
+
+# 캐시할 최대 응답 수 (LRU)
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '512'))
+
+
+class CachedRequest:
+    """요청 하나의 캐시 조회 결과와 응답 생성을 담당하는 클래스"""
+
+    def __init__(self, cache: 'ResponseCache', key: Tuple, etag: str,
+                 last_modified: Optional[str], response: Optional[Response]):
+        """
+        CachedRequest 초기화
+
+        Args:
+            cache (ResponseCache): 응답 캐시
+            key (Tuple): (엔드포인트, 파라미터..., DB 버전) 캐시 키
+            etag (str): 이 키의 ETag
+            last_modified (str): Last-Modified 헤더 값 (변경 시각을 모르면 None)
+            response (Response): 304 또는 캐시 적중 응답 (없으면 None)
+        """
+        self.cache = cache
+        self.key = key
+        self.etag = etag
+        self.last_modified = last_modified
+        self.response = response
+
+    def headers(self) -> dict:
+        """검증 헤더 (ETag, Last-Modified)"""
+        headers = {
+            'ETag': self.etag,
+            # 캐시는 하되 매번 ETag로 재검증
+            'Cache-Control': 'no-cache',
+        }
+        if self.last_modified:
+            headers['Last-Modified'] = self.last_modified
+        return headers
+
+    def store(self, content: Any) -> Response:
+        """
+        계산한 결과를 직렬화하여 캐시에 저장하고 응답 생성
+
+        Args:
+            content: JSON 직렬화 가능한 결과 (dict 또는 pydantic 모델)
+
+        Returns:
+            Response: ETag/Last-Modified가 붙은 JSON 응답
+        """
+        body = dumps(content)
+        self.cache.put(self.key, body)
+        return Response(content=body, media_type='application/json',
+                        headers=self.headers())
+
+
+class ResponseCache:
+    """DB 버전 토큰을 키에 포함하는 LRU 응답 캐시 클래스"""
+
+    def __init__(self, db_path: str = REVIEW_DB_PATH,
+                 max_entries: int = RESPONSE_CACHE_SIZE):
+        """
+        ResponseCache 초기화
+
+        Args:
+            db_path (str): 버전을 확인할 데이터베이스 경로
+            max_entries (int): 캐시할 최대 응답 수
+        """
+        self.version = DatabaseVersion(db_path)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        """캐시된 응답 본문 조회 (최근 사용으로 갱신)"""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: Tuple, body: bytes):
+        """응답 본문 저장 (가장 오래 안 쓴 항목부터 제거)"""
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def begin(self, request: Request, endpoint: str, *params) -> CachedRequest:
+        """
+        요청의 캐시 키를 만들고 304/캐시 적중 여부 확인
+
+        Args:
+            request (Request): 요청 (If-None-Match 헤더 확인용)
+            endpoint (str): 엔드포인트 이름
+            *params: 응답을 결정하는 파라미터 (스냅샷 버전 등 포함)
+
+        Returns:
+            CachedRequest: response가 있으면 그대로 반환하고,
+                없으면 결과를 계산해 store()로 응답
+        """
+        key = (endpoint, *params, self.version.token())
+        etag = '"' + hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:20] + '"'
+        changed_at = self.version.changed_at
+        last_modified = formatdate(changed_at, usegmt=True) if changed_at else None
+        cached = CachedRequest(self, key, etag, last_modified, None)
+
+        if etag_matches(request.headers.get('if-none-match'), etag):
+            self.not_modified += 1
+            cached.response = Response(status_code=304, headers=cached.headers())
+            return cached
+
+        body = self.get(key)
+        if body is not None:
+            self.hits += 1
+            cached.response = Response(content=body, media_type='application/json',
+                                       headers=cached.headers())
+        else:
+            self.misses += 1
+        return cached
+
+    def stats(self) -> dict:
+        """캐시 적중 통계"""
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'not_modified': self.not_modified,
+        }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match 헤더가 ETag와 일치하는지 확인 (약한 비교, 여러 값/와일드카드 지원)
+
+    Args:
+        if_none_match (str): If-None-Match 헤더 값
+        etag (str): 현재 ETag
+
+    Returns:
+        bool: 일치하면 True
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    candidates = [value.strip() for value in if_none_match.split(',')]
+    return any(value.removeprefix('W/') == etag for value in candidates)
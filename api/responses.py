@@ -0,0 +1,45 @@
+"""
+빠른 JSON 직렬화 모듈
+
+응답 본문을 orjson(설치된 경우) 또는 pydantic-core로 바로 UTF-8 JSON 바이트로 직렬화합니다
+(한글 이스케이프/공백 없음). jsonable_encoder + json.dumps나 응답 모델 객체 생성/검증을
+거치는 것보다 큰 응답에서 직렬화 CPU가 수 배~수십 배 적습니다.
+추천/부정 리뷰 분석처럼 큰 응답은 엔드포인트가 FastJSONResponse를 직접 반환하거나
+응답 캐시에 dict를 저장해 응답 모델 검증을 건너뜁니다 (응답 모델은 API 문서용으로 유지).
+"""
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성 (없으면 pydantic-core 사용)
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """
+    응답 내용을 UTF-8 JSON 바이트로 직렬화 (한글 이스케이프 없음, 공백 없음)
+
+    Args:
+        content: dict/list 또는 pydantic 모델
+
+    Returns:
+        bytes: JSON 본문
+    """
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode('utf-8')
+    if orjson is not None:
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return pydantic_core.to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """dumps()로 직렬화하는 JSON 응답 클래스"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
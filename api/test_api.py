@@ -6,19 +6,21 @@ API 엔드포인트를 테스트하고 결과를 출력합니다.
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 
 def test_health():
     """헬스 체크 테스트"""
     print("\n" + "=" * 80)
-    print("1. 헬스 체크 테스트")
+    print("1. 헬스 체크 테스트 (liveness / readiness)")
     print("=" * 80)
     
     try:
-        response = requests.get("http://localhost:8000/health")
-        print(f"Status Code: {response.status_code}")
-        print("Response:")
-        print(json.dumps(response.json(), indent=2, ensure_ascii=False))
+        for path in ("/health", "/ready"):
+            response = requests.get(f"http://localhost:8000{path}", timeout=5)
+            print(f"{path} Status Code: {response.status_code}")
+            print("Response:")
+            print(json.dumps(response.json(), indent=2, ensure_ascii=False))
     except Exception as e:
         print(f"❌ Error: {e}")
 
@@ -30,7 +32,8 @@ def test_stats_overview():
     print("=" * 80)
     
     try:
-        response = requests.get("http://localhost:8000/api/v1/stats/overview")
+        response = requests.get("http://localhost:8000/api/v1/stats/overview",
+                                timeout=5)
         print(f"Status Code: {response.status_code}")
         print("Response:")
         print(json.dumps(response.json(), indent=2, ensure_ascii=False))
@@ -47,7 +50,8 @@ def test_recommend():
     try:
         response = requests.get(
             "http://localhost:8000/api/v1/recommend/100",
-            params={"top_n": 3, "exclude_purchased": True}
+            params={"top_n": 3, "exclude_purchased": True},
+            timeout=5
         )
         print(f"Status Code: {response.status_code}")
         
@@ -79,7 +83,8 @@ def test_negative_analysis():
     try:
         response = requests.get(
             "http://localhost:8000/api/v1/negative-analysis",
-            params={"top_n": 3}
+            params={"top_n": 3},
+            timeout=5
         )
         print(f"Status Code: {response.status_code}")
         
@@ -112,7 +117,8 @@ def test_product_profile():
     print("=" * 80)
     
     try:
-        response = requests.get("http://localhost:8000/api/v1/product/39/profile")
+        response = requests.get("http://localhost:8000/api/v1/product/39/profile",
+                                timeout=5)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -136,7 +142,8 @@ def test_customer_profile():
     print("=" * 80)
     
     try:
-        response = requests.get("http://localhost:8000/api/v1/customer/100/profile")
+        response = requests.get("http://localhost:8000/api/v1/customer/100/profile",
+                                timeout=5)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -153,6 +160,213 @@ def test_customer_profile():
         print(f"❌ Error: {e}")
 
 
+def test_similar_products():
+    """유사 상품 조회 테스트"""
+    print("\n" + "=" * 80)
+    print("7. 유사 상품 조회 테스트 (상품 ID: 39)")
+    print("=" * 80)
+    
+    try:
+        response = requests.get(
+            "http://localhost:8000/api/v1/product/39/similar",
+            params={"top_n": 5},
+            timeout=5
+        )
+        print(f"Status Code: {response.status_code}")
+        
+        if response.status_code == 200:
+            data = response.json()
+            print(f"\n기준 상품 ID: {data['product_id']}")
+            print(f"유사 상품 수: {data['total_count']}\n")
+            
+            for idx, product in enumerate(data['similar_products'], 1):
+                print(f"{idx}. {product['product_name']} ({product['category']})")
+                print(f"   유사도: {product['similarity_score']:.4f}")
+        else:
+            print("Response:")
+            print(json.dumps(response.json(), indent=2, ensure_ascii=False))
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+
+def test_recommend_batch():
+    """배치 추천 테스트"""
+    print("\n" + "=" * 80)
+    print("8. 배치 추천 테스트 (고객 ID: 1, 50, 100)")
+    print("=" * 80)
+    
+    try:
+        response = requests.post(
+            "http://localhost:8000/api/v1/recommend/batch",
+            json={"customer_ids": [1, 50, 100], "top_n": 3},
+            timeout=5
+        )
+        print(f"Status Code: {response.status_code}")
+        
+        if response.status_code == 200:
+            data = response.json()
+            print(f"\n고객 수: {data['total_customers']}명\n")
+            
+            for result in data['results']:
+                print(f"고객 {result['customer_id']} ({result['strategy']}): "
+                      f"추천 상품 {result['total_count']}개")
+                for idx, rec in enumerate(result['recommendations'], 1):
+                    print(f"  {idx}. {rec['product_name']} "
+                          f"(유사도: {rec['similarity_score']:.4f})")
+        else:
+            print("Response:")
+            print(json.dumps(response.json(), indent=2, ensure_ascii=False))
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+
+def test_export_recommendations():
+    """추천 NDJSON 내보내기 테스트"""
+    print("\n" + "=" * 80)
+    print("9. 추천 NDJSON 내보내기 테스트")
+    print("=" * 80)
+    
+    try:
+        with requests.get(
+            "http://localhost:8000/api/v1/export/recommendations",
+            params={"top_n": 3},
+            stream=True,
+            timeout=5
+        ) as response:
+            print(f"Status Code: {response.status_code}")
+            print(f"Content-Type: {response.headers.get('content-type')}")
+            
+            if response.status_code == 200:
+                count = 0
+                for line in response.iter_lines():
+                    row = json.loads(line)
+                    if count < 3:
+                        print(f"고객 {row['customer_id']} ({row['strategy']}): "
+                              f"추천 상품 {row['total_count']}개")
+                    count += 1
+                print(f"\n내보낸 고객 수: {count}명")
+            else:
+                print("Response:")
+                print(json.dumps(response.json(), indent=2, ensure_ascii=False))
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+
+def test_jobs():
+    """백그라운드 작업 등록 및 조회 테스트"""
+    print("\n" + "=" * 80)
+    print("10. 백그라운드 작업 테스트 (부정 리뷰 분석)")
+    print("=" * 80)
+    
+    try:
+        response = requests.post(
+            "http://localhost:8000/api/v1/jobs",
+            json={"job_type": "negative-analysis", "params": {"top_n": 3}},
+            timeout=5
+        )
+        print(f"Status Code: {response.status_code}")
+        print(f"Location: {response.headers.get('location')}")
+        
+        if response.status_code != 202:
+            print("Response:")
+            print(json.dumps(response.json(), indent=2, ensure_ascii=False))
+            return
+        
+        job_id = response.json()['job_id']
+        for _ in range(60):
+            job = requests.get(f"http://localhost:8000/api/v1/jobs/{job_id}",
+                               timeout=5).json()
+            if job['status'] in ('succeeded', 'failed'):
+                break
+            time.sleep(1)
+        
+        print(f"\n작업 상태: {job['status']} (시도 {job['attempts']}회)")
+        if job['status'] == 'succeeded':
+            priority_list = job['result']['improvement_priority_list']
+            for idx, product in enumerate(priority_list, 1):
+                print(f"{idx}. {product['product_name']} "
+                      f"(부정 비율: {product['negative_ratio']}%)")
+        elif job['error']:
+            print(f"오류: {job['error']}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+
+def test_metrics():
+    """Prometheus 메트릭 조회 테스트"""
+    print("\n" + "=" * 80)
+    print("11. 메트릭 조회 테스트")
+    print("=" * 80)
+    
+    try:
+        response = requests.get("http://localhost:8000/metrics", timeout=5)
+        print(f"Status Code: {response.status_code}")
+        print(f"Content-Type: {response.headers.get('content-type')}")
+        
+        # 단계별 소요 시간 합계와 캐시 적중률만 출력
+        for line in response.text.splitlines():
+            if line.startswith(('review_stage_duration_seconds_sum',
+                                'review_response_cache_hit_ratio')):
+                print(line)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+
+def test_compression():
+    """응답 압축 협상 테스트"""
+    print("\n" + "=" * 80)
+    print("12. 응답 압축 테스트 (gzip/brotli)")
+    print("=" * 80)
+    
+    try:
+        url = "http://localhost:8000/api/v1/negative-analysis"
+        for encoding in ("identity", "gzip", "br"):
+            # stream=True: 자동 압축 해제 전 전송 크기 확인
+            response = requests.get(url, params={"top_n": 50},
+                                    headers={"Accept-Encoding": encoding},
+                                    stream=True, timeout=5)
+            raw_size = len(response.raw.read())
+            print(f"Accept-Encoding: {encoding:<8} → Content-Encoding: "
+                  f"{response.headers.get('content-encoding', 'identity'):<8} "
+                  f"전송 크기: {raw_size:,} bytes | ETag: {response.headers.get('etag')}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+
+def test_admission_control():
+    """동시 실행 제한 테스트 (캐시되지 않은 부정 리뷰 분석 동시 요청 중 추천 응답 시간)"""
+    print("\n" + "=" * 80)
+    print("13. 동시 실행 제한 테스트 (부정 리뷰 분석 12건 동시 요청)")
+    print("=" * 80)
+    
+    def analyze(top_n):
+        response = requests.get("http://localhost:8000/api/v1/negative-analysis",
+                                params={"top_n": top_n}, timeout=5)
+        return response.status_code, response.headers.get("retry-after")
+    
+    try:
+        with ThreadPoolExecutor(max_workers=12) as pool:
+            # 응답 캐시를 피하도록 요청마다 다른 top_n 사용
+            futures = [pool.submit(analyze, top_n) for top_n in range(21, 33)]
+            time.sleep(0.5)
+            start = time.time()
+            response = requests.get("http://localhost:8000/api/v1/recommend/100",
+                                    timeout=5)
+            elapsed_ms = (time.time() - start) * 1000
+            print(f"부하 중 추천 API: {response.status_code} ({elapsed_ms:.1f}ms)")
+            results = [future.result() for future in futures]
+        
+        for status in sorted({status for status, _ in results}):
+            count = sum(1 for code, _ in results if code == status)
+            retry_after = {value for code, value in results if code == status}
+            note = ""
+            if status in (429, 503):
+                note = f" (Retry-After: {', '.join(sorted(retry_after))}초)"
+            print(f"Status {status}: {count}건{note}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+
 def main():
     """메인 테스트 실행"""
     print("=" * 80)
@@ -162,21 +376,22 @@ def main():
     print("API 문서: http://localhost:8000/docs")
     print("=" * 80)
     
-    # 서버가 준비될 때까지 대기
+    # 서버 워밍업(추천 시스템 로드)이 끝날 때까지 대기
     print("\n서버 연결 대기 중...")
-    max_retries = 10
+    max_retries = 60
     for i in range(max_retries):
         try:
-            response = requests.get("http://localhost:8000/health", timeout=1)
+            response = requests.get("http://localhost:8000/ready", timeout=1)
             if response.status_code == 200:
                 print("✓ 서버 연결 성공!\n")
                 break
-        except:
-            if i < max_retries - 1:
-                time.sleep(1)
-            else:
-                print("❌ 서버 연결 실패. api_server.py를 먼저 실행해주세요.")
-                return
+        except requests.RequestException:
+            pass
+        if i < max_retries - 1:
+            time.sleep(1)
+        else:
+            print("❌ 서버 연결 실패. api_server.py를 먼저 실행해주세요.")
+            return
     
     # 테스트 실행
     test_health()
@@ -185,6 +400,13 @@ def main():
     test_negative_analysis()
     test_product_profile()
     test_customer_profile()
+    test_similar_products()
+    test_recommend_batch()
+    test_export_recommendations()
+    test_jobs()
+    test_metrics()
+    test_compression()
+    test_admission_control()
     
     print("\n" + "=" * 80)
     print("✅ 모든 테스트 완료!")
@@ -3,7 +3,6 @@
 
 API 서버 없이 직접 데이터를 수집하여 이메일로 전송합니다.
 """
-import sqlite3
 from datetime import datetime
 import sys
 from pathlib import Path
@@ -15,6 +14,7 @@ sys.path.insert(0, str(project_root))
 from emailer.email_reporter import EmailReporter
 from src.recommendation_system import RecommendationSystem
 from src.analyze_negative_reviews import NegativeReviewAnalyzer
+from src.db import get_connection
 
 
 def collect_data_directly():
@@ -33,7 +33,7 @@ def collect_data_directly():
     try:
         # 1. 전체 통계
         print("1. 전체 통계 조회...")
-        conn = sqlite3.connect('data/reviews.db')
+        conn = get_connection('data/reviews.db')
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -49,7 +49,6 @@ def collect_data_directly():
         """)
         
         stats = cursor.fetchone()
-        conn.close()
         
         total_customers, total_products, total_reviews, avg_rating, positive, negative, neutral = stats
         
@@ -13,6 +13,9 @@ def create_database_and_tables(db_path):
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
+    # WAL 모드: 적재 중에도 API의 읽기 전용 연결이 막히지 않음 (파일에 저장되어 계속 유지)
+    cursor.execute("PRAGMA journal_mode=WAL")
+    
     # customers 테이블 생성
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS customers (
@@ -49,6 +52,12 @@ def create_database_and_tables(db_path):
         )
     """)
     
+    # 상품별 부정 리뷰 내보내기가 정렬 없이 상품 ID 순으로 읽도록 인덱스 생성
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_reviews_product_sentiment
+        ON reviews (product_id, sentiment)
+    """)
+    
     conn.commit()
     return conn
 
@@ -5,5 +5,17 @@ src 패키지
 - text_cleaner: 텍스트 전처리 및 정제
 - analyze_negative_reviews: 부정 리뷰 분석
 - recommendation_system: 상품 추천 시스템
+- evaluate_recommender: 추천 시스템 오프라인 평가
+- latent_factors: 잠재 요인(ALS) 추천 엔진
+- batch_scoring: 멀티프로세스 배치 추천
+- diversity: 추천 다양성 재정렬
+- db: SQLite 연결 풀
+- ann_index: 근사 최근접 이웃(LSH) 인덱스
+- product_stats: 상품별 사전 집계 통계 테이블
+- purchase_index: 고객별 구매 이력 CSR 인덱스
+- recommender_snapshot: 추천 시스템 스냅샷 무중단 교체
+- job_queue: SQLite 기반 백그라운드 작업 큐
+- job_worker: 백그라운드 작업 워커 프로세스
+- metrics: 처리 단계별 지연 시간 히스토그램 (Prometheus 형식)
 - chart_generator: 차트 생성 및 시각화
 """
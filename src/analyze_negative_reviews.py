@@ -3,12 +3,14 @@
 
 제품별 부정 키워드를 집계하여 개선이 필요한 상품을 식별합니다.
 """
-import sqlite3
 import json
 import csv
 from collections import defaultdict
-from typing import Dict, List, Tuple
-from src.text_cleaner import KoreanTextCleaner
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.text_cleaner import shared_cleaner
+from src.product_stats import load_product_stats
+from src.db import connect, get_connection
+from src.metrics import stage_timer, timed_operation
 
 
 class NegativeReviewAnalyzer:
@@ -22,7 +24,7 @@ class NegativeReviewAnalyzer:
             db_path (str): 데이터베이스 파일 경로
         """
         self.db_path = db_path
-        self.cleaner = KoreanTextCleaner()
+        self.cleaner = shared_cleaner()
         
         # 문제점 카테고리 사전
         self.problem_categories = {
@@ -45,7 +47,7 @@ class NegativeReviewAnalyzer:
         print("제품별 부정 키워드 분석 시작")
         print("=" * 80)
         
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
         
         # 부정 리뷰 추출
@@ -55,34 +57,86 @@ class NegativeReviewAnalyzer:
         WHERE sentiment = 'Negative'
         """
         
-        cursor.execute(query)
-        negative_reviews = cursor.fetchall()
+        with stage_timer('sql'):
+            cursor.execute(query)
+            negative_reviews = cursor.fetchall()
         
         print(f"\n총 {len(negative_reviews)}개의 부정 리뷰를 분석합니다...")
         
         # 제품별 부정 키워드 집계
         product_negative_keywords = defaultdict(lambda: defaultdict(int))
         
-        for review_id, product_id, review_text in negative_reviews:
-            # 부정 키워드 추출
-            sentiment_keywords = self.cleaner.get_sentiment_keywords(review_text)
-            negative_keywords = sentiment_keywords['negative']
-            
-            # 부정 키워드가 없으면 모든 키워드 추출
-            if not negative_keywords:
-                all_keywords = self.cleaner.extract_keywords(review_text)
-                negative_keywords = all_keywords[:5]  # 상위 5개만
-            
-            # 제품별로 키워드 카운트
-            for keyword in negative_keywords:
-                product_negative_keywords[product_id][keyword] += 1
-        
-        conn.close()
+        with stage_timer('tokenize'):
+            for review_id, product_id, review_text in negative_reviews:
+                # 제품별로 키워드 카운트
+                for keyword in self._negative_keywords(review_text):
+                    product_negative_keywords[product_id][keyword] += 1
         
         print(f"✓ {len(product_negative_keywords)}개 제품의 부정 키워드 분석 완료")
         
         return dict(product_negative_keywords)
     
+    def _negative_keywords(self, review_text: str) -> List[str]:
+        """
+        부정 리뷰 한 건의 부정 키워드 추출
+        
+        Args:
+            review_text (str): 리뷰 텍스트
+            
+        Returns:
+            List[str]: 부정 키워드 (없으면 전체 키워드 상위 5개)
+        """
+        negative_keywords = self.cleaner.get_sentiment_keywords(review_text)['negative']
+        
+        # 부정 키워드가 없으면 모든 키워드 추출
+        if not negative_keywords:
+            negative_keywords = self.cleaner.extract_keywords(review_text)[:5]  # 상위 5개만
+        
+        return negative_keywords
+    
+    def iter_product_analysis(self) -> Iterator[Dict]:
+        """
+        상품별 부정 리뷰 분석 결과를 상품 ID 순으로 하나씩 생성 (스트리밍 내보내기용)
+        
+        부정 리뷰를 상품 ID 순으로 읽으면서 상품이 바뀔 때마다 결과를 내보내므로
+        메모리에는 현재 상품의 키워드 집계만 유지되고 첫 결과가 바로 나옵니다.
+        상품 내에서는 rowid 순으로 읽어 동점 키워드 순서가 전체 분석 결과와 같습니다.
+        (reviews(product_id) 인덱스가 있으면 정렬 없이 인덱스 순서로 읽음)
+        
+        Returns:
+            Iterator[Dict]: get_improvement_priority_products와 같은 형식의 상품별 분석 결과
+        """
+        product_stats = load_product_stats(self.db_path)
+        
+        # 제너레이터는 호출마다 다른 스레드에서 재개될 수 있으므로 풀 대신 전용 연결 사용
+        conn = connect(self.db_path, read_only=True, check_same_thread=False)
+        try:
+            cursor = conn.execute("""
+                SELECT product_id, review_text
+                FROM reviews
+                WHERE sentiment = 'Negative'
+                ORDER BY product_id, rowid
+            """)
+            
+            current_id = None
+            keywords = defaultdict(int)
+            for product_id, review_text in cursor:
+                if product_id != current_id:
+                    entry = self._priority_entry(current_id, keywords, product_stats)
+                    if entry:
+                        yield entry
+                    current_id = product_id
+                    keywords = defaultdict(int)
+                
+                for keyword in self._negative_keywords(review_text):
+                    keywords[keyword] += 1
+            
+            entry = self._priority_entry(current_id, keywords, product_stats)
+            if entry:
+                yield entry
+        finally:
+            conn.close()
+    
     def categorize_problems(self, keywords: Dict[str, int]) -> Dict[str, List[Tuple[str, int]]]:
         """
         부정 키워드를 문제점 카테고리별로 분류
@@ -118,6 +172,7 @@ class NegativeReviewAnalyzer:
         
         return dict(categorized)
     
+    @timed_operation('negative_analysis')
     def get_improvement_priority_products(self, top_n: int = 5) -> List[Dict]:
         """
         개선 우선순위 상품 Top N 리스트업
@@ -135,70 +190,72 @@ class NegativeReviewAnalyzer:
         # 제품별 부정 키워드 집계
         product_keywords = self.analyze_negative_keywords_by_product()
         
-        # 제품 정보 가져오기
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # 제품 정보 및 통계 가져오기 (사전 집계된 product_stats 테이블, 쿼리 1회)
+        with stage_timer('product_stats'):
+            product_stats = load_product_stats(self.db_path)
         
         priority_list = []
         
-        for product_id, keywords in product_keywords.items():
-            # 총 부정 키워드 빈도
-            total_negative_count = sum(keywords.values())
-            
-            # 제품 정보 조회
-            cursor.execute("""
-                SELECT product_name, category
-                FROM products
-                WHERE product_id = ?
-            """, (product_id,))
-            
-            product_info = cursor.fetchone()
-            if not product_info:
-                continue
-            
-            product_name, category = product_info
-            
-            # 평균 별점 및 리뷰 수 조회
-            cursor.execute("""
-                SELECT AVG(rating), COUNT(*), 
-                       SUM(CASE WHEN sentiment = 'Negative' THEN 1 ELSE 0 END)
-                FROM reviews
-                WHERE product_id = ?
-            """, (product_id,))
-            
-            avg_rating, review_count, negative_count = cursor.fetchone()
-            
-            # 문제점 카테고리화
-            categorized_problems = self.categorize_problems(keywords)
+        with stage_timer('aggregate'):
+            for product_id, keywords in product_keywords.items():
+                entry = self._priority_entry(product_id, keywords, product_stats)
+                if entry:
+                    priority_list.append(entry)
             
-            # 주요 문제점 (빈도 Top 5)
-            top_keywords = sorted(keywords.items(), key=lambda x: x[1], reverse=True)[:5]
-            
-            priority_list.append({
-                'product_id': product_id,
-                'product_name': product_name,
-                'category': category,
-                'total_negative_keyword_count': total_negative_count,
-                'negative_review_count': negative_count,
-                'total_review_count': review_count,
-                'average_rating': round(avg_rating, 2),
-                'negative_ratio': round(negative_count / review_count * 100, 1),
-                'top_negative_keywords': [
-                    {'keyword': k, 'count': c} for k, c in top_keywords
-                ],
-                'problem_categories': {
-                    cat: [{'keyword': k, 'count': c} for k, c in items[:3]]
-                    for cat, items in categorized_problems.items()
-                }
-            })
-        
-        conn.close()
-        
-        # 총 부정 키워드 빈도로 정렬
-        priority_list.sort(key=lambda x: x['total_negative_keyword_count'], reverse=True)
+            # 총 부정 키워드 빈도로 정렬
+            priority_list.sort(key=lambda x: x['total_negative_keyword_count'],
+                               reverse=True)
         
         return priority_list[:top_n]
     
+    def _priority_entry(self, product_id: Optional[int], keywords: Dict[str, int],
+                        product_stats) -> Optional[Dict]:
+        """
+        상품 하나의 부정 키워드 집계를 분석 결과 항목으로 변환
+        
+        Args:
+            product_id (int): 상품 ID
+            keywords (Dict[str, int]): {keyword: count}
+            product_stats (ProductStats): 상품 통계
+            
+        Returns:
+            Dict: 분석 결과 항목 (상품 통계가 없거나 키워드가 없으면 None)
+        """
+        stats = product_stats.get(product_id) if product_id is not None else None
+        if not stats or not keywords:
+            return None
+        
+        # 총 부정 키워드 빈도
+        total_negative_count = sum(keywords.values())
+        
+        avg_rating = stats['average_rating']
+        review_count = stats['review_count']
+        negative_count = stats['negative_count']
+        
+        # 문제점 카테고리화
+        categorized_problems = self.categorize_problems(keywords)
+        
+        # 주요 문제점 (빈도 Top 5)
+        top_keywords = sorted(keywords.items(), key=lambda x: x[1], reverse=True)[:5]
+        
+        return {
+            'product_id': product_id,
+            'product_name': stats['product_name'],
+            'category': stats['category'],
+            'total_negative_keyword_count': total_negative_count,
+            'negative_review_count': negative_count,
+            'total_review_count': review_count,
+            'average_rating': round(avg_rating, 2),
+            'negative_ratio': round(negative_count / review_count * 100, 1),
+            'top_negative_keywords': [
+                {'keyword': k, 'count': c} for k, c in top_keywords
+            ],
+            'problem_categories': {
+                cat: [{'keyword': k, 'count': c} for k, c in items[:3]]
+                for cat, items in categorized_problems.items()
+            }
+        }
+    
     def generate_improvement_report(self, top_n: int = 5, 
                                    output_json: str = 'reports/improvement_priority_top5.json',
                                    output_csv: str = 'reports/improvement_priority_top5.csv'):
@@ -0,0 +1,136 @@
+"""
+근사 최근접 이웃(ANN) 인덱스 모듈
+
+정규화된 상품 벡터 위에 랜덤 프로젝션 LSH 인덱스를 구축하여
+카탈로그 전체를 스캔하지 않고 코사인 유사도 후보를 빠르게 찾습니다.
+"""
+from typing import Optional
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+class RandomProjectionLSH:
+    """랜덤 프로젝션(SimHash) 기반 코사인 LSH 인덱스 클래스"""
+
+    def __init__(self, n_tables: int = 8, n_bits: Optional[int] = None,
+                 seed: int = 42, chunk_size: int = 10000):
+        """
+        RandomProjectionLSH 초기화
+
+        Args:
+            n_tables (int): 해시 테이블 개수 (많을수록 재현율 증가, 메모리 증가)
+            n_bits (int): 테이블당 해시 비트 수 (None이면 카탈로그 크기로 자동 결정)
+            seed (int): 랜덤 초평면 생성 시드
+            chunk_size (int): 인덱스 구축 시 한 번에 투영할 행 개수
+        """
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.planes = None
+        self.n_items = 0
+        self._bit_weights = None
+        self._sorted_codes = None
+        self._order = None
+
+    @staticmethod
+    def auto_bits(n_items: int, bucket_size: int = 64) -> int:
+        """
+        버킷당 평균 항목 수가 bucket_size 근처가 되도록 비트 수 결정
+
+        Args:
+            n_items (int): 인덱싱할 항목 수
+            bucket_size (int): 목표 버킷 크기
+
+        Returns:
+            int: 테이블당 해시 비트 수 (4~24)
+        """
+        bits = int(np.ceil(np.log2(max(n_items / bucket_size, 1))))
+        return int(min(max(bits, 4), 24))
+
+    def fit(self, vectors: csr_matrix) -> 'RandomProjectionLSH':
+        """
+        상품 벡터로 인덱스 구축
+
+        Args:
+            vectors (csr_matrix): (상품 수 x 키워드 수) 희소 행렬
+
+        Returns:
+            RandomProjectionLSH: 자기 자신
+        """
+        n_items, dim = vectors.shape
+        if self.n_bits is None:
+            self.n_bits = self.auto_bits(n_items)
+
+        rng = np.random.default_rng(self.seed)
+        self.planes = rng.standard_normal(
+            (dim, self.n_tables * self.n_bits)
+        ).astype(np.float32)
+        self._bit_weights = np.left_shift(1, np.arange(self.n_bits, dtype=np.int64))
+
+        # 메모리가 폭증하지 않도록 청크 단위로 투영
+        codes = np.empty((self.n_tables, n_items), dtype=np.int64)
+        for start in range(0, n_items, self.chunk_size):
+            end = min(start + self.chunk_size, n_items)
+            projected = np.asarray(vectors[start:end] @ self.planes)
+            codes[:, start:end] = self._hash(projected).T
+
+        # 테이블별로 해시 코드 정렬 → searchsorted로 버킷 조회
+        self._order = np.argsort(codes, axis=1, kind='stable')
+        self._sorted_codes = np.take_along_axis(codes, self._order, axis=1)
+        self.n_items = n_items
+
+        return self
+
+    def _hash(self, projected: np.ndarray) -> np.ndarray:
+        """
+        투영 값을 테이블별 해시 코드로 변환
+
+        Args:
+            projected (np.ndarray): (행 수 x 테이블 수*비트 수) 투영 값
+
+        Returns:
+            np.ndarray: (행 수 x 테이블 수) 해시 코드
+        """
+        bits = (projected > 0).reshape(-1, self.n_tables, self.n_bits)
+        return bits.astype(np.int64) @ self._bit_weights
+
+    def query(self, vector: csr_matrix, n_probes: int = 0) -> np.ndarray:
+        """
+        질의 벡터와 같은 버킷(및 인접 버킷)에 속한 후보 인덱스 조회
+
+        Args:
+            vector (csr_matrix): (1 x 키워드 수) 질의 벡터
+            n_probes (int): 테이블당 추가로 탐색할 인접 버킷 수
+                (재현율/지연시간 조절 값, 0이면 동일 버킷만 탐색)
+
+        Returns:
+            np.ndarray: 정렬된 후보 상품 인덱스 배열
+        """
+        if self.planes is None:
+            raise ValueError("인덱스가 구축되지 않았습니다. fit()을 먼저 호출하세요.")
+
+        projected = np.asarray(vector @ self.planes).reshape(
+            self.n_tables, self.n_bits
+        )
+        base_codes = self._hash(projected.reshape(1, -1))[0]
+
+        # 멀티 프로브: 경계에 가장 가까운(|투영값|이 작은) 비트를 하나씩 뒤집음
+        n_probes = min(max(n_probes, 0), self.n_bits)
+        flip_bits = np.argsort(np.abs(projected), axis=1)[:, :n_probes]
+
+        candidates = []
+        for table in range(self.n_tables):
+            codes = [base_codes[table]]
+            codes.extend(base_codes[table] ^ (1 << int(b)) for b in flip_bits[table])
+            sorted_codes = self._sorted_codes[table]
+            lo = np.searchsorted(sorted_codes, codes, side='left')
+            hi = np.searchsorted(sorted_codes, codes, side='right')
+            for start, end in zip(lo, hi):
+                if end > start:
+                    candidates.append(self._order[table, start:end])
+
+        if not candidates:
+            return np.empty(0, dtype=np.int64)
+
+        return np.unique(np.concatenate(candidates))
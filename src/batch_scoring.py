@@ -0,0 +1,265 @@
+"""
+멀티프로세스 배치 추천 모듈
+
+상품 행렬(CSR)의 data/indices/indptr 배열을 multiprocessing.shared_memory에 한 번만
+게시하고, ProcessPoolExecutor 워커는 이름으로 붙기만(attach) 하므로 상품 프로필을
+워커마다 언피클하여 복사하지 않습니다. 워커 수를 늘려도 상품 행렬 메모리는 그대로입니다.
+
+고객 프로필 생성(DB 조회)과 벡터화는 메인 프로세스가 하고, 워커는 고객 벡터 블록과
+상품 행렬의 곱 및 상위 N개 선택만 담당합니다.
+
+실행:
+    BATCH_WORKERS=8 python -m src.batch_scoring
+"""
+import os
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from src.db import get_connection
+from src.evaluate_recommender import peak_memory_mb
+from src.recommendation_system import (
+    SIMILARITY_BLOCK_ELEMENTS, RecommendationSystem, create_recommender_from_env,
+    csr_nbytes, top_k_rows
+)
+
+
+# 공유 메모리에 게시하는 상품 행렬 배열
+SHARED_ARRAYS = ('data', 'indices', 'indptr', 'product_ids')
+
+
+class SharedProductMatrix:
+    """상품 행렬(CSR) 배열을 공유 메모리 세그먼트로 게시하는 클래스"""
+
+    def __init__(self, recommender: RecommendationSystem):
+        """
+        SharedProductMatrix 초기화 (상품 행렬 배열을 공유 메모리로 복사)
+
+        Args:
+            recommender (RecommendationSystem): 상품 행렬이 준비된 추천 시스템
+        """
+        matrix = recommender.product_vectors
+        arrays = {
+            'data': matrix.data,
+            'indices': matrix.indices,
+            'indptr': matrix.indptr,
+            'product_ids': np.asarray(recommender.product_ids, dtype=np.int64),
+        }
+
+        self.shape = matrix.shape
+        self.segments = {}
+        self.handle = {'shape': self.shape, 'arrays': {}}
+
+        try:
+            for key in SHARED_ARRAYS:
+                array = arrays[key]
+                # 크기 0 세그먼트는 만들 수 없으므로 최소 1바이트
+                segment = shared_memory.SharedMemory(
+                    create=True, size=max(array.nbytes, 1)
+                )
+                self.segments[key] = segment
+                view = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)
+                view[:] = array
+                self.handle['arrays'][key] = (
+                    segment.name, array.dtype.str, array.shape
+                )
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """공유 메모리 세그먼트 해제 (게시한 프로세스에서 한 번만 호출)"""
+        for segment in self.segments.values():
+            segment.close()
+            segment.unlink()
+        self.segments = {}
+
+    def __enter__(self) -> 'SharedProductMatrix':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def attach_product_matrix(
+    handle: Dict
+) -> Tuple[csr_matrix, np.ndarray, List[shared_memory.SharedMemory]]:
+    """
+    공유 메모리에 게시된 상품 행렬에 복사 없이 연결
+
+    Args:
+        handle (Dict): SharedProductMatrix.handle
+
+    Returns:
+        Tuple: (상품 행렬, 상품 ID 배열, 연결한 세그먼트 리스트)
+            세그먼트는 행렬을 쓰는 동안 참조를 유지해야 합니다.
+    """
+    segments = []
+    arrays = {}
+    for key, (name, dtype, shape) in handle['arrays'].items():
+        segment = shared_memory.SharedMemory(name=name)
+        segments.append(segment)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+        array.flags.writeable = False
+        arrays[key] = array
+
+    matrix = csr_matrix(
+        (arrays['data'], arrays['indices'], arrays['indptr']),
+        shape=tuple(handle['shape']), copy=False
+    )
+
+    return matrix, arrays['product_ids'], segments
+
+
+# 워커 프로세스별 상태 (initializer에서 한 번 설정)
+_worker = {}
+
+
+def _init_worker(handle: Dict):
+    """워커 초기화: 공유 상품 행렬에 연결 (워커당 한 번)"""
+    matrix, product_ids, segments = attach_product_matrix(handle)
+    _worker['segments'] = segments
+    _worker['product_ids'] = product_ids
+    _worker['product_vectors'] = matrix
+    _worker['has_profile'] = np.diff(matrix.indptr) > 0
+
+
+def _score_block(block: List[int], vectors: csr_matrix,
+                 purchased_rows: List[np.ndarray],
+                 top_n: int) -> Dict[int, List[Tuple[int, float]]]:
+    """
+    워커에서 고객 벡터 블록의 상위 N개 상품 계산
+
+    Args:
+        block: 고객 ID 리스트
+        vectors: 고객 벡터 (블록 크기 x 키워드 수)
+        purchased_rows: 고객별 제외할 상품 행 인덱스
+        top_n: 고객별 추천 상품 개수
+
+    Returns:
+        Dict[int, List[Tuple[int, float]]]: {customer_id: [(product_id, score), ...]}
+    """
+    product_ids = _worker['product_ids']
+    # top_products_batch와 같은 방향으로 곱해야 점수가 비트 단위까지 같음
+    scores = (_worker['product_vectors'] @ vectors.T).toarray().T
+
+    scores[:, ~_worker['has_profile']] = -np.inf
+    for row, rows in enumerate(purchased_rows):
+        scores[row, rows] = -np.inf
+
+    top, top_scores = top_k_rows(scores, min(top_n, len(product_ids)))
+
+    results = {}
+    for row, customer_id in enumerate(block):
+        valid = np.isfinite(top_scores[row])
+        results[customer_id] = list(zip(
+            product_ids[top[row][valid]].tolist(),
+            top_scores[row][valid].tolist()
+        ))
+    return results
+
+
+def score_customers_parallel(
+    recommender: RecommendationSystem, customer_ids: List[int],
+    top_n: int = 5, exclude_purchased: bool = True,
+    workers: Optional[int] = None
+) -> Dict[int, List[Tuple[int, float]]]:
+    """
+    여러 고객의 추천 상품을 프로세스 풀로 계산 (top_products_batch와 같은 결과)
+
+    Args:
+        recommender (RecommendationSystem): 추천 시스템
+        customer_ids: 고객 ID 리스트
+        top_n: 고객별 추천 상품 개수
+        exclude_purchased: 이미 리뷰 작성한 상품 제외 여부
+        workers: 워커 프로세스 수 (None이면 CPU 수)
+
+    Returns:
+        Dict[int, List[Tuple[int, float]]]: {customer_id: [(product_id, score), ...]}
+            (추천할 수 없는 고객은 빈 리스트)
+    """
+    recommender.prepare_batch_scoring(exclude_purchased)
+
+    profiles = recommender.build_customer_profiles(customer_ids)
+    results = {customer_id: [] for customer_id in profiles}
+    warm_ids = [customer_id for customer_id, profile in profiles.items() if profile]
+
+    n_products = len(recommender.product_ids)
+    if n_products == 0 or top_n <= 0 or not warm_ids:
+        return results
+
+    block_size = max(1, SIMILARITY_BLOCK_ELEMENTS // n_products)
+    empty = np.empty(0, dtype=np.int64)
+
+    # fork는 부모의 프로필 dict까지 물려받아 참조 카운트 갱신 시 페이지가 복사되므로
+    # 깨끗한 프로세스에서 공유 메모리에만 연결하도록 spawn 사용
+    with SharedProductMatrix(recommender) as shared, \
+            ProcessPoolExecutor(max_workers=workers,
+                                mp_context=get_context('spawn'),
+                                initializer=_init_worker,
+                                initargs=(shared.handle,)) as executor:
+        futures = []
+        for start in range(0, len(warm_ids), block_size):
+            block = warm_ids[start:start + block_size]
+            vectors = recommender.vectorize_profiles([profiles[c] for c in block])
+            purchased_rows = [
+                recommender._product_rows(recommender.purchase_index.get(c))
+                if exclude_purchased else empty
+                for c in block
+            ]
+            futures.append(executor.submit(
+                _score_block, block, vectors, purchased_rows, top_n
+            ))
+
+        for future in futures:
+            results.update(future.result())
+
+    return results
+
+
+def main():
+    """전체 고객 배치 추천 (워커 수는 BATCH_WORKERS 환경변수, 기본값 CPU 수)"""
+    workers = int(os.getenv('BATCH_WORKERS', os.cpu_count() or 1))
+    top_n = int(os.getenv('BATCH_TOP_N', '5'))
+    output_path = 'reports/batch_recommendations.json'
+
+    print("=" * 80)
+    print(f"멀티프로세스 배치 추천 (워커 {workers}개)")
+    print("=" * 80)
+
+    recommender = create_recommender_from_env()
+    recommender.load_profiles()
+
+    customer_ids = [row[0] for row in get_connection(recommender.db_path).execute(
+        "SELECT DISTINCT customer_id FROM reviews ORDER BY customer_id"
+    )]
+
+    start = time.perf_counter()
+    results = score_customers_parallel(recommender, customer_ids, top_n=top_n,
+                                       workers=workers)
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({str(customer_id): products
+                   for customer_id, products in results.items()},
+                  f, ensure_ascii=False)
+
+    print(f"\n고객 수: {len(results)}명")
+    print(f"공유 상품 행렬: {csr_nbytes(recommender.product_vectors) / 1024 ** 2:.1f}MB")
+    print(f"소요 시간: {elapsed:.2f}초 ({len(results) / max(elapsed, 1e-9):.1f}명/초)")
+    print(f"메인 프로세스 최대 RSS: {peak_memory_mb() or 0:.1f}MB")
+
+    print("\n" + "=" * 80)
+    print("✅ 배치 추천 완료!")
+    print("=" * 80)
+    print(f"\n생성된 파일:\n  - {output_path}")
+
+
+if __name__ == '__main__':
+    main()
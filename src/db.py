@@ -0,0 +1,302 @@
+"""
+SQLite 연결 관리 모듈
+
+모든 모듈이 메서드마다 sqlite3.connect/close를 반복하지 않도록 스레드별로
+연결을 재사용하는 풀을 제공합니다.
+
+- 쓰기 연결은 WAL 저널 모드로 전환하여 적재 작업 중에도 읽기가 막히지 않습니다.
+- 조회 경로는 읽기 전용(mode=ro) 연결을 사용합니다.
+- 모든 연결에 mmap_size, cache_size, synchronous 등 PRAGMA를 적용합니다.
+- DatabaseVersion은 응답 캐시 키로 쓰는 DB 버전 토큰을 제공합니다
+  (data_changes 테이블의 트리거 변경 카운터).
+"""
+import os
+import sqlite3
+import threading
+import weakref
+from typing import Dict, Optional, Set, Tuple
+from urllib.request import pathname2url
+
+
+# 리뷰 데이터베이스 경로 (API 서버, 작업 워커, 추천 시스템이 함께 사용)
+REVIEW_DB_PATH = os.getenv('REVIEW_DB_PATH', 'data/reviews.db')
+
+# 연결마다 적용하는 PRAGMA
+CONNECTION_PRAGMAS = {
+    'mmap_size': 256 * 1024 * 1024,   # 256MB 메모리 맵 읽기
+    'cache_size': -64 * 1024,         # 페이지 캐시 64MB (음수는 KB 단위)
+    'synchronous': 'NORMAL',          # WAL에서는 NORMAL로도 손상 없이 안전
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,             # 쓰기 잠금 대기 (ms)
+}
+
+
+# 리뷰/상품 테이블이 바뀔 때마다 트리거로 증가하는 변경 카운터와 마지막 변경 시각
+DATA_CHANGES_TABLES = ('reviews', 'products')
+
+DATA_CHANGES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS data_changes (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 0,
+    changed_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+);
+
+INSERT OR IGNORE INTO data_changes (id) VALUES (1);
+""" + "".join(f"""
+CREATE TRIGGER IF NOT EXISTS trg_data_changes_{table}_{event.lower()}
+AFTER {event} ON {table}
+BEGIN
+    UPDATE data_changes SET
+        version = version + 1,
+        changed_at = CAST(strftime('%s', 'now') AS INTEGER)
+    WHERE id = 1;
+END;
+""" for table in DATA_CHANGES_TABLES for event in ('INSERT', 'UPDATE', 'DELETE'))
+
+
+def connect(db_path: str = REVIEW_DB_PATH, read_only: bool = False,
+            **kwargs) -> sqlite3.Connection:
+    """
+    PRAGMA가 적용된 새 연결 생성 (풀을 쓰지 않는 일회성/쓰기 작업용)
+
+    Args:
+        db_path (str): 데이터베이스 파일 경로
+        read_only (bool): 읽기 전용 연결 여부
+        **kwargs: sqlite3.connect 추가 인자
+
+    Returns:
+        sqlite3.Connection: 연결 (쓰기 연결이면 WAL 모드로 전환됨)
+    """
+    if read_only:
+        uri = f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, **kwargs)
+    else:
+        conn = sqlite3.connect(db_path, **kwargs)
+        # WAL 모드는 파일에 저장되므로 한 번 전환하면 이후 모든 연결에 적용됨
+        conn.execute("PRAGMA journal_mode=WAL")
+
+    for name, value in CONNECTION_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value}")
+
+    return conn
+
+
+class _ThreadConnections:
+    """한 스레드의 연결 모음 (약한 참조로 풀에 등록)"""
+
+    def __init__(self):
+        """_ThreadConnections 초기화"""
+        self.connections: Dict[Tuple[str, bool], sqlite3.Connection] = {}
+        # 다른 스레드의 close_all이 닫기를 요청한 경로 (None이면 전체)
+        self.stale: Set[Optional[str]] = set()
+
+    def close_matching(self, path: Optional[str]) -> int:
+        """
+        경로가 일치하는 연결 닫기
+
+        Args:
+            path (str): 절대 경로 (None이면 전체)
+
+        Returns:
+            int: 닫은 연결 수
+        """
+        keys = [key for key in self.connections if path is None or key[0] == path]
+        for key in keys:
+            self.connections.pop(key).close()
+        return len(keys)
+
+
+class ConnectionPool:
+    """스레드별로 (경로, 읽기 전용 여부)당 연결 하나를 재사용하는 풀 클래스"""
+
+    def __init__(self):
+        """ConnectionPool 초기화"""
+        self._local = threading.local()
+        # 살아 있는 스레드의 연결 모음 (close_all용). 스레드가 종료되면
+        # threading.local과 함께 해제되어 자동으로 빠지고 연결도 닫힘
+        self._registry = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def _connections(self) -> _ThreadConnections:
+        """현재 스레드의 연결 모음 (다른 스레드가 닫기를 요청한 연결은 여기서 닫음)"""
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = _ThreadConnections()
+            self._local.connections = connections
+            with self._lock:
+                self._registry.add(connections)
+        elif connections.stale:
+            with self._lock:
+                stale, connections.stale = connections.stale, set()
+            for path in stale:
+                connections.close_matching(path)
+        return connections
+
+    def get(self, db_path: str = REVIEW_DB_PATH,
+            read_only: bool = True) -> sqlite3.Connection:
+        """
+        현재 스레드의 연결 조회 (없으면 생성)
+
+        Args:
+            db_path (str): 데이터베이스 파일 경로
+            read_only (bool): 읽기 전용 연결 여부
+
+        Returns:
+            sqlite3.Connection: 재사용되는 연결 (호출한 쪽에서 닫지 않음)
+        """
+        key = (os.path.abspath(db_path), read_only)
+        connections = self._connections().connections
+        conn = connections.get(key)
+        if conn is None:
+            # 스레드 간에 공유하지는 않지만 종료된 스레드의 연결은 다른 스레드의 GC가
+            # 해제할 수 있으므로 허용
+            conn = connect(db_path, read_only=read_only, check_same_thread=False)
+            connections[key] = conn
+        return conn
+
+    def close_all(self, db_path: Optional[str] = None) -> int:
+        """
+        풀의 연결 닫기 (임시 DB 삭제 전이나 fork/종료 전)
+
+        다른 스레드가 사용 중일 수 있는 연결은 여기서 닫지 않고, 그 스레드가
+        다음에 연결을 조회할 때 닫고 새로 만들도록 표시만 합니다.
+        종료된 스레드의 연결은 이미 해제되어 있습니다.
+
+        Args:
+            db_path (str): 이 경로의 연결만 닫기 (None이면 전체)
+
+        Returns:
+            int: 현재 스레드에서 바로 닫은 연결 수
+        """
+        path = os.path.abspath(db_path) if db_path else None
+        current = getattr(self._local, 'connections', None)
+        closed = 0
+        with self._lock:
+            for connections in list(self._registry):
+                if connections is current:
+                    closed += connections.close_matching(path)
+                else:
+                    connections.stale.add(path)
+        return closed
+
+
+def ensure_data_changes_table(conn: sqlite3.Connection):
+    """
+    data_changes 변경 카운터 테이블과 트리거를 생성 (없을 때만)
+
+    Args:
+        conn (sqlite3.Connection): 쓰기 가능한 데이터베이스 연결
+    """
+    conn.executescript(DATA_CHANGES_SCHEMA)
+    conn.commit()
+
+
+class DatabaseVersion:
+    """DB 내용이 바뀌었는지 판단하는 버전 토큰 클래스 (응답 캐시 키용)"""
+
+    def __init__(self, db_path: str = REVIEW_DB_PATH):
+        """
+        DatabaseVersion 초기화
+
+        Args:
+            db_path (str): 데이터베이스 파일 경로
+        """
+        self.db_path = db_path
+        self._conn = None
+        self._data_version = None
+        self._token = None
+        # 마지막 변경 시각 (Unix 초, data_changes에 저장된 값이라 워커 간에 같음)
+        self.changed_at = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        """전용 읽기 연결 생성 (변경 카운터 테이블이 없으면 쓰기 연결로 한 번 생성)"""
+        self._conn = connect(self.db_path, read_only=True, check_same_thread=False)
+        exists = self._conn.execute("""
+            SELECT 1 FROM sqlite_master
+            WHERE type = 'table' AND name = 'data_changes'
+        """).fetchone()
+        if exists:
+            return
+        try:
+            writer = connect(self.db_path)
+            try:
+                ensure_data_changes_table(writer)
+            finally:
+                writer.close()
+        except sqlite3.OperationalError as e:
+            # 읽기 전용 DB 등으로 만들 수 없으면 리뷰 rowid만으로 버전을 판단
+            print(f"⚠️  변경 카운터 테이블을 만들 수 없습니다: {e}")
+
+    def _compute_token(self) -> str:
+        """
+        data_changes 변경 카운터로 프로세스 간에도 같은 토큰 계산
+
+        리뷰/상품의 추가, 삭제, 수정(리뷰 본문 등 모든 컬럼)마다 트리거가 카운터와
+        마지막 변경 시각을 갱신하므로 모든 워커가 같은 토큰과 changed_at을 얻습니다.
+        """
+        try:
+            version, changed_at = self._conn.execute(
+                "SELECT version, changed_at FROM data_changes WHERE id = 1"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # 변경 카운터 테이블이 없으면 리뷰 rowid만 사용 (수정은 감지하지 못함)
+            self.changed_at = None
+            max_rowid = self._conn.execute(
+                "SELECT MAX(rowid) FROM reviews"
+            ).fetchone()[0]
+            return f"rowid-{max_rowid or 0}"
+        self.changed_at = changed_at
+        # DB를 새로 만들어 카운터가 처음부터 다시 시작해도 이전 토큰과 겹치지 않도록 시각 포함
+        return f"{version}-{changed_at}"
+
+    def token(self) -> str:
+        """
+        현재 버전 토큰
+
+        PRAGMA data_version은 다른 연결이 커밋할 때만 바뀌므로 이 전용 연결로 O(1)에
+        변경 여부를 확인하고, 바뀐 경우에만 토큰을 다시 계산합니다.
+
+        Returns:
+            str: 버전 토큰
+        """
+        with self._lock:
+            if self._conn is None:
+                self._open()
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self._data_version or self._token is None:
+                self._token = self._compute_token()
+                self._data_version = data_version
+            return self._token
+
+
+# 프로세스 전역 연결 풀
+_pool = ConnectionPool()
+
+
+def get_connection(db_path: str = REVIEW_DB_PATH,
+                   read_only: bool = True) -> sqlite3.Connection:
+    """
+    풀에서 현재 스레드의 연결 조회 (조회 경로는 기본값인 읽기 전용 사용)
+
+    Args:
+        db_path (str): 데이터베이스 파일 경로
+        read_only (bool): 읽기 전용 연결 여부
+
+    Returns:
+        sqlite3.Connection: 재사용되는 연결 (닫지 말 것)
+    """
+    return _pool.get(db_path, read_only)
+
+
+def close_connections(db_path: Optional[str] = None) -> int:
+    """
+    풀의 연결 닫기
+
+    Args:
+        db_path (str): 이 경로의 연결만 닫기 (None이면 전체)
+
+    Returns:
+        int: 현재 스레드에서 바로 닫은 연결 수 (다른 스레드의 연결은 다음 조회 때 닫힘)
+    """
+    return _pool.close_all(db_path)
@@ -0,0 +1,386 @@
+"""
+추천 시스템 오프라인 평가 모듈
+
+리뷰를 작성일 기준으로 학습/검증 기간으로 나누어 학습 기간 리뷰로만 프로필을 만든 뒤,
+검증 기간에 고객이 긍정 리뷰를 남긴 상품을 얼마나 맞혔는지
+(precision@k, recall@k, coverage)와 처리량/메모리를 함께 측정합니다.
+추천 시스템 성능 최적화 전후로 실행하여 품질 저하가 없는지 확인하는 용도입니다.
+"""
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+
+import numpy as np
+
+from src.db import close_connections, connect, get_connection
+from src.recommendation_system import RecommendationSystem, create_recommender_from_env
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_memory_mb() -> Optional[float]:
+    """
+    현재 프로세스의 최대 상주 메모리(RSS)
+
+    Returns:
+        float: MB 단위 최대 RSS (지원하지 않는 플랫폼이면 None)
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    if os.uname().sysname == 'Darwin':
+        return peak / 1024 ** 2
+    return peak / 1024
+
+
+class RecommenderEvaluator:
+    """작성일 기준 학습/검증 분할로 추천 품질과 처리량을 측정하는 클래스"""
+
+    def __init__(self, db_path: str = 'data/reviews.db',
+                 recommender_factory: Callable[[str], RecommendationSystem] = (
+                     create_recommender_from_env
+                 ),
+                 holdout_ratio: float = 0.2, split_date: Optional[str] = None):
+        """
+        RecommenderEvaluator 초기화
+
+        Args:
+            db_path (str): 원본 데이터베이스 파일 경로 (변경하지 않음)
+            recommender_factory: db_path를 받아 평가할 추천 시스템을 만드는 함수
+            holdout_ratio (float): 검증 기간으로 사용할 최근 리뷰 비율 (split_date가 없을 때)
+            split_date (str): 이 날짜(YYYY-MM-DD) 이후 리뷰를 검증 기간으로 사용
+        """
+        self.db_path = db_path
+        self.recommender_factory = recommender_factory
+        self.holdout_ratio = holdout_ratio
+        self.split_date = split_date
+
+    def find_split_date(self) -> str:
+        """
+        최근 holdout_ratio 비율의 리뷰가 검증 기간이 되는 분할 날짜
+
+        Returns:
+            str: 분할 날짜 (이 날짜 이후 리뷰가 검증 기간)
+        """
+        if self.split_date:
+            return self.split_date
+
+        conn = get_connection(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT COUNT(*) FROM reviews")
+        total = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT review_date FROM reviews
+            ORDER BY review_date
+            LIMIT 1 OFFSET ?
+        """, (int(total * (1 - self.holdout_ratio)),))
+        split_date = cursor.fetchone()[0]
+
+        return split_date
+
+    def prepare_train_db(self, split_date: str, work_dir: str) -> str:
+        """
+        분할 날짜 이전 리뷰만 남긴 학습용 데이터베이스 사본 생성
+
+        product_stats 트리거가 삭제를 반영하므로 상품 통계도 학습 기간 기준이 됩니다.
+
+        Args:
+            split_date (str): 분할 날짜
+            work_dir (str): 사본을 만들 임시 디렉토리
+
+        Returns:
+            str: 학습용 데이터베이스 경로
+        """
+        train_path = os.path.join(work_dir, 'train.db')
+
+        source = connect(self.db_path, read_only=True)
+        target = connect(train_path)
+        source.backup(target)
+        source.close()
+
+        target.execute("DELETE FROM reviews WHERE review_date >= ?", (split_date,))
+        target.commit()
+        target.close()
+
+        return train_path
+
+    def load_holdout(self, split_date: str) -> Dict[int, Set[int]]:
+        """
+        검증 기간에 고객이 긍정 리뷰를 남긴 상품 (학습 기간에 리뷰한 상품 제외)
+
+        Args:
+            split_date (str): 분할 날짜
+
+        Returns:
+            Dict[int, Set[int]]: {customer_id: 정답 상품 ID 집합}
+        """
+        conn = get_connection(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT DISTINCT h.customer_id, h.product_id
+            FROM reviews h
+            WHERE h.review_date >= ?
+            AND (h.rating >= 4 OR h.sentiment = 'Positive')
+            AND NOT EXISTS (
+                SELECT 1 FROM reviews t
+                WHERE t.customer_id = h.customer_id
+                AND t.product_id = h.product_id
+                AND t.review_date < ?
+            )
+        """, (split_date, split_date))
+
+        holdout = defaultdict(set)
+        for customer_id, product_id in cursor.fetchall():
+            holdout[customer_id].add(product_id)
+
+        return dict(holdout)
+
+    @staticmethod
+    def score_recommendations(recommended: Dict[int, List[int]],
+                              holdout: Dict[int, Set[int]], k: int,
+                              n_catalog: int) -> Dict:
+        """
+        precision@k, recall@k, hit rate, coverage 계산
+
+        Args:
+            recommended: {customer_id: 추천 상품 ID 리스트}
+            holdout: {customer_id: 정답 상품 ID 집합}
+            k: 평가 컷오프
+            n_catalog: 추천 가능한 상품 수 (coverage 분모)
+
+        Returns:
+            Dict: 평가 지표
+        """
+        precisions, recalls, hits = [], [], []
+        recommended_products = set()
+
+        for customer_id, relevant in holdout.items():
+            top_k = recommended.get(customer_id, [])[:k]
+            recommended_products.update(top_k)
+            n_hits = len(relevant.intersection(top_k))
+            precisions.append(n_hits / k)
+            recalls.append(n_hits / len(relevant))
+            hits.append(n_hits > 0)
+
+        return {
+            f'precision@{k}': (round(float(np.mean(precisions)), 4)
+                               if precisions else 0.0),
+            f'recall@{k}': round(float(np.mean(recalls)), 4) if recalls else 0.0,
+            f'hit_rate@{k}': round(float(np.mean(hits)), 4) if hits else 0.0,
+            'coverage': (round(len(recommended_products) / n_catalog, 4)
+                         if n_catalog else 0.0),
+        }
+
+    def measure_online_throughput(self, recommender: RecommendationSystem,
+                                  customer_ids: List[int], k: int,
+                                  engine: str = 'keyword') -> Dict:
+        """
+        API와 같은 경로(recommend_products)의 고객 단건 처리량 측정
+
+        Args:
+            recommender: 평가 대상 추천 시스템
+            customer_ids: 요청을 보낼 고객 ID 리스트
+            k: 추천 개수
+            engine: 추천 엔진
+
+        Returns:
+            Dict: 요청 수, 초당 요청 수, 평균/p95 지연시간(ms)
+        """
+        latencies = []
+        # 요청마다 출력되는 진행 메시지는 측정에서 제외
+        with contextlib.redirect_stdout(io.StringIO()):
+            for customer_id in customer_ids:
+                start = time.perf_counter()
+                recommender.recommend_products(customer_id, top_n=k, engine=engine)
+                latencies.append(time.perf_counter() - start)
+
+        total = sum(latencies)
+        return {
+            'requests': len(latencies),
+            'requests_per_sec': round(len(latencies) / total, 1) if total else None,
+            'latency_ms_mean': (round(float(np.mean(latencies)) * 1000, 2)
+                                if latencies else None),
+            'latency_ms_p95': (round(float(np.percentile(latencies, 95)) * 1000, 2)
+                               if latencies else None),
+        }
+
+    def evaluate(self, k: int = 5, online_sample: int = 200,
+                 include_cold_start: bool = True, engine: str = 'keyword') -> Dict:
+        """
+        학습 기간으로 프로필을 만들고 검증 기간 정답으로 추천 품질/처리량 평가
+
+        Args:
+            k (int): 평가 컷오프 (고객별 추천 개수)
+            online_sample (int): 단건 처리량 측정에 사용할 고객 수
+            include_cold_start (bool): 학습 기간 긍정 리뷰가 없는 고객에게 세그먼트 추천을 사용
+            engine (str): 평가할 추천 엔진 ('keyword' 또는 'als')
+
+        Returns:
+            Dict: 평가 결과
+        """
+        print("=" * 80)
+        print("추천 시스템 오프라인 평가")
+        print("=" * 80)
+
+        split_date = self.find_split_date()
+        holdout = self.load_holdout(split_date)
+        print(f"✓ 분할 날짜: {split_date} (검증 대상 고객: {len(holdout)}명)")
+
+        work_dir = tempfile.mkdtemp(prefix='recommender_eval_')
+        try:
+            train_path = self.prepare_train_db(split_date, work_dir)
+
+            # 학습 기간 리뷰로 프로필 생성
+            start = time.perf_counter()
+            recommender = self.recommender_factory(train_path)
+            recommender.build_all_product_profiles()
+            if engine == 'als':
+                recommender.train_latent_factors()
+            build_seconds = time.perf_counter() - start
+
+            # 배치 행렬 곱으로 전체 검증 고객 추천
+            customer_ids = sorted(holdout)
+            start = time.perf_counter()
+            scored = recommender.top_products_batch(customer_ids, top_n=k,
+                                                    engine=engine)
+            batch_seconds = time.perf_counter() - start
+
+            recommended = {
+                customer_id: [product_id for product_id, _ in items]
+                for customer_id, items in scored.items()
+            }
+            cold_start_ids = [c for c in customer_ids if not recommended.get(c)]
+            if include_cold_start:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for customer_id in cold_start_ids:
+                        items = recommender.recommend_cold_start(customer_id, top_n=k)
+                        recommended[customer_id] = [
+                            item['product_id'] for item in items
+                        ]
+
+            n_catalog = int(recommender._has_profile.sum())
+            metrics = self.score_recommendations(recommended, holdout, k, n_catalog)
+            cold_start_set = set(cold_start_ids)
+            warm_metrics = self.score_recommendations(
+                recommended,
+                {c: holdout[c] for c in customer_ids if c not in cold_start_set},
+                k, n_catalog
+            )
+
+            online = self.measure_online_throughput(
+                recommender, customer_ids[:online_sample], k, engine
+            )
+            profile_memory = recommender.profile_memory_usage()
+            latent_model = recommender.latent_model
+            latent_bytes = latent_model.nbytes() if latent_model else 0
+            peak_rss = peak_memory_mb()
+        finally:
+            # 학습용 DB를 지우기 전에 풀에 남은 연결 정리
+            close_connections(os.path.join(work_dir, 'train.db'))
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        result = {
+            'generated_at': datetime.now().isoformat(),
+            'engine': engine,
+            'settings': recommender._profile_settings(),
+            'split_date': split_date,
+            'k': k,
+            'customers_evaluated': len(customer_ids),
+            'cold_start_customers': len(cold_start_ids),
+            'metrics': metrics,
+            'metrics_personalized_only': warm_metrics,
+            'throughput': {
+                'build_seconds': round(build_seconds, 2),
+                'batch_customers_per_sec': (
+                    round(len(customer_ids) / batch_seconds, 1)
+                    if batch_seconds else None
+                ),
+                'online': online,
+            },
+            'memory': {
+                'profile_dict_mb': round(profile_memory['dict_bytes'] / 1024 ** 2, 3),
+                'profile_matrix_mb': round(
+                    profile_memory['matrix_bytes'] / 1024 ** 2, 3
+                ),
+                'latent_factors_mb': round(latent_bytes / 1024 ** 2, 3),
+                'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+            },
+        }
+
+        self.print_report(result)
+        return result
+
+    @staticmethod
+    def print_report(result: Dict):
+        """
+        평가 결과 출력
+
+        Args:
+            result: evaluate() 결과
+        """
+        k = result['k']
+        metrics = result['metrics']
+        throughput = result['throughput']
+        memory = result['memory']
+
+        print("\n" + "=" * 80)
+        print("평가 결과")
+        print("=" * 80)
+        print(f"엔진: {result['engine']} | 설정: {result['settings']}")
+        print(f"검증 고객: {result['customers_evaluated']}명 "
+              f"(콜드 스타트: {result['cold_start_customers']}명)")
+        print(f"Precision@{k}: {metrics[f'precision@{k}']:.4f} | "
+              f"Recall@{k}: {metrics[f'recall@{k}']:.4f} | "
+              f"Hit Rate@{k}: {metrics[f'hit_rate@{k}']:.4f} | "
+              f"Coverage: {metrics['coverage']:.4f}")
+        print(f"프로필 생성: {throughput['build_seconds']}초 | "
+              f"배치 추천: {throughput['batch_customers_per_sec']}명/초 | "
+              f"단건 추천: {throughput['online']['requests_per_sec']}건/초 "
+              f"(p95 {throughput['online']['latency_ms_p95']}ms)")
+        print(f"프로필 메모리: 딕셔너리 {memory['profile_dict_mb']}MB, "
+              f"행렬 {memory['profile_matrix_mb']}MB, "
+              f"잠재 요인 {memory['latent_factors_mb']}MB | "
+              f"최대 RSS: {memory['peak_rss_mb']}MB")
+
+    @staticmethod
+    def save_report(result: Dict,
+                    output_path: str = 'reports/recommender_evaluation.json'):
+        """
+        평가 결과를 JSON으로 저장
+
+        Args:
+            result: evaluate() 결과
+            output_path: 저장 경로
+        """
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+        print(f"✓ 평가 결과 저장: {output_path}")
+
+
+def main():
+    """메인 실행 함수 (추천 시스템 설정은 RECOMMENDER_* 환경변수로 선택)"""
+    evaluator = RecommenderEvaluator()
+    engine = os.getenv('EVAL_ENGINE', 'keyword')
+    result = evaluator.evaluate(k=5, engine=engine)
+    suffix = '' if engine == 'keyword' else f'_{engine}'
+    evaluator.save_report(result, f'reports/recommender_evaluation{suffix}.json')
+
+
+if __name__ == '__main__':
+    main()
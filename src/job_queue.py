@@ -0,0 +1,315 @@
+"""
+SQLite 기반 백그라운드 작업 큐 모듈
+
+부정 리뷰 전체 분석, 대시보드 리포트 메일 전송처럼 오래 걸리는 작업을 요청 안에서
+처리하지 않고 `jobs` 테이블에 넣어 두면 워커 프로세스(src.job_worker)가 가져가 실행합니다.
+큐는 리뷰 DB와 별도 파일(JOB_DB_PATH)에 저장되어 서버를 재시작해도 유지되고,
+작업 상태 기록이 리뷰 DB의 버전 토큰(응답 캐시)을 건드리지 않습니다.
+
+작업 상태: queued → running → succeeded / failed
+실행 중인 작업은 워커가 주기적으로 리스(lease_expires_at)를 연장하며, 워커가 죽어
+리스가 만료된 작업만 다시 대기열로 돌아갑니다 (최대 JOB_MAX_ATTEMPTS회).
+오래 걸리지만 정상 실행 중인 작업은 다시 실행되지 않습니다.
+"""
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from src.db import get_connection
+
+
+# 작업 큐 데이터베이스 경로
+JOB_DB_PATH = os.getenv('JOB_DB_PATH', 'data/jobs.db')
+
+# 실행 중 작업의 리스 기간 (초). 워커가 이 시간 동안 연장하지 않으면 죽은 것으로 보고 다시 대기열로
+JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '60'))
+
+# 작업당 최대 실행 시도 횟수
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+
+# 완료된 작업 보관 기간 (초)
+JOB_RETENTION_SECONDS = int(os.getenv('JOB_RETENTION_DAYS', '7')) * 24 * 60 * 60
+
+# 작업 상태
+JOB_STATUSES = ('queued', 'running', 'succeeded', 'failed')
+
+# 지원하는 작업 종류 → 허용 파라미터
+JOB_TYPES = {
+    'negative-analysis': ('top_n',),
+    'send-report': ('recipient_email', 'attach_raw_data'),
+}
+
+JOB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    job_type TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    lease_expires_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)
+"""
+
+
+class JobQueue:
+    """SQLite 테이블 하나로 구현한 작업 큐 클래스 (여러 프로세스에서 동시에 사용 가능)"""
+
+    def __init__(self, db_path: str = JOB_DB_PATH):
+        """
+        JobQueue 초기화 (jobs 테이블이 없으면 생성)
+
+        Args:
+            db_path (str): 작업 큐 데이터베이스 파일 경로
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._conn()
+        for statement in JOB_SCHEMA.split(';\n\n'):
+            conn.execute(statement)
+        # 리스 컬럼이 없는 이전 큐 파일에는 컬럼 추가
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+        if 'lease_expires_at' not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN lease_expires_at REAL")
+        conn.commit()
+
+    def _conn(self):
+        """현재 스레드의 쓰기 연결 (WAL, 풀에서 재사용)"""
+        return get_connection(self.db_path, read_only=False)
+
+    def enqueue(self, job_type: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        작업 등록
+
+        Args:
+            job_type (str): 작업 종류 (JOB_TYPES)
+            params (Dict): 작업 파라미터 (JSON 직렬화 가능해야 함)
+
+        Returns:
+            str: 작업 ID
+        """
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"지원하지 않는 작업 종류입니다: {job_type}")
+        params = params or {}
+        unknown = set(params) - set(JOB_TYPES[job_type])
+        if unknown:
+            raise ValueError(f"{job_type} 작업에서 지원하지 않는 파라미터입니다: "
+                             f"{', '.join(sorted(unknown))}")
+
+        job_id = uuid.uuid4().hex
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO jobs (job_id, job_type, params, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            (job_id, job_type, json.dumps(params, ensure_ascii=False), time.time())
+        )
+        conn.commit()
+        return job_id
+
+    def claim(self, worker: str, lease: int = JOB_LEASE_SECONDS) -> Optional[Dict]:
+        """
+        가장 오래된 대기 작업 하나를 실행 중으로 바꾸고 가져옴 (리스 lease초)
+
+        UPDATE ... RETURNING 한 문장으로 처리하므로 여러 워커 프로세스가 동시에
+        호출해도 SQLite 쓰기 잠금에 의해 같은 작업을 두 번 가져가지 않습니다.
+
+        Args:
+            worker (str): 워커 식별자
+            lease (int): 리스 기간 (초, 실행 중에는 heartbeat로 연장)
+
+        Returns:
+            Dict: {'job_id', 'job_type', 'params', 'attempts'} (대기 작업이 없으면 None)
+        """
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute("""
+            UPDATE jobs
+            SET status = 'running', worker = ?, started_at = ?,
+                lease_expires_at = ?, attempts = attempts + 1
+            WHERE job_id = (
+                SELECT job_id FROM jobs
+                WHERE status = 'queued'
+                ORDER BY created_at
+                LIMIT 1
+            )
+            RETURNING job_id, job_type, params, attempts
+        """, (worker, now, now + lease)).fetchone()
+        conn.commit()
+
+        if row is None:
+            return None
+        return {
+            'job_id': row[0],
+            'job_type': row[1],
+            'params': json.loads(row[2]),
+            'attempts': row[3],
+        }
+
+    def heartbeat(self, job_id: str, worker: str,
+                  lease: int = JOB_LEASE_SECONDS) -> bool:
+        """
+        실행 중인 작업의 리스 연장
+
+        Args:
+            job_id (str): 작업 ID
+            worker (str): 작업을 가져간 워커 식별자
+            lease (int): 지금부터의 리스 기간 (초)
+
+        Returns:
+            bool: 연장했으면 True (이미 끝났거나 다른 워커에게 넘어갔으면 False)
+        """
+        conn = self._conn()
+        renewed = conn.execute("""
+            UPDATE jobs SET lease_expires_at = ?
+            WHERE job_id = ? AND worker = ? AND status = 'running'
+        """, (time.time() + lease, job_id, worker)).rowcount
+        conn.commit()
+        return renewed > 0
+
+    def complete(self, job_id: str, worker: str, result: Any) -> bool:
+        """
+        작업 성공 기록
+
+        Args:
+            job_id (str): 작업 ID
+            worker (str): 작업을 가져간 워커 식별자
+            result: 작업 결과 (JSON 직렬화 가능해야 함)
+
+        Returns:
+            bool: 기록했으면 True (이미 다른 워커에게 넘어갔으면 False)
+        """
+        return self._finish(job_id, worker, 'succeeded',
+                            result=json.dumps(result, ensure_ascii=False))
+
+    def fail(self, job_id: str, worker: str, error: str) -> bool:
+        """
+        작업 실패 기록
+
+        Args:
+            job_id (str): 작업 ID
+            worker (str): 작업을 가져간 워커 식별자
+            error (str): 클라이언트에 보여줄 오류 메시지
+
+        Returns:
+            bool: 기록했으면 True (이미 다른 워커에게 넘어갔으면 False)
+        """
+        return self._finish(job_id, worker, 'failed', error=error)
+
+    def _finish(self, job_id: str, worker: str, status: str,
+                result: Optional[str] = None, error: Optional[str] = None) -> bool:
+        """
+        실행 중인 작업의 최종 상태 기록
+
+        리스가 만료되어 다시 대기열로 돌아갔거나 다른 워커가 가져간 작업은 무시하므로
+        늦게 끝난 이전 워커가 새 실행 결과를 덮어쓰지 않습니다.
+        """
+        conn = self._conn()
+        finished = conn.execute("""
+            UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?
+            WHERE job_id = ? AND worker = ? AND status = 'running'
+        """, (status, result, error, time.time(), job_id, worker)).rowcount
+        conn.commit()
+        return finished > 0
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        작업 상태 조회
+
+        Args:
+            job_id (str): 작업 ID
+
+        Returns:
+            Dict: 작업 정보 (없으면 None)
+        """
+        row = self._conn().execute("""
+            SELECT job_id, job_type, params, status, result, error, attempts,
+                   created_at, started_at, finished_at
+            FROM jobs WHERE job_id = ?
+        """, (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        return {
+            'job_id': row[0],
+            'job_type': row[1],
+            'params': json.loads(row[2]),
+            'status': row[3],
+            'result': json.loads(row[4]) if row[4] is not None else None,
+            'error': row[5],
+            'attempts': row[6],
+            'created_at': row[7],
+            'started_at': row[8],
+            'finished_at': row[9],
+        }
+
+    def counts(self) -> Dict[str, int]:
+        """
+        상태별 작업 수 (메트릭용)
+
+        Returns:
+            Dict[str, int]: {status: count}
+        """
+        rows = self._conn().execute(
+            "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+        ).fetchall()
+        return dict(rows)
+
+    def recover_stale(self, max_attempts: int = JOB_MAX_ATTEMPTS,
+                      lease: int = JOB_LEASE_SECONDS) -> int:
+        """
+        리스가 만료된(워커가 죽은) 실행 중 작업을 다시 대기열로 (시도 횟수를 넘기면 실패 처리)
+
+        리스 컬럼이 생기기 전에 시작된 작업은 시작 시각 + lease를 만료 시각으로 봅니다.
+
+        Args:
+            max_attempts (int): 최대 시도 횟수
+            lease (int): 리스 기간 (초, 이전 포맷 작업용)
+
+        Returns:
+            int: 다시 대기열로 돌린 작업 수
+        """
+        now = time.time()
+        expired = ("status = 'running' "
+                   "AND COALESCE(lease_expires_at, started_at + ?) < ?")
+        conn = self._conn()
+        conn.execute(f"""
+            UPDATE jobs SET status = 'failed', finished_at = ?,
+                            error = '워커 응답 없음 (최대 시도 횟수 도달)'
+            WHERE {expired} AND attempts >= ?
+        """, (now, lease, now, max_attempts))
+        requeued = conn.execute(f"""
+            UPDATE jobs SET status = 'queued', worker = NULL, lease_expires_at = NULL
+            WHERE {expired}
+        """, (lease, now)).rowcount
+        conn.commit()
+        return requeued
+
+    def purge(self, retention_seconds: int = JOB_RETENTION_SECONDS) -> int:
+        """
+        보관 기간이 지난 완료 작업 삭제
+
+        Args:
+            retention_seconds (int): 보관 기간 (초)
+
+        Returns:
+            int: 삭제한 작업 수
+        """
+        conn = self._conn()
+        deleted = conn.execute("""
+            DELETE FROM jobs
+            WHERE status IN ('succeeded', 'failed') AND finished_at < ?
+        """, (time.time() - retention_seconds,)).rowcount
+        conn.commit()
+        return deleted
@@ -0,0 +1,295 @@
+"""
+백그라운드 작업 워커 모듈
+
+작업 큐(src.job_queue)에서 작업을 하나씩 가져가 실행하고 결과를 기록하는 워커 프로세스입니다.
+API 서버가 시작할 때 API_JOB_WORKERS개를 함께 띄우며, 처리량이 더 필요하면
+별도 프로세스로 워커를 추가로 실행할 수 있습니다 (같은 JOB_DB_PATH를 공유).
+
+실행:
+    JOB_WORKERS=2 python -m src.job_worker
+"""
+import os
+import socket
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional
+
+from src.analyze_negative_reviews import NegativeReviewAnalyzer
+from src.db import REVIEW_DB_PATH
+from src.job_queue import JOB_DB_PATH, JOB_LEASE_SECONDS, JobQueue
+from emailer.email_reporter import EmailReporter
+
+
+# 대기 작업이 없을 때 큐를 다시 확인하는 간격 (초)
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '1.0'))
+
+# 실행 중 작업의 리스 연장 주기 (초, 리스 기간 안에 여러 번 연장)
+JOB_HEARTBEAT_INTERVAL = max(1.0, JOB_LEASE_SECONDS / 4)
+
+# 리스 만료 작업 복구/오래된 작업 삭제 주기 (초)
+JOB_MAINTENANCE_INTERVAL = 60
+
+# 리포트 작업이 데이터를 가져올 API 서버 주소
+API_BASE_URL = os.getenv('API_BASE_URL', 'http://localhost:8000')
+
+# 실패한 작업에 기록하는 오류 메시지 (상세 내용은 워커 로그에만 남김)
+JOB_FAILURE_MESSAGE = '작업 실행 중 오류가 발생했습니다.'
+
+
+# 프로세스(워커)별 부정 리뷰 분석기 (Kiwi 초기화는 워커당 한 번)
+_analyzer = None
+
+
+def run_negative_analysis(params: Dict, db_path: str) -> Dict:
+    """
+    부정 리뷰 분석 작업 (/api/v1/negative-analysis와 같은 형식의 결과)
+
+    Args:
+        params (Dict): {'top_n': 개선 우선순위 상위 N개 (1-50, 기본값 5)}
+        db_path (str): 리뷰 데이터베이스 경로
+
+    Returns:
+        Dict: 개선 우선순위 상품 목록
+    """
+    top_n = int(params.get('top_n', 5))
+    if not 1 <= top_n <= 50:
+        raise ValueError(f"top_n은 1-50 사이여야 합니다: {top_n}")
+
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = NegativeReviewAnalyzer(db_path)
+    priority_products = _analyzer.get_improvement_priority_products(top_n=top_n)
+
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'total_products_analyzed': len(priority_products),
+        'improvement_priority_list': priority_products,
+    }
+
+
+def run_send_report(params: Dict, db_path: str) -> Dict:
+    """
+    대시보드 리포트 이메일 전송 작업 (송신 계정은 SENDER_EMAIL/APP_PASSWORD 환경변수)
+
+    Args:
+        params (Dict): {'recipient_email': 수신자, 'attach_raw_data': JSON 원본 첨부 여부}
+        db_path (str): 리뷰 데이터베이스 경로 (사용하지 않음, 데이터는 API에서 수집)
+
+    Returns:
+        Dict: 전송 결과
+    """
+    recipient_email = params.get('recipient_email')
+    if not recipient_email:
+        raise ValueError("recipient_email 파라미터가 필요합니다.")
+
+    sender_email = os.getenv('SENDER_EMAIL')
+    app_password = os.getenv('APP_PASSWORD')
+    if not sender_email or not app_password:
+        raise ValueError("SENDER_EMAIL, APP_PASSWORD 환경변수가 설정되지 않았습니다.")
+
+    reporter = EmailReporter(sender_email=sender_email, app_password=app_password)
+    reporter.send_dashboard_report(
+        recipient_email=recipient_email,
+        api_base_url=API_BASE_URL,
+        attach_raw_data=bool(params.get('attach_raw_data', False))
+    )
+
+    return {
+        'recipient': recipient_email,
+        'sent_at': datetime.now().isoformat(),
+    }
+
+
+# 작업 종류 → 실행 함수 (src.job_queue.JOB_TYPES와 같은 키)
+JOB_HANDLERS: Dict[str, Callable[[Dict, str], Any]] = {
+    'negative-analysis': run_negative_analysis,
+    'send-report': run_send_report,
+}
+
+
+class JobWorker:
+    """작업 큐를 폴링하며 작업을 실행하는 워커 클래스"""
+
+    def __init__(self, queue_path: str = JOB_DB_PATH, db_path: str = REVIEW_DB_PATH,
+                 poll_interval: float = JOB_POLL_INTERVAL):
+        """
+        JobWorker 초기화
+
+        Args:
+            queue_path (str): 작업 큐 데이터베이스 경로
+            db_path (str): 리뷰 데이터베이스 경로
+            poll_interval (float): 대기 작업이 없을 때 폴링 간격 (초)
+        """
+        self.queue = JobQueue(queue_path)
+        self.db_path = db_path
+        self.poll_interval = poll_interval
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+
+    def run_once(self) -> bool:
+        """
+        대기 작업 하나를 실행하고 결과 기록
+
+        Returns:
+            bool: 작업을 실행했으면 True (대기 작업이 없으면 False)
+        """
+        job = self.queue.claim(self.name)
+        if job is None:
+            return False
+
+        print(f"[작업 {job['job_id'][:8]}] {job['job_type']} 시작 (시도 {job['attempts']}회)")
+        start = time.perf_counter()
+        # 작업이 오래 걸려도 다른 워커가 다시 실행하지 않도록 실행 중에는 리스를 계속 연장
+        finished = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job['job_id'], finished),
+            name=f"job-heartbeat-{job['job_id'][:8]}", daemon=True
+        )
+        heartbeat.start()
+        try:
+            result = JOB_HANDLERS[job['job_type']](job['params'], self.db_path)
+        except Exception as e:
+            recorded = self.queue.fail(job['job_id'], self.name, JOB_FAILURE_MESSAGE)
+            print(f"[작업 {job['job_id'][:8]}] ❌ 실패: {type(e).__name__}: {e}")
+        else:
+            recorded = self.queue.complete(job['job_id'], self.name, result)
+            print(f"[작업 {job['job_id'][:8]}] ✓ 완료 ({time.perf_counter() - start:.2f}초)")
+        finally:
+            finished.set()
+            heartbeat.join()
+        if not recorded:
+            print(f"[작업 {job['job_id'][:8]}] ⚠️  리스가 만료되어 결과를 기록하지 않았습니다.")
+        return True
+
+    def _heartbeat(self, job_id: str, finished: threading.Event):
+        """
+        작업이 끝날 때까지 JOB_HEARTBEAT_INTERVAL마다 리스 연장 (별도 스레드)
+
+        Args:
+            job_id (str): 실행 중인 작업 ID
+            finished (threading.Event): 작업 종료 신호
+        """
+        while not finished.wait(JOB_HEARTBEAT_INTERVAL):
+            try:
+                if not self.queue.heartbeat(job_id, self.name):
+                    return
+            except sqlite3.Error as e:
+                # 일시적인 잠금 오류 등은 다음 주기에 다시 시도
+                print(f"[작업 {job_id[:8]}] ⚠️  리스 연장 실패: {e}")
+
+    def run(self, stop_event=None):
+        """
+        중지 신호가 올 때까지 작업 실행
+
+        Args:
+            stop_event: multiprocessing.Event (None이면 계속 실행)
+        """
+        next_maintenance = 0.0
+        while stop_event is None or not stop_event.is_set():
+            if time.monotonic() >= next_maintenance:
+                recovered = self.queue.recover_stale()
+                if recovered:
+                    print(f"⚠️  리스가 만료된 작업 {recovered}개를 다시 대기열에 넣었습니다.")
+                self.queue.purge()
+                next_maintenance = time.monotonic() + JOB_MAINTENANCE_INTERVAL
+
+            if self.run_once():
+                continue
+            if stop_event is None:
+                time.sleep(self.poll_interval)
+            else:
+                stop_event.wait(self.poll_interval)
+
+
+def _worker_main(queue_path: str, db_path: str, stop_event):
+    """워커 프로세스 진입점"""
+    try:
+        JobWorker(queue_path, db_path).run(stop_event)
+    except KeyboardInterrupt:
+        pass
+
+
+class JobWorkerPool:
+    """워커 프로세스 여러 개를 시작/중지하는 클래스"""
+
+    def __init__(self, workers: int, queue_path: str = JOB_DB_PATH,
+                 db_path: str = REVIEW_DB_PATH, start_method: str = 'spawn'):
+        """
+        JobWorkerPool 초기화
+
+        Args:
+            workers (int): 워커 프로세스 수
+            queue_path (str): 작업 큐 데이터베이스 경로
+            db_path (str): 리뷰 데이터베이스 경로
+            start_method (str): 프로세스 시작 방식 (기본값 spawn: API 서버의 이벤트 루프/스레드를
+                fork하지 않음, api.launcher는 미리 로드한 Kiwi를 공유하도록 fork 사용)
+        """
+        self.workers = max(0, workers)
+        self.queue_path = queue_path
+        self.db_path = db_path
+        self._context = get_context(start_method)
+        self._stop_event = None
+        self.processes: List = []
+
+    def start(self):
+        """워커 프로세스 시작"""
+        self._stop_event = self._context.Event()
+        for idx in range(self.workers):
+            process = self._context.Process(
+                target=_worker_main,
+                args=(self.queue_path, self.db_path, self._stop_event),
+                name=f"job-worker-{idx}",
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+
+    def stop(self, timeout: Optional[float] = 10.0):
+        """
+        워커 프로세스 중지 (실행 중인 작업은 끝날 때까지 timeout초 대기 후 강제 종료)
+
+        Args:
+            timeout (float): 프로세스별 종료 대기 시간 (초)
+        """
+        if self._stop_event is not None:
+            self._stop_event.set()
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                # 강제 종료된 작업은 리스(JOB_LEASE_SECONDS)가 만료된 뒤 다른 워커가 다시 실행
+                process.terminate()
+                process.join()
+        self.processes = []
+        self._stop_event = None
+
+    def join(self):
+        """모든 워커 프로세스가 끝날 때까지 대기"""
+        for process in self.processes:
+            process.join()
+
+
+def main():
+    """작업 워커 실행 (워커 수는 JOB_WORKERS 환경변수, 기본값 1)"""
+    workers = int(os.getenv('JOB_WORKERS', '1'))
+
+    print("=" * 80)
+    print(f"백그라운드 작업 워커 시작 (워커 {workers}개, 큐: {JOB_DB_PATH})")
+    print("=" * 80)
+
+    pool = JobWorkerPool(workers)
+    pool.start()
+    try:
+        pool.join()
+    except KeyboardInterrupt:
+        print("\n워커 종료 중...")
+        pool.stop()
+
+    print("=" * 80)
+    print("✅ 작업 워커 종료")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
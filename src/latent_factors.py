@@ -0,0 +1,297 @@
+"""
+잠재 요인(Latent Factor) 추천 모듈
+
+reviews 테이블의 고객 x 상품 별점 행렬로 암시적 피드백 ALS
+(Hu, Koren, Volinsky 2008) 모델을 학습하여 고객/상품을 k차원 벡터로 표현합니다.
+추천 점수는 고객 벡터와 상품 요인 행렬의 내적 한 번으로 계산되므로
+리뷰 텍스트로 키워드 프로필을 만들 필요가 없습니다.
+
+학습은 배치 작업으로 실행하며 결과는 상품 프로필 아티팩트 번들에 함께 저장됩니다:
+    python -m src.latent_factors
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from src.db import get_connection
+
+
+def is_positive_interaction(rating: int, sentiment: str) -> bool:
+    """
+    선호(positive) 상호작용 여부 (키워드 추천과 같은 긍정 리뷰 기준)
+
+    Args:
+        rating (int): 별점
+        sentiment (str): 감성
+
+    Returns:
+        bool: 별점 4점 이상 또는 Positive 감성이면 True
+    """
+    return rating >= 4 or sentiment == 'Positive'
+
+
+class ImplicitALS:
+    """암시적 피드백 ALS 잠재 요인 모델 클래스"""
+
+    def __init__(self, n_factors: int = 32, regularization: float = 0.1,
+                 alpha: float = 2.0, iterations: int = 15, seed: int = 42):
+        """
+        ImplicitALS 초기화
+
+        Args:
+            n_factors (int): 잠재 요인 차원 k
+            regularization (float): L2 정규화 계수
+            alpha (float): 신뢰도 가중치 (confidence = 1 + alpha * 별점)
+            iterations (int): 교대 최소제곱 반복 횟수
+            seed (int): 요인 초기화 시드
+        """
+        self.n_factors = n_factors
+        self.regularization = regularization
+        self.alpha = alpha
+        self.iterations = iterations
+        self.seed = seed
+        self.customer_ids = np.empty(0, dtype=np.int64)
+        self.customer_index = {}
+        self.product_ids = np.empty(0, dtype=np.int64)
+        self.product_index = {}
+        self.customer_factors = None
+        self.product_factors = None
+        self.trained_rowid = None
+        self._gram = None
+
+    def _interactions(
+        self, reviews: List[Tuple[int, int, int, str]]
+    ) -> Tuple[csr_matrix, csr_matrix]:
+        """
+        리뷰 목록을 (고객 x 상품) 신뢰도/선호 CSR 행렬로 변환
+
+        같은 (고객, 상품) 리뷰가 여러 개면 신뢰도는 최댓값, 선호는 하나라도 긍정이면 1입니다.
+
+        Args:
+            reviews: [(customer_id, product_id, rating, sentiment), ...]
+
+        Returns:
+            Tuple[csr_matrix, csr_matrix]: (신뢰도 행렬, 선호 행렬)
+        """
+        confidence = {}
+        preference = {}
+        for customer_id, product_id, rating, sentiment in reviews:
+            key = (self.customer_index[customer_id], self.product_index[product_id])
+            confidence[key] = max(confidence.get(key, 0.0), 1.0 + self.alpha * rating)
+            preference[key] = preference.get(key, 0.0) or float(
+                is_positive_interaction(rating, sentiment)
+            )
+
+        keys = list(confidence)
+        rows = [key[0] for key in keys]
+        columns = [key[1] for key in keys]
+        shape = (len(self.customer_ids), len(self.product_ids))
+
+        return (
+            csr_matrix(([confidence[key] for key in keys], (rows, columns)),
+                       shape=shape),
+            csr_matrix(([preference[key] for key in keys], (rows, columns)),
+                       shape=shape),
+        )
+
+    def _solve_rows(self, confidence: csr_matrix, preference: csr_matrix,
+                    fixed: np.ndarray) -> np.ndarray:
+        """
+        한쪽 요인을 고정하고 다른 쪽 요인을 행별 최소제곱으로 계산
+
+        x_u = (YᵀY + Yᵀ(C_u - I)Y + λI)⁻¹ YᵀC_u p_u 이며, YᵀY는 한 번만 계산하고
+        관측된 항목에 대해서만 보정하므로 행당 비용은 O(관측 수 · k² + k³)입니다.
+
+        Args:
+            confidence: (행 x 고정 요인 수) 신뢰도 행렬
+            preference: 같은 위치의 선호 행렬
+            fixed: 고정된 요인 행렬
+
+        Returns:
+            np.ndarray: (행 수 x k) 새 요인 행렬
+        """
+        k = fixed.shape[1]
+        gram = fixed.T @ fixed + self.regularization * np.eye(k)
+        factors = np.zeros((confidence.shape[0], k), dtype=np.float64)
+
+        for row in range(confidence.shape[0]):
+            start, end = confidence.indptr[row:row + 2]
+            if start == end:
+                continue
+            columns = confidence.indices[start:end]
+            c = confidence.data[start:end]
+            p = preference.data[start:end]
+            observed = fixed[columns]
+            a = gram + (observed.T * (c - 1.0)) @ observed
+            b = observed.T @ (c * p)
+            factors[row] = np.linalg.solve(a, b)
+
+        return factors
+
+    def fit(self, reviews: List[Tuple[int, int, int, str]],
+            product_ids: Optional[List[int]] = None) -> 'ImplicitALS':
+        """
+        리뷰로 고객/상품 요인 학습
+
+        Args:
+            reviews: [(customer_id, product_id, rating, sentiment), ...]
+            product_ids: 요인을 만들 전체 상품 ID (None이면 리뷰에 등장한 상품)
+
+        Returns:
+            ImplicitALS: 자기 자신
+        """
+        customer_ids = sorted({review[0] for review in reviews})
+        product_ids = sorted(set(product_ids or []) | {review[1] for review in reviews})
+
+        self.customer_ids = np.asarray(customer_ids, dtype=np.int64)
+        self.customer_index = {cid: idx for idx, cid in enumerate(customer_ids)}
+        self.product_ids = np.asarray(product_ids, dtype=np.int64)
+        self.product_index = {pid: idx for idx, pid in enumerate(product_ids)}
+
+        confidence, preference = self._interactions(reviews)
+        confidence_t = confidence.T.tocsr()
+        preference_t = preference.T.tocsr()
+
+        rng = np.random.default_rng(self.seed)
+        product_factors = rng.normal(
+            scale=0.01, size=(len(product_ids), self.n_factors)
+        )
+
+        for _ in range(self.iterations):
+            customer_factors = self._solve_rows(confidence, preference, product_factors)
+            product_factors = self._solve_rows(confidence_t, preference_t,
+                                               customer_factors)
+
+        # 점수 계산용으로 float32 보관 (메모리/내적 비용 절반)
+        self.customer_factors = customer_factors.astype(np.float32)
+        self.product_factors = product_factors.astype(np.float32)
+        # fold-in 시 매번 다시 계산하지 않도록 YᵀY + λI 보관
+        self._gram = (product_factors.T @ product_factors
+                      + self.regularization * np.eye(self.n_factors))
+
+        return self
+
+    def fold_in(self, reviews: List[Tuple[int, int, str]]) -> Optional[np.ndarray]:
+        """
+        학습 이후 리뷰를 남긴 고객의 벡터를 상품 요인을 고정한 채 한 번의 풀이로 계산
+
+        Args:
+            reviews: 고객의 [(product_id, rating, sentiment), ...]
+
+        Returns:
+            np.ndarray: (k,) 고객 벡터 (모델에 있는 상품 리뷰가 없으면 None)
+        """
+        best = {}
+        for product_id, rating, sentiment in reviews:
+            column = self.product_index.get(product_id)
+            if column is None:
+                continue
+            c, p = best.get(column, (0.0, 0.0))
+            best[column] = (
+                max(c, 1.0 + self.alpha * rating),
+                p or float(is_positive_interaction(rating, sentiment)),
+            )
+
+        if not best:
+            return None
+
+        columns = np.fromiter(best, dtype=np.int64)
+        c = np.array([best[column][0] for column in columns])
+        p = np.array([best[column][1] for column in columns])
+        observed = self.product_factors[columns].astype(np.float64)
+        a = self._gram + (observed.T * (c - 1.0)) @ observed
+        b = observed.T @ (c * p)
+
+        return np.linalg.solve(a, b).astype(np.float32)
+
+    def customer_vector(self, customer_id: int) -> Optional[np.ndarray]:
+        """
+        학습된 고객 벡터 조회
+
+        Args:
+            customer_id (int): 고객 ID
+
+        Returns:
+            np.ndarray: (k,) 고객 벡터 (학습 데이터에 없던 고객이면 None)
+        """
+        idx = self.customer_index.get(customer_id)
+        if idx is None:
+            return None
+        return self.customer_factors[idx]
+
+    def product_rows(self, product_ids: np.ndarray) -> np.ndarray:
+        """
+        상품 ID 배열을 상품 요인 행렬의 행 인덱스로 변환 (정렬된 ID 이진 탐색)
+
+        Args:
+            product_ids: 상품 ID 배열
+
+        Returns:
+            np.ndarray: 행 인덱스 배열 (모델에 없는 상품은 제외)
+        """
+        if len(self.product_ids) == 0:
+            return np.empty(0, dtype=np.int64)
+        positions = np.searchsorted(self.product_ids, product_ids)
+        positions = np.minimum(positions, len(self.product_ids) - 1)
+        return positions[self.product_ids[positions] == product_ids]
+
+    def nbytes(self) -> int:
+        """요인 행렬이 차지하는 메모리 (바이트)"""
+        if self.customer_factors is None:
+            return 0
+        return self.customer_factors.nbytes + self.product_factors.nbytes
+
+
+def load_interactions(
+    db_path: str = 'data/reviews.db', max_rowid: Optional[int] = None
+) -> Tuple[List[Tuple[int, int, int, str]], List[int]]:
+    """
+    ALS 학습용 리뷰와 전체 상품 ID 조회
+
+    Args:
+        db_path (str): 데이터베이스 파일 경로
+        max_rowid (int): 이 rowid 이하의 리뷰만 사용 (None이면 전체)
+
+    Returns:
+        Tuple: ([(customer_id, product_id, rating, sentiment), ...], [product_id, ...])
+    """
+    conn = get_connection(db_path)
+    cursor = conn.cursor()
+
+    query = "SELECT customer_id, product_id, rating, sentiment FROM reviews"
+    params = ()
+    if max_rowid is not None:
+        query += " WHERE rowid <= ?"
+        params = (max_rowid,)
+    cursor.execute(query, params)
+    reviews = cursor.fetchall()
+
+    cursor.execute("SELECT product_id FROM products")
+    product_ids = [row[0] for row in cursor.fetchall()]
+
+    return reviews, product_ids
+
+
+def main():
+    """잠재 요인 모델 학습 배치 작업 (상품 프로필 아티팩트 번들에 저장)"""
+    from src.recommendation_system import create_recommender_from_env
+
+    print("=" * 80)
+    print("잠재 요인(ALS) 모델 학습")
+    print("=" * 80)
+
+    recommender = create_recommender_from_env()
+    recommender.load_profiles()
+    recommender.train_latent_factors()
+    recommender.save_profiles()
+
+    print("\n" + "=" * 80)
+    print("✅ 잠재 요인 모델 학습 완료!")
+    print("=" * 80)
+    print("\n갱신된 파일:")
+    print("  - cache/product_profiles.pkl (상품 프로필 + 잠재 요인)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""
+처리 단계별 지연 시간 메트릭 모듈
+
+추천/부정 리뷰 분석 같은 작업 안에서 SQL 조회, 형태소 분석, 프로필 생성, 점수 계산,
+상품 정보 조회 등 단계별 소요 시간을 히스토그램으로 누적하고
+Prometheus 텍스트 형식(text/plain; version=0.0.4)으로 내보냅니다.
+외부 의존성 없이 구현되어 있으며 모든 기록은 스레드 안전합니다.
+
+사용 예:
+    @timed_operation('recommend')
+    def recommend_products(...):
+        with stage_timer('sql'):
+            ...
+"""
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# 지연 시간 히스토그램 버킷 상한 (초)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 작업 컨텍스트 밖에서 기록된 단계의 작업 이름
+UNKNOWN_OPERATION = 'other'
+
+# Prometheus 텍스트 노출 형식 미디어 타입
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    """
+    라벨 딕셔너리를 Prometheus 라벨 문자열로 변환
+
+    Args:
+        labels (Dict[str, str]): {라벨 이름: 값}
+
+    Returns:
+        str: '{name="value",...}' (라벨이 없으면 빈 문자열)
+    """
+    if not labels:
+        return ''
+    pairs = (f'{name}="{_escape_label_value(value)}"' for name, value in labels.items())
+    return '{' + ','.join(pairs) + '}'
+
+
+def _escape_label_value(value) -> str:
+    """라벨 값의 역슬래시, 큰따옴표, 줄바꿈 이스케이프"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_value(value: float) -> str:
+    """메트릭 값 문자열 (정수는 소수점 없이)"""
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def metric_lines(name: str, documentation: str, metric_type: str,
+                 samples: List[Tuple[Dict[str, str], float]]) -> List[str]:
+    """
+    카운터/게이지 메트릭의 Prometheus 텍스트 형식 줄 목록
+
+    Args:
+        name (str): 메트릭 이름
+        documentation (str): HELP 설명
+        metric_type (str): 'counter' 또는 'gauge'
+        samples: [(라벨 딕셔너리, 값), ...]
+
+    Returns:
+        List[str]: HELP/TYPE 및 샘플 줄
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+    lines.extend(f"{name}{format_labels(labels)} {format_value(value)}"
+                 for labels, value in samples)
+    return lines
+
+
+class Histogram:
+    """라벨별 누적 버킷 히스토그램 클래스 (Prometheus histogram 형식)"""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Histogram 초기화
+
+        Args:
+            name (str): 메트릭 이름
+            documentation (str): HELP 설명
+            label_names: 라벨 이름 목록
+            buckets: 버킷 상한 목록 (오름차순, +Inf는 자동 추가)
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 값 튜플 → [버킷별 개수(누적 아님), 합계, 개수]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        """
+        관측값 기록
+
+        Args:
+            value (float): 관측값 (초)
+            *label_values: label_names 순서의 라벨 값
+        """
+        key = tuple(str(v) for v in label_values)
+        # 값이 들어갈 첫 버킷 (모든 상한보다 크면 +Inf 버킷)
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[key] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def collect(self) -> List[str]:
+        """
+        Prometheus 텍스트 형식 줄 목록
+
+        Returns:
+            List[str]: HELP/TYPE 및 _bucket/_sum/_count 줄
+        """
+        with self._lock:
+            snapshot = [(key, list(s[0]), s[1], s[2])
+                        for key, s in sorted(self._series.items())]
+
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} histogram"]
+        for key, counts, total, count in snapshot:
+            labels = dict(zip(self.label_names, key))
+            cumulative = 0
+            for upper, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                bucket_labels = format_labels({**labels, 'le': format_value(upper)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(
+                f"{self.name}_sum{format_labels(labels)} {format_value(total)}"
+            )
+            lines.append(f"{self.name}_count{format_labels(labels)} {count}")
+        return lines
+
+
+# 작업(operation) 안의 처리 단계(stage)별 소요 시간
+STAGE_SECONDS = Histogram(
+    'review_stage_duration_seconds',
+    'Duration of processing stages inside recommendation and analysis operations.',
+    ('operation', 'stage')
+)
+
+# 스레드별 현재 작업 이름 스택과 단계 기록 캡처 목록
+_local = threading.local()
+
+
+def current_operation() -> str:
+    """현재 스레드에서 실행 중인 작업 이름 (없으면 'other')"""
+    stack = getattr(_local, 'operations', None)
+    return stack[-1] if stack else UNKNOWN_OPERATION
+
+
+def _observe_stage(operation: str, stage: str, seconds: float):
+    """단계 소요 시간 기록 (capture_stages 안이면 목록에만 추가)"""
+    captured = getattr(_local, 'captured', None)
+    if captured is not None:
+        captured.append((operation, stage, seconds))
+    else:
+        STAGE_SECONDS.observe(seconds, operation, stage)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """
+    블록 소요 시간을 현재 작업의 단계로 기록하는 컨텍스트 관리자
+
+    Args:
+        stage (str): 단계 이름 (sql, tokenize, profile, scoring, enrichment 등)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _observe_stage(current_operation(), stage, time.perf_counter() - start)
+
+
+def timed_operation(operation: str) -> Callable:
+    """
+    함수 실행을 하나의 작업으로 표시하는 데코레이터
+
+    함수 안(호출하는 하위 함수 포함)의 stage_timer는 이 작업 이름으로 기록되고,
+    함수 전체 소요 시간은 'total' 단계로 기록됩니다.
+    다른 작업 안에서 호출되면 바깥 작업 이름을 그대로 사용합니다.
+
+    Args:
+        operation (str): 작업 이름 (recommend, negative_analysis 등)
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stack = getattr(_local, 'operations', None)
+            if stack is None:
+                stack = _local.operations = []
+            if stack:
+                return func(*args, **kwargs)
+
+            stack.append(operation)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stack.pop()
+                _observe_stage(operation, 'total', time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def capture_stages() -> Iterator[List[Tuple[str, str, float]]]:
+    """
+    블록 안의 단계 기록을 히스토그램 대신 목록으로 모으는 컨텍스트 관리자
+
+    프로세스 풀 워커에서 실행한 작업의 단계 시간을 결과와 함께 돌려보내
+    API 프로세스에서 record_stages로 기록할 때 사용합니다.
+
+    Yields:
+        List[Tuple[str, str, float]]: [(operation, stage, seconds), ...]
+    """
+    previous = getattr(_local, 'captured', None)
+    captured: List[Tuple[str, str, float]] = []
+    _local.captured = captured
+    try:
+        yield captured
+    finally:
+        _local.captured = previous
+
+
+def record_stages(observations: Optional[List[Tuple[str, str, float]]]):
+    """
+    capture_stages로 모은 단계 기록을 히스토그램에 반영
+
+    Args:
+        observations: [(operation, stage, seconds), ...]
+    """
+    for operation, stage, seconds in observations or ():
+        STAGE_SECONDS.observe(seconds, operation, stage)
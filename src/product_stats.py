@@ -0,0 +1,286 @@
+"""
+상품 통계 테이블 모듈
+
+상품별 평균 별점, 리뷰 수, 감성별 리뷰 수를 `product_stats` 테이블에 사전 집계하고
+메모리의 numpy 배열로 적재하여 추천/분석/통계 API가 상품마다 서브쿼리를
+실행하지 않고 배열 조회만으로 통계를 얻을 수 있게 합니다.
+
+`product_stats` 테이블은 reviews 테이블의 INSERT/UPDATE/DELETE 트리거로
+리뷰 단위로 증분 갱신됩니다.
+"""
+import sqlite3
+from typing import Dict, Optional
+import numpy as np
+
+from src.db import connect, get_connection
+
+
+PRODUCT_STATS_EXISTS_QUERY = """
+    SELECT 1 FROM sqlite_master
+    WHERE type = 'table' AND name = 'product_stats'
+"""
+
+PRODUCT_STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS product_stats (
+    product_id INTEGER PRIMARY KEY,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    positive_count INTEGER NOT NULL DEFAULT 0,
+    negative_count INTEGER NOT NULL DEFAULT 0,
+    neutral_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_product_stats_insert
+AFTER INSERT ON reviews
+BEGIN
+    INSERT OR IGNORE INTO product_stats (product_id) VALUES (NEW.product_id);
+    UPDATE product_stats SET
+        review_count = review_count + 1,
+        rating_sum = rating_sum + NEW.rating,
+        positive_count = positive_count + (NEW.sentiment = 'Positive'),
+        negative_count = negative_count + (NEW.sentiment = 'Negative'),
+        neutral_count = neutral_count + (NEW.sentiment = 'Neutral')
+    WHERE product_id = NEW.product_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_product_stats_delete
+AFTER DELETE ON reviews
+BEGIN
+    UPDATE product_stats SET
+        review_count = review_count - 1,
+        rating_sum = rating_sum - OLD.rating,
+        positive_count = positive_count - (OLD.sentiment = 'Positive'),
+        negative_count = negative_count - (OLD.sentiment = 'Negative'),
+        neutral_count = neutral_count - (OLD.sentiment = 'Neutral')
+    WHERE product_id = OLD.product_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_product_stats_update
+AFTER UPDATE OF product_id, rating, sentiment ON reviews
+BEGIN
+    UPDATE product_stats SET
+        review_count = review_count - 1,
+        rating_sum = rating_sum - OLD.rating,
+        positive_count = positive_count - (OLD.sentiment = 'Positive'),
+        negative_count = negative_count - (OLD.sentiment = 'Negative'),
+        neutral_count = neutral_count - (OLD.sentiment = 'Neutral')
+    WHERE product_id = OLD.product_id;
+    INSERT OR IGNORE INTO product_stats (product_id) VALUES (NEW.product_id);
+    UPDATE product_stats SET
+        review_count = review_count + 1,
+        rating_sum = rating_sum + NEW.rating,
+        positive_count = positive_count + (NEW.sentiment = 'Positive'),
+        negative_count = negative_count + (NEW.sentiment = 'Negative'),
+        neutral_count = neutral_count + (NEW.sentiment = 'Neutral')
+    WHERE product_id = NEW.product_id;
+END;
+"""
+
+
+def ensure_product_stats_table(conn: sqlite3.Connection) -> bool:
+    """
+    product_stats 테이블과 증분 갱신 트리거를 생성 (없을 때만)
+
+    테이블이 새로 만들어진 경우 기존 리뷰로 한 번 전체 집계합니다.
+
+    Args:
+        conn (sqlite3.Connection): 쓰기 가능한 데이터베이스 연결
+
+    Returns:
+        bool: 테이블을 새로 생성했으면 True
+    """
+    cursor = conn.cursor()
+    cursor.execute(PRODUCT_STATS_EXISTS_QUERY)
+    if cursor.fetchone():
+        return False
+
+    # 테이블 생성 + 초기 집계 + 트리거를 한 트랜잭션으로 처리
+    # (동시에 여러 프로세스가 생성하지 않도록 쓰기 잠금 후 다시 확인)
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute(PRODUCT_STATS_EXISTS_QUERY)
+        if cursor.fetchone():
+            cursor.execute("COMMIT")
+            return False
+        for statement in PRODUCT_STATS_SCHEMA.split(';\n\n'):
+            cursor.execute(statement)
+        cursor.execute("""
+            INSERT INTO product_stats (
+                product_id, review_count, rating_sum,
+                positive_count, negative_count, neutral_count
+            )
+            SELECT product_id, COUNT(*), SUM(rating),
+                   SUM(sentiment = 'Positive'),
+                   SUM(sentiment = 'Negative'),
+                   SUM(sentiment = 'Neutral')
+            FROM reviews
+            GROUP BY product_id
+        """)
+        cursor.execute("COMMIT")
+    except sqlite3.Error:
+        cursor.execute("ROLLBACK")
+        raise
+
+    return True
+
+
+class ProductStats:
+    """상품 메타데이터 및 통계를 상품 인덱스 기준 배열로 보관하는 클래스"""
+
+    def __init__(self, db_path: str = 'data/reviews.db'):
+        """
+        ProductStats 초기화
+
+        Args:
+            db_path (str): 데이터베이스 파일 경로
+        """
+        self.db_path = db_path
+        self.product_ids = np.empty(0, dtype=np.int64)
+        self.product_index = {}
+        self.product_names = []
+        self.categories = []
+        self.category_codes = np.empty(0, dtype=np.int64)
+        self.review_count = np.empty(0, dtype=np.int64)
+        self.rating_sum = np.empty(0, dtype=np.int64)
+        self.positive_count = np.empty(0, dtype=np.int64)
+        self.negative_count = np.empty(0, dtype=np.int64)
+        self.neutral_count = np.empty(0, dtype=np.int64)
+
+    def refresh(self) -> 'ProductStats':
+        """
+        product_stats 테이블을 한 번의 조인 쿼리로 메모리 배열에 적재 (풀의 읽기 전용 연결)
+
+        Returns:
+            ProductStats: 자기 자신
+        """
+        conn = get_connection(self.db_path)
+        if conn.execute(PRODUCT_STATS_EXISTS_QUERY).fetchone() is None:
+            # 테이블/트리거가 없을 때만 쓰기 연결을 한 번 열어 생성 (WAL 모드 전환)
+            writer = connect(self.db_path, isolation_level=None)
+            try:
+                ensure_product_stats_table(writer)
+            finally:
+                writer.close()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT p.product_id, p.product_name, p.category,
+                   COALESCE(s.review_count, 0), COALESCE(s.rating_sum, 0),
+                   COALESCE(s.positive_count, 0), COALESCE(s.negative_count, 0),
+                   COALESCE(s.neutral_count, 0)
+            FROM products p
+            LEFT JOIN product_stats s ON s.product_id = p.product_id
+            ORDER BY p.product_id
+        """)
+        rows = cursor.fetchall()
+
+        self.product_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.product_index = {int(pid): idx for idx, pid in enumerate(self.product_ids)}
+        self.product_names = [row[1] for row in rows]
+        self.categories = [row[2] for row in rows]
+        codes = {}
+        self.category_codes = np.array(
+            [codes.setdefault(category, len(codes)) for category in self.categories],
+            dtype=np.int64
+        )
+
+        counts = np.array([row[3:] for row in rows], dtype=np.int64).reshape(-1, 5)
+        (self.review_count, self.rating_sum, self.positive_count,
+         self.negative_count, self.neutral_count) = counts.T.copy()
+
+        return self
+
+    @property
+    def average_rating(self) -> np.ndarray:
+        """
+        상품별 평균 별점 배열 (리뷰가 없으면 0)
+
+        Returns:
+            np.ndarray: 평균 별점
+        """
+        return np.divide(
+            self.rating_sum, self.review_count,
+            out=np.zeros(len(self.review_count), dtype=np.float64),
+            where=self.review_count > 0
+        )
+
+    def get(self, product_id: int) -> Optional[Dict]:
+        """
+        상품 하나의 메타데이터와 통계 조회 (배열 조회)
+
+        Args:
+            product_id (int): 상품 ID
+
+        Returns:
+            Dict: 상품 통계 (상품이 없으면 None)
+        """
+        idx = self.product_index.get(product_id)
+        if idx is None:
+            return None
+
+        review_count = int(self.review_count[idx])
+        return {
+            'product_id': product_id,
+            'product_name': self.product_names[idx],
+            'category': self.categories[idx],
+            'review_count': review_count,
+            'average_rating': (
+                float(self.rating_sum[idx]) / review_count if review_count else None
+            ),
+            'positive_count': int(self.positive_count[idx]),
+            'negative_count': int(self.negative_count[idx]),
+            'neutral_count': int(self.neutral_count[idx]),
+        }
+
+    def category_codes_for(self, product_ids: np.ndarray) -> np.ndarray:
+        """
+        상품 ID 배열의 카테고리 코드 (정렬된 ID 이진 탐색)
+
+        Args:
+            product_ids: 상품 ID 배열
+
+        Returns:
+            np.ndarray: 카테고리 코드 배열 (없는 상품은 -1)
+        """
+        product_ids = np.asarray(product_ids, dtype=np.int64)
+        if len(self.product_ids) == 0:
+            return np.full(len(product_ids), -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.product_ids, product_ids),
+                               len(self.product_ids) - 1)
+        found = self.product_ids[positions] == product_ids
+        return np.where(found, self.category_codes[positions], -1)
+
+    def overview(self) -> Dict:
+        """
+        전체 리뷰 통계 합계 (stats/overview API용)
+
+        Returns:
+            Dict: 리뷰 수, 리뷰가 있는 상품 수, 평균 별점, 감성별 리뷰 수
+        """
+        total_reviews = int(self.review_count.sum())
+        return {
+            'total_products': int((self.review_count > 0).sum()),
+            'total_reviews': total_reviews,
+            'average_rating': (
+                float(self.rating_sum.sum()) / total_reviews if total_reviews else None
+            ),
+            'positive_count': int(self.positive_count.sum()),
+            'negative_count': int(self.negative_count.sum()),
+            'neutral_count': int(self.neutral_count.sum()),
+        }
+
+    def __len__(self) -> int:
+        return len(self.product_ids)
+
+
+def load_product_stats(db_path: str = 'data/reviews.db') -> ProductStats:
+    """
+    product_stats 테이블을 보장하고 메모리 배열로 적재
+
+    Args:
+        db_path (str): 데이터베이스 파일 경로
+
+    Returns:
+        ProductStats: 적재된 상품 통계
+    """
+    return ProductStats(db_path).refresh()
@@ -0,0 +1,149 @@
+"""
+고객 구매 이력 인덱스 모듈
+
+고객 x 상품 구매(리뷰 작성) 여부를 CSR 행렬로 사전 계산하여
+추천 요청마다 DB를 조회하지 않고 구매 상품 ID 배열을 바로 얻습니다.
+열 인덱스는 상품 ID 자체를 사용합니다. 고객별 긍정 리뷰(프로필에 반영되는 리뷰)
+보유 여부도 함께 보관해 콜드 스타트 고객을 DB 조회 없이 판별합니다.
+"""
+from typing import Iterable, Optional, Tuple
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from src.db import get_connection
+
+
+class PurchaseIndex:
+    """고객별 구매 상품을 CSR 행렬로 보관하는 클래스"""
+
+    def __init__(self):
+        """PurchaseIndex 초기화"""
+        self.customer_index = {}
+        self.matrix = csr_matrix((0, 0), dtype=bool)
+        # 행(고객)별 긍정 리뷰 보유 여부
+        self.positive = np.zeros(0, dtype=bool)
+
+    def build(self, db_path: str = 'data/reviews.db',
+              max_rowid: Optional[int] = None) -> 'PurchaseIndex':
+        """
+        reviews 테이블에서 (고객, 상품, 긍정 리뷰 여부)를 읽어 인덱스 구축
+
+        Args:
+            db_path (str): 데이터베이스 파일 경로
+            max_rowid (int): 이 rowid 이하의 리뷰만 반영 (None이면 전체)
+
+        Returns:
+            PurchaseIndex: 자기 자신
+        """
+        conn = get_connection(db_path)
+        cursor = conn.cursor()
+
+        query = """
+        SELECT customer_id, product_id,
+               MAX(rating >= 4 OR sentiment = 'Positive')
+        FROM reviews
+        """
+        params = ()
+        if max_rowid is not None:
+            query += " WHERE rowid <= ?"
+            params = (max_rowid,)
+        query += " GROUP BY customer_id, product_id"
+        cursor.execute(query, params)
+        purchases = cursor.fetchall()
+
+        self.customer_index = {}
+        self.matrix = csr_matrix((0, 0), dtype=bool)
+        self.positive = np.zeros(0, dtype=bool)
+        self.add(purchases)
+
+        return self
+
+    def add(self, purchases: Iterable[Tuple[int, int, bool]]) -> int:
+        """
+        (고객 ID, 상품 ID, 긍정 리뷰 여부) 구매 기록을 배치로 증분 반영
+
+        새 고객은 행으로, 더 큰 상품 ID는 열로 추가되며
+        이미 있는 구매 쌍과 긍정 리뷰 표시는 그대로 유지됩니다.
+
+        Args:
+            purchases: [(customer_id, product_id, positive), ...]
+
+        Returns:
+            int: 반영한 구매 기록 수
+        """
+        rows, columns, positive_rows = [], [], []
+        for customer_id, product_id, positive in purchases:
+            row = self.customer_index.setdefault(customer_id, len(self.customer_index))
+            rows.append(row)
+            columns.append(product_id)
+            if positive:
+                positive_rows.append(row)
+
+        if not rows:
+            return 0
+
+        # 긍정 리뷰 표시는 교체 방식으로 갱신 (copy()로 만든 사본과 배열을 공유하므로)
+        flags = np.zeros(len(self.customer_index), dtype=bool)
+        flags[:len(self.positive)] = self.positive
+        flags[positive_rows] = True
+        self.positive = flags
+
+        shape = (
+            len(self.customer_index),
+            max(self.matrix.shape[1], max(columns) + 1)
+        )
+        added = csr_matrix(
+            (np.ones(len(rows), dtype=bool), (rows, columns)), shape=shape
+        )
+        matrix = self.matrix.copy()
+        matrix.resize(shape)
+        # bool 행렬의 덧셈은 OR이므로 중복 구매 쌍은 한 번만 남음
+        self.matrix = (matrix + added).tocsr()
+
+        return len(rows)
+
+    def copy(self) -> 'PurchaseIndex':
+        """
+        사본 생성 (행렬/긍정 리뷰 표시는 add 시 교체되므로 공유하고 고객 매핑만 복사)
+
+        Returns:
+            PurchaseIndex: 사본
+        """
+        other = PurchaseIndex()
+        other.customer_index = dict(self.customer_index)
+        other.matrix = self.matrix
+        other.positive = self.positive
+        return other
+
+    def get(self, customer_id: int) -> np.ndarray:
+        """
+        고객이 구매한 상품 ID 배열 (O(구매 수) 슬라이스)
+
+        Args:
+            customer_id (int): 고객 ID
+
+        Returns:
+            np.ndarray: 상품 ID 배열 (구매 이력이 없으면 빈 배열)
+        """
+        row = self.customer_index.get(customer_id)
+        if row is None:
+            return np.empty(0, dtype=np.int64)
+
+        start, end = self.matrix.indptr[row:row + 2]
+        return self.matrix.indices[start:end].astype(np.int64)
+
+    def has_positive(self, customer_id: int) -> bool:
+        """
+        고객이 긍정 리뷰(별점 4점 이상 또는 Positive 감성)를 작성했는지 여부
+
+        Args:
+            customer_id (int): 고객 ID
+
+        Returns:
+            bool: 긍정 리뷰 보유 여부 (구매 이력이 없으면 False)
+        """
+        row = self.customer_index.get(customer_id)
+        return row is not None and bool(self.positive[row])
+
+    def __len__(self) -> int:
+        return len(self.customer_index)
@@ -3,33 +3,458 @@
 
 고객-키워드 유사도 기반 상품 추천 시스템을 구현합니다.
 """
-import sqlite3
+import os
+import sys
+import copy
+import heapq
 import pickle
-from collections import defaultdict
-from typing import Dict, List, Tuple, Set
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, List, Tuple, Set, Optional
 import numpy as np
+from scipy.sparse import csr_matrix, diags
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from src.text_cleaner import KoreanTextCleaner
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+from src.text_cleaner import shared_cleaner
+from src.ann_index import RandomProjectionLSH
+from src.product_stats import ProductStats, load_product_stats
+from src.purchase_index import PurchaseIndex
+from src.db import REVIEW_DB_PATH, get_connection
+from src.latent_factors import ImplicitALS, load_interactions
+from src.diversity import DIVERSITY_MODES, DIVERSITY_POOL_SIZE, diversify
+from src.metrics import stage_timer, timed_operation
+
+
+# 이 개수 이상의 상품이 있을 때만 ANN 인덱스를 자동으로 사용 (작으면 정확 계산이 더 빠름)
+ANN_MIN_CATALOG = 5000
+
+# ANN 조회 시 테이블당 추가 탐색 버킷 수 기본값 (클수록 재현율↑, 지연시간↑)
+DEFAULT_ANN_PROBES = 2
+
+# 프로필 가중치 방식 ('frequency': 정규화 빈도, 'tfidf': TF-IDF)
+WEIGHTING_MODES = ('frequency', 'tfidf')
+
+# TF-IDF 모드에서 이 비율을 넘는 긍정 리뷰에 등장하는 키워드(채움말)는 어휘에서 제외
+TFIDF_MAX_DF = 0.5
+
+# 추천 엔진 ('keyword': 키워드 프로필 코사인 유사도, 'als': 잠재 요인 내적)
+ENGINES = ('keyword', 'als')
+
+# 프로필 캐시(아티팩트 번들) 포맷 버전
+# (2: 증분 갱신용 원본 가중 빈도와 리뷰 rowid 워터마크 추가, 3: 유사 상품 목록 추가,
+#  4: 컴팩트 모드/어휘 가지치기 설정 추가, 5: 고객 구매 이력 인덱스 추가,
+#  6: 고객 세그먼트별 콜드 스타트 추천 목록 추가, 7: 잠재 요인 모델 추가,
+#  8: 구매 이력 인덱스에 고객별 긍정 리뷰 보유 여부 추가,
+#  9: 해싱 모드 프로필을 키워드 딕셔너리 대신 버킷 CSR 행렬로 저장)
+ARTIFACT_VERSION = 9
+
+# 해싱 모드에서 권장하는 버킷 수 (RECOMMENDER_HASH_FEATURES 예시 값)
+DEFAULT_HASH_FEATURES = 2 ** 16
+
+# 상품별로 미리 계산해 두는 유사 상품(이웃) 수
+SIMILAR_TOP_K = 20
+
+# 세그먼트(연령대/성별)별로 미리 계산해 두는 추천 상품 수
+SEGMENT_TOP_K = 100
+
+# 고객 정보가 없거나 해당 세그먼트 리뷰가 없을 때 사용하는 전체 세그먼트 키
+ALL_SEGMENT = ('전체', '전체')
+
+# 유사 상품 계산 시 한 번에 만드는 dense 유사도 블록의 최대 원소 수 (메모리 상한)
+SIMILARITY_BLOCK_ELEMENTS = 1 << 24
+
+# refresh_profiles_since 반환값: 증분 갱신 정보가 없어 전체 프로필을 재생성함
+PROFILES_REBUILT = -1
+
+
+def _identity_tokens(tokens: List[str]) -> List[str]:
+    """
+    사전 토큰화된 키워드 리스트를 그대로 반환 (TfidfVectorizer analyzer용)
+    
+    모듈 수준 함수여야 학습된 벡터라이저를 pickle로 저장할 수 있습니다.
+    """
+    return tokens
+
+
+def is_positive_review(rating: int, sentiment: str) -> bool:
+    """
+    프로필에 반영되는 긍정 리뷰인지 판정 (별점 4점 이상 또는 Positive 감성)
+    
+    Args:
+        rating (int): 별점
+        sentiment (str): 감성
+        
+    Returns:
+        bool: 긍정 리뷰 여부
+    """
+    return rating >= 4 or sentiment == 'Positive'
+
+
+@lru_cache(maxsize=1 << 16)
+def hash_keyword(keyword: str, n_features: int) -> int:
+    """
+    키워드를 고정 개수의 버킷 중 하나로 매핑 (HashingVectorizer와 같은 murmurhash3)
+    
+    프로세스마다 값이 바뀌는 내장 hash()와 달리 저장/재시작 후에도 같은 버킷을 줍니다.
+    
+    Args:
+        keyword (str): 키워드
+        n_features (int): 버킷 수
+        
+    Returns:
+        int: 버킷(열) 인덱스
+    """
+    return murmurhash3_32(keyword, positive=True) % n_features
+
+
+def csr_nbytes(matrix: Optional[csr_matrix]) -> int:
+    """
+    CSR 행렬이 차지하는 메모리 (data, indices, indptr 배열 합계)
+    
+    Args:
+        matrix: CSR 행렬 (None이면 0)
+        
+    Returns:
+        int: 바이트 수
+    """
+    if matrix is None:
+        return 0
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+
+def estimate_dict_profiles_bytes(profiles: Dict[int, Dict[str, float]]) -> int:
+    """
+    {product_id: {keyword: weight}} 딕셔너리 프로필의 대략적인 메모리 사용량
+    
+    바깥/안쪽 딕셔너리, 키워드 문자열, float 객체 크기를 합산합니다.
+    
+    Args:
+        profiles: 딕셔너리 프로필
+        
+    Returns:
+        int: 바이트 수 (추정치)
+    """
+    total = sys.getsizeof(profiles)
+    for profile in profiles.values():
+        total += sys.getsizeof(profile)
+        total += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in profile.items())
+    return total
+
+
+def _splice_rows(matrix: csr_matrix, shape: Tuple[int, int],
+                 changed_rows: np.ndarray, rows: List[int], columns: List[int],
+                 values: List[float]) -> csr_matrix:
+    """
+    CSR 행렬의 일부 행만 새 값으로 교체한 행렬 반환 (dtype 유지)
+    
+    기존 행렬을 새 크기로 늘린 뒤 변경된 행만 0으로 만들고 새 값을 더합니다.
+    
+    Args:
+        matrix: 기존 행렬
+        shape: 새 행렬 크기 (행/열은 늘어나기만 함)
+        changed_rows: 교체할 행 인덱스
+        rows, columns, values: 교체할 행들의 COO 형식 값
+        
+    Returns:
+        csr_matrix: 새 행렬
+    """
+    matrix = matrix.copy()
+    matrix.resize(shape)
+    keep = np.ones(shape[0], dtype=matrix.dtype)
+    keep[changed_rows] = 0
+    matrix = diags(keep) @ matrix
+    matrix.eliminate_zeros()
+    replacement = csr_matrix(
+        (np.asarray(values, dtype=matrix.dtype), (rows, columns)), shape=shape
+    )
+    return (matrix + replacement).tocsr()
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    점수 행렬의 행별 상위 k개 열을 내림차순으로 선택
+    
+    동점은 열 순서대로 정렬합니다 (recommend_products와 동일).
+    
+    Args:
+        scores: (행 수 x 열 수) 점수 행렬 (제외할 칸은 -inf)
+        k: 행별 선택 개수 (1 이상, 열 수 이하)
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (열 인덱스, 점수) 각각 (행 수 x k)
+    """
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.lexsort((top, -top_scores), axis=-1)
+    return (np.take_along_axis(top, order, axis=1),
+            np.take_along_axis(top_scores, order, axis=1))
+
+
+def rating_weight(rating: int) -> float:
+    """
+    별점에 따른 리뷰 가중치 (5점: 1.5배, 4점 이하: 1.0배)
+    
+    Args:
+        rating (int): 별점
+        
+    Returns:
+        float: 가중치
+    """
+    return 1.5 if rating == 5 else 1.0
 
 
 class RecommendationSystem:
     """추천 시스템 클래스"""
     
-    def __init__(self, db_path: str = 'data/reviews.db'):
+    def __init__(self, db_path: str = 'data/reviews.db', weighting: str = 'frequency',
+                 compact: bool = False, min_df: int = 1,
+                 max_features: Optional[int] = None,
+                 profile_top_k: Optional[int] = None,
+                 hash_features: Optional[int] = None):
         """
         RecommendationSystem 초기화
         
         Args:
             db_path (str): 데이터베이스 파일 경로
+            weighting (str): 프로필 가중치 방식 ('frequency' 또는 'tfidf')
+            compact (bool): 상품 프로필을 딕셔너리 없이 float32 CSR 행렬로만 보관
+                (해싱 모드와 함께 쓰면 버킷 행렬을 float32로 보관)
+            min_df (int): 이 개수 미만의 긍정 리뷰에만 등장한 키워드는 어휘에서 제외
+            max_features (int): 문서 빈도 상위 N개 키워드만 어휘로 사용 (None이면 제한 없음)
+            profile_top_k (int): 상품별 가중치 상위 K개 키워드만 유지 (None이면 전체)
+            hash_features (int): 키워드 어휘 대신 고정 개수의 해시 버킷을 벡터 차원으로 사용
+                (None이면 어휘 사용). 새 키워드가 들어와도 행렬 차원이 바뀌지 않으며,
+                상품 프로필/원본 빈도는 키워드 딕셔너리 없이 버킷 CSR 행렬로만 보관
+                (버킷에서 키워드를 복원할 수 없으므로 상품 키워드 프로필은 제공하지 않음)
         """
+        if weighting not in WEIGHTING_MODES:
+            raise ValueError(f"지원하지 않는 가중치 방식입니다: {weighting}")
+        if hash_features is not None and hash_features <= 0:
+            raise ValueError(f"해시 버킷 수는 양수여야 합니다: {hash_features}")
+        
         self.db_path = db_path
-        self.cleaner = KoreanTextCleaner()
+        self.weighting = weighting
+        self.compact = compact
+        self.min_df = min_df
+        self.max_features = max_features
+        self.profile_top_k = profile_top_k
+        self.hash_features = hash_features
+        self.cleaner = shared_cleaner()
         self.customer_profiles = {}
         self.product_profiles = {}
+        self.product_counts = {}
+        self.last_review_rowid = None
         self.vectorizer = None
         self.product_vectors = None
         self.product_ids = []
+        self.product_index = {}
+        self.vocabulary = {}
+        self.keywords = []
+        self.product_count_matrix = None
+        self.memory_report = {}
+        self._kept_keywords = None
+        self.ann_index = None
+        self.similar_product_ids = None
+        self.similar_scores = None
+        self.product_stats = None
+        self.purchase_index = None
+        self.customer_segments = {}
+        self.segment_index = {}
+        self.segment_profiles = {}
+        self.segment_product_ids = None
+        self.segment_scores = None
+        self.latent_model = None
+        self.format_version = None
+        self._has_profile = None
+        self._row_lookup = None
+    
+    def clone(self) -> 'RecommendationSystem':
+        """
+        증분 갱신용 사본 생성 (원본은 읽기 전용 스냅샷으로 계속 사용)
+        
+        갱신 중 제자리 변경되는 컨테이너만 복사하고, 갱신 시 통째로
+        교체되는 행렬/인덱스/벡터라이저는 원본과 공유합니다.
+        
+        Returns:
+            RecommendationSystem: 사본
+        """
+        other = copy.copy(self)
+        other.product_profiles = dict(self.product_profiles)
+        other.product_counts = dict(self.product_counts)
+        if self.similar_product_ids is not None:
+            other.similar_product_ids = self.similar_product_ids.copy()
+            other.similar_scores = self.similar_scores.copy()
+        if self.purchase_index is not None:
+            other.purchase_index = self.purchase_index.copy()
+        return other
+    
+    def get_product_stats(self) -> ProductStats:
+        """
+        상품 메타데이터/통계 배열 조회 (최초 호출 시 product_stats 테이블에서 적재)
+        
+        Returns:
+            ProductStats: 상품 통계
+        """
+        if self.product_stats is None:
+            self.product_stats = load_product_stats(self.db_path)
+        return self.product_stats
+    
+    def refresh_product_stats(self) -> ProductStats:
+        """
+        트리거로 갱신된 product_stats 테이블을 다시 적재
+        
+        Returns:
+            ProductStats: 갱신된 상품 통계
+        """
+        self.product_stats = load_product_stats(self.db_path)
+        return self.product_stats
+    
+    def _weighted_keyword_counts(
+        self, reviews: List[Tuple[str, int]]
+    ) -> Dict[str, float]:
+        """
+        리뷰 목록의 별점 가중 키워드 빈도 계산
+        
+        Args:
+            reviews: [(review_text, rating), ...]
+            
+        Returns:
+            Dict[str, float]: {keyword: 가중 빈도}
+        """
+        keyword_freq = defaultdict(float)
+        
+        for review_text, rating in reviews:
+            keywords = self.cleaner.extract_keywords(review_text)
+            
+            # 별점에 따라 가중치 부여 (5점: 1.5배, 4점: 1.0배)
+            weight = rating_weight(rating)
+            
+            for keyword in keywords:
+                keyword_freq[keyword] += weight
+        
+        return keyword_freq
+    
+    def _in_vocabulary(self, keyword: str) -> bool:
+        """
+        학습/가지치기된 어휘에 포함된 키워드인지 확인
+        
+        Args:
+            keyword (str): 키워드
+            
+        Returns:
+            bool: 어휘 포함 여부 (어휘 제한이 없으면 항상 True)
+        """
+        if self.weighting == 'tfidf':
+            return keyword in self.vectorizer.vocabulary_
+        if self._kept_keywords is not None:
+            return keyword in self._kept_keywords
+        return True
+    
+    def _finalize_profile(self, keyword_freq: Dict[str, float],
+                          is_product: bool = False) -> Dict[str, float]:
+        """
+        가중 빈도를 가중치 방식에 맞는 프로필로 변환
+        
+        TF-IDF 모드에서는 학습된 벡터라이저의 IDF를 곱하고 어휘에 없는 키워드는
+        버립니다 (별점 가중 빈도를 TF로 사용한 vectorizer.transform과 동일).
+        상품 프로필에는 어휘 가지치기와 상위 K개 키워드 절단을 적용합니다.
+        해싱 모드의 상품 빈도는 _bucket_freq에서 이미 어휘/IDF가 반영된 버킷 빈도이므로
+        상위 K개 버킷 절단과 정규화만 적용합니다.
+        
+        Args:
+            keyword_freq: {keyword: 가중 빈도} (해싱 모드 상품은 {bucket: 가중 빈도})
+            is_product: 상품 프로필 여부
+            
+        Returns:
+            Dict[str, float]: 총합이 1이 되도록 정규화된 {keyword: weight}
+        """
+        if is_product and self.hash_features:
+            pass
+        elif self.weighting == 'tfidf':
+            vocabulary = self.vectorizer.vocabulary_
+            idf = self.vectorizer.idf_
+            keyword_freq = {
+                k: v * idf[vocabulary[k]]
+                for k, v in keyword_freq.items() if k in vocabulary
+            }
+        elif is_product and self._kept_keywords is not None:
+            keyword_freq = {
+                k: v for k, v in keyword_freq.items() if k in self._kept_keywords
+            }
+        
+        # 상품별 상위 K개 키워드만 유지 (동점은 키 순서로 정해 증분 갱신과 재생성 결과를 맞춤)
+        if is_product and self.profile_top_k and len(keyword_freq) > self.profile_top_k:
+            keyword_freq = dict(heapq.nlargest(
+                self.profile_top_k, keyword_freq.items(), key=lambda x: (x[1], x[0])
+            ))
+        
+        # 정규화 (총합으로 나눔)
+        total = sum(keyword_freq.values())
+        if total > 0:
+            keyword_profile = {k: v / total for k, v in keyword_freq.items()}
+        else:
+            keyword_profile = {}
+        
+        return keyword_profile
+    
+    def _bucket_freq(self, keyword_freq: Dict[str, float]) -> Dict[int, float]:
+        """
+        해싱 모드: 키워드 가중 빈도를 버킷별 빈도로 합산
+        
+        어휘 밖 키워드는 버리고 TF-IDF 모드에서는 IDF를 곱한 뒤 합산하므로,
+        버킷 빈도를 정규화하면 키워드 프로필을 버킷으로 합친 것과 같은 벡터가 됩니다.
+        
+        Args:
+            keyword_freq: {keyword: 가중 빈도}
+            
+        Returns:
+            Dict[int, float]: {버킷 인덱스: 가중 빈도}
+        """
+        if self.weighting == 'tfidf':
+            vocabulary = self.vectorizer.vocabulary_
+            idf = self.vectorizer.idf_
+        
+        buckets = defaultdict(float)
+        for keyword, count in keyword_freq.items():
+            if not self._in_vocabulary(keyword):
+                continue
+            if self.weighting == 'tfidf':
+                count *= idf[vocabulary[keyword]]
+            buckets[hash_keyword(keyword, self.hash_features)] += count
+        
+        return buckets
+    
+    def fit_vectorizer(self, token_docs: List[List[str]]) -> TfidfVectorizer:
+        """
+        긍정 리뷰(토큰화 완료)로 TF-IDF 어휘와 IDF를 한 번 학습
+        
+        Args:
+            token_docs: 리뷰별 키워드 리스트 (Kiwi를 다시 실행하지 않도록 사전 토큰화)
+            
+        Returns:
+            TfidfVectorizer: 학습된 벡터라이저
+        """
+        # 문서가 너무 적으면 모든 키워드가 max_df에 걸릴 수 있으므로 필터를 끔
+        max_df = TFIDF_MAX_DF if len(token_docs) >= 10 else 1.0
+        
+        self.vectorizer = TfidfVectorizer(
+            analyzer=_identity_tokens,
+            max_df=max_df,
+            min_df=self.min_df,
+            max_features=self.max_features,
+            dtype=np.float64
+        )
+        self.vectorizer.fit(token_docs)
+        
+        print(f"✓ TF-IDF 학습 완료 (어휘: {len(self.vectorizer.vocabulary_)}개)")
+        
+        return self.vectorizer
+    
+    def _ensure_vectorizer(self):
+        """TF-IDF 모드인데 학습된 벡터라이저가 없으면 전체 프로필을 생성"""
+        if self.weighting == 'tfidf' and self.vectorizer is None:
+            self.build_all_product_profiles()
     
     def build_customer_profile(self, customer_id: int) -> Dict[str, float]:
         """
@@ -41,7 +466,9 @@ class RecommendationSystem:
         Returns:
             Dict[str, float]: {keyword: weight} 딕셔너리
         """
-        conn = sqlite3.connect(self.db_path)
+        self._ensure_vectorizer()
+        
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
         
         # 고객의 긍정 리뷰 추출 (별점 4점 이상 또는 Positive 감성)
@@ -52,112 +479,1033 @@ class RecommendationSystem:
         AND (rating >= 4 OR sentiment = 'Positive')
         """
         
-        cursor.execute(query, (customer_id,))
+        with stage_timer('sql'):
+            cursor.execute(query, (customer_id,))
+            positive_reviews = cursor.fetchall()
+        
+        # 키워드 빈도 계산 후 정규화 (TF-IDF 모드는 상품과 같은 IDF 적용)
+        with stage_timer('tokenize'):
+            keyword_counts = self._weighted_keyword_counts(positive_reviews)
+        with stage_timer('profile'):
+            return self._finalize_profile(keyword_counts)
+    
+    def build_customer_profiles(
+        self, customer_ids: List[int]
+    ) -> Dict[int, Dict[str, float]]:
+        """
+        여러 고객의 프로필을 한 번에 생성 (고객마다 쿼리하지 않는 배치 버전)
+        
+        Args:
+            customer_ids: 고객 ID 리스트
+            
+        Returns:
+            Dict[int, Dict[str, float]]: {customer_id: keyword_profile}
+                (긍정 리뷰가 없는 고객은 빈 딕셔너리)
+        """
+        self._ensure_vectorizer()
+        
+        conn = get_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        customer_reviews = defaultdict(list)
+        unique_ids = list(dict.fromkeys(customer_ids))
+        # SQLite 바인딩 변수 개수 제한(999) 안에서 나누어 조회
+        for start in range(0, len(unique_ids), 900):
+            chunk = unique_ids[start:start + 900]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(f"""
+                SELECT customer_id, review_text, rating
+                FROM reviews
+                WHERE customer_id IN ({placeholders})
+                AND (rating >= 4 OR sentiment = 'Positive')
+            """, chunk)
+            for customer_id, review_text, rating in cursor.fetchall():
+                customer_reviews[customer_id].append((review_text, rating))
+        
+        return {
+            customer_id: self._finalize_profile(
+                self._weighted_keyword_counts(customer_reviews.get(customer_id, []))
+            )
+            for customer_id in unique_ids
+        }
+    
+    def build_product_profile(self, product_id: int) -> Dict[str, float]:
+        """
+        상품 프로필 생성 (긍정 리뷰 기반)
+        
+        Args:
+            product_id (int): 상품 ID
+            
+        Returns:
+            Dict[str, float]: {keyword: weight} 딕셔너리
+        """
+        self._ensure_vectorizer()
+        
+        conn = get_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        # 상품의 긍정 리뷰 추출
+        query = """
+        SELECT review_text, rating
+        FROM reviews
+        WHERE product_id = ?
+        AND (rating >= 4 OR sentiment = 'Positive')
+        """
+        
+        cursor.execute(query, (product_id,))
         positive_reviews = cursor.fetchall()
         
-        conn.close()
+        return self._finalize_profile(
+            self._weighted_keyword_counts(positive_reviews), is_product=True
+        )
+    
+    def prune_vocabulary(self, token_docs: List[List[str]]) -> Optional[Set[str]]:
+        """
+        빈도 모드의 어휘 가지치기 (min_df / max_features)
+        
+        Args:
+            token_docs: 리뷰별 키워드 리스트
+            
+        Returns:
+            Set[str]: 유지할 키워드 집합 (가지치기를 하지 않으면 None)
+        """
+        if self.min_df <= 1 and self.max_features is None:
+            self._kept_keywords = None
+            return None
+        
+        document_freq = Counter(
+            keyword for keywords in token_docs for keyword in set(keywords)
+        )
+        kept = [(k, df) for k, df in document_freq.items() if df >= self.min_df]
+        if self.max_features is not None and len(kept) > self.max_features:
+            kept = heapq.nlargest(self.max_features, kept, key=lambda x: (x[1], x[0]))
         
-        # 키워드 빈도 계산
-        keyword_freq = defaultdict(int)
+        self._kept_keywords = {k for k, _ in kept}
+        print(f"✓ 어휘 가지치기: {len(document_freq)}개 → {len(self._kept_keywords)}개")
         
-        for review_text, rating in positive_reviews:
-            keywords = self.cleaner.extract_keywords(review_text)
+        return self._kept_keywords
+    
+    def build_all_product_profiles(self) -> Dict[int, Dict[str, float]]:
+        """
+        모든 상품의 프로필을 사전 계산
+        
+        긍정 리뷰를 한 번의 쿼리로 가져와 리뷰마다 한 번만 토큰화하고,
+        TF-IDF 모드에서는 같은 토큰으로 벡터라이저를 학습합니다.
+        
+        Returns:
+            Dict[int, Dict[str, float]]: {product_id: keyword_profile}
+                (해싱 모드는 버킷 행렬로만 보관하므로 빈 딕셔너리)
+        """
+        print("=" * 80)
+        print("전체 상품 프로필 생성 중...")
+        print("=" * 80)
+        
+        conn = get_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        # 모든 상품 ID 가져오기
+        cursor.execute("SELECT product_id FROM products")
+        product_ids = [row[0] for row in cursor.fetchall()]
+        
+        # 증분 갱신 기준점 (이 rowid까지의 리뷰가 프로필에 반영됨)
+        cursor.execute("SELECT COALESCE(MAX(rowid), 0) FROM reviews")
+        last_review_rowid = cursor.fetchone()[0]
+        
+        # 전체 긍정 리뷰 추출
+        cursor.execute("""
+            SELECT product_id, review_text, rating, customer_id
+            FROM reviews
+            WHERE rowid <= ?
+            AND (rating >= 4 OR sentiment = 'Positive')
+        """, (last_review_rowid,))
+        positive_reviews = cursor.fetchall()
+        
+        customer_segments = self._load_customer_segments()
+        
+        print(f"총 {len(product_ids)}개 상품 프로필 생성 시작 "
+              f"(긍정 리뷰 {len(positive_reviews)}개)...")
+        
+        # 리뷰별 토큰화 (Kiwi는 리뷰당 한 번만 실행)
+        token_docs = []
+        for idx, (_, review_text, _, _) in enumerate(positive_reviews, 1):
+            token_docs.append(self.cleaner.extract_keywords(review_text))
             
-            # 별점에 따라 가중치 부여 (5점: 1.5배, 4점: 1.0배)
-            weight = 1.5 if rating == 5 else 1.0
+            if idx % 500 == 0:
+                print(f"  진행률: {idx}/{len(positive_reviews)} "
+                      f"({idx/len(positive_reviews)*100:.1f}%)")
+        
+        if self.weighting == 'tfidf':
+            self.fit_vectorizer(token_docs)
+        else:
+            self.prune_vocabulary(token_docs)
+        
+        # 상품별 별점 가중 키워드 빈도 집계 (세그먼트별 빈도도 같은 토큰으로 집계)
+        product_freq = {product_id: defaultdict(float) for product_id in product_ids}
+        segment_freq = defaultdict(lambda: defaultdict(float))
+        tokenized_reviews = zip(positive_reviews, token_docs)
+        for (product_id, _, rating, customer_id), keywords in tokenized_reviews:
+            weight = rating_weight(rating)
+            segment = customer_segments.get(customer_id)
+            for key in ((segment, ALL_SEGMENT) if segment else (ALL_SEGMENT,)):
+                for keyword in keywords:
+                    segment_freq[key][keyword] += weight
             
+            keyword_freq = product_freq.get(product_id)
+            if keyword_freq is None:
+                continue
+            if self.hash_features:
+                # 해싱 모드는 상품 빈도를 키워드 대신 버킷 단위로 집계
+                for bucket, count in self._bucket_freq(Counter(keywords)).items():
+                    keyword_freq[bucket] += count * weight
+                continue
             for keyword in keywords:
                 keyword_freq[keyword] += weight
         
-        # 정규화 (총합으로 나눔)
-        total = sum(keyword_freq.values())
-        if total > 0:
-            keyword_profile = {k: v / total for k, v in keyword_freq.items()}
+        # 전체 재생성 시 이웃 목록은 다시 계산해야 함
+        self.similar_product_ids = None
+        self.similar_scores = None
+        if self.hash_features:
+            product_profiles = {}
+            self._build_hashed_matrices(product_freq)
         else:
-            keyword_profile = {}
+            product_profiles = {
+                product_id: self._finalize_profile(keyword_freq, is_product=True)
+                for product_id, keyword_freq in product_freq.items()
+            }
+            self.product_profiles = product_profiles
+            self.product_counts = {
+                product_id: dict(keyword_freq)
+                for product_id, keyword_freq in product_freq.items()
+            }
+            self.build_product_matrix()
         
-        return keyword_profile
+        print(f"✓ {len(product_freq)}개 상품 프로필 생성 완료")
+        
+        self.last_review_rowid = last_review_rowid
+        self.build_purchase_index()
+        
+        self.customer_segments = customer_segments
+        self._build_segment_lists(segment_freq)
+        
+        if self.compact and not self.hash_features:
+            self._compact_profiles()
+        
+        return product_profiles
+    
+    def _load_customer_segments(self) -> Dict[int, Tuple[str, str]]:
+        """
+        customers 테이블에서 고객별 세그먼트(연령대, 성별) 조회
+        
+        Returns:
+            Dict[int, Tuple[str, str]]: {customer_id: (age_group, gender)}
+        """
+        conn = get_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT customer_id, age_group, gender FROM customers")
+        segments = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        
+        return segments
+    
+    def _build_segment_lists(self,
+                             segment_freq: Dict[Tuple[str, str], Dict[str, float]],
+                             k: int = SEGMENT_TOP_K):
+        """
+        세그먼트별 선호 키워드 프로필과 추천 상품 Top K 목록 계산
+        
+        Args:
+            segment_freq: {(age_group, gender): {keyword: 가중 빈도}}
+            k: 세그먼트별로 저장할 추천 상품 수
+        """
+        segments = sorted(segment_freq)
+        self.segment_index = {key: idx for idx, key in enumerate(segments)}
+        self.segment_profiles = {
+            key: self._finalize_profile(segment_freq[key]) for key in segments
+        }
+        self.segment_product_ids = np.full((len(segments), k), -1, dtype=np.int64)
+        self.segment_scores = np.zeros((len(segments), k), dtype=np.float32)
+        
+        candidates = np.flatnonzero(self._has_profile)
+        for row, key in enumerate(segments):
+            profile = self.segment_profiles[key]
+            if not profile:
+                continue
+            vector = self.vectorize_profile(profile)
+            scores = (self.product_vectors @ vector.T).toarray().ravel()
+            scores = scores[candidates]
+            selected = self._select_top(scores, candidates, k)
+            self.segment_product_ids[row, :len(selected)] = [
+                self.product_ids[candidates[pos]] for pos in selected
+            ]
+            self.segment_scores[row, :len(selected)] = scores[selected]
+        
+        print(f"✓ {len(segments)}개 고객 세그먼트의 콜드 스타트 추천 목록 생성 완료")
+    
+    def build_segment_recommendations(self, k: int = SEGMENT_TOP_K):
+        """
+        세그먼트별 콜드 스타트 추천 목록만 다시 계산 (세그먼트 정보가 없는 캐시용)
+        
+        Args:
+            k (int): 세그먼트별로 저장할 추천 상품 수
+        """
+        if self.product_vectors is None:
+            self.build_product_matrix()
+        
+        conn = get_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        query = """
+            SELECT review_text, rating, customer_id
+            FROM reviews
+            WHERE (rating >= 4 OR sentiment = 'Positive')
+        """
+        params = ()
+        if self.last_review_rowid is not None:
+            query += " AND rowid <= ?"
+            params = (self.last_review_rowid,)
+        cursor.execute(query, params)
+        positive_reviews = cursor.fetchall()
+        
+        self.customer_segments = self._load_customer_segments()
+        segment_freq = defaultdict(lambda: defaultdict(float))
+        for review_text, rating, customer_id in positive_reviews:
+            weight = rating_weight(rating)
+            segment = self.customer_segments.get(customer_id)
+            keywords = self.cleaner.extract_keywords(review_text)
+            for key in ((segment, ALL_SEGMENT) if segment else (ALL_SEGMENT,)):
+                for keyword in keywords:
+                    segment_freq[key][keyword] += weight
+        
+        self._build_segment_lists(segment_freq, k)
+    
+    def _compact_profiles(self):
+        """
+        딕셔너리 프로필/원본 빈도를 float32 CSR 행렬로 옮기고 딕셔너리는 해제
+        
+        상품 프로필은 L2 정규화 행렬의 행을 합으로 나누면 그대로 복원되므로
+        별도 저장하지 않으며, 절감된 메모리는 memory_report에 기록합니다.
+        """
+        dict_bytes = (estimate_dict_profiles_bytes(self.product_profiles)
+                      + estimate_dict_profiles_bytes(self.product_counts))
+        matrix_bytes_before = csr_nbytes(self.product_vectors)
+        
+        # 원본 빈도 행렬 (상위 K 절단으로 프로필에서 빠진 키워드는 열 추가)
+        vocabulary = self.vocabulary
+        rows, columns, values = [], [], []
+        for product_id, keyword_freq in self.product_counts.items():
+            idx = self.product_index[product_id]
+            for keyword, count in keyword_freq.items():
+                if self._in_vocabulary(keyword):
+                    rows.append(idx)
+                    columns.append(vocabulary.setdefault(keyword, len(vocabulary)))
+                    values.append(count)
+        
+        shape = (len(self.product_ids), len(vocabulary))
+        self.product_vectors.resize(shape)
+        self.product_count_matrix = csr_matrix(
+            (np.asarray(values, dtype=np.float32), (rows, columns)), shape=shape
+        )
+        self.keywords = list(vocabulary)
+        
+        self.product_profiles = {}
+        self.product_counts = {}
+        
+        compact_bytes = (csr_nbytes(self.product_vectors)
+                         + csr_nbytes(self.product_count_matrix))
+        before_bytes = dict_bytes + matrix_bytes_before
+        self.memory_report = {
+            'dict_bytes': before_bytes,
+            'compact_bytes': compact_bytes,
+            'saved_bytes': before_bytes - compact_bytes,
+        }
+        
+        print(f"✓ 컴팩트 프로필: {before_bytes / 1024 ** 2:.2f}MB → "
+              f"{compact_bytes / 1024 ** 2:.2f}MB "
+              f"({(1 - compact_bytes / max(before_bytes, 1)) * 100:.1f}% 절감)")
+    
+    def _build_hashed_matrices(self, product_freq: Dict[int, Dict[int, float]]):
+        """
+        해싱 모드: 상품별 버킷 빈도로 원본 빈도 행렬과 정규화 상품 행렬을 바로 생성
+        
+        키워드 문자열 딕셔너리를 만들지 않으므로 메모리가 어휘 크기와 무관하게
+        (상품 수 x 상품별 버킷 수)에 비례합니다.
+        
+        Args:
+            product_freq: {product_id: {bucket: 가중 빈도}}
+        """
+        product_ids = list(product_freq)
+        count_rows, count_columns, count_values = [], [], []
+        rows, columns, values = [], [], []
+        for idx, product_id in enumerate(product_ids):
+            bucket_freq = product_freq[product_id]
+            for bucket, count in bucket_freq.items():
+                count_rows.append(idx)
+                count_columns.append(bucket)
+                count_values.append(count)
+            profile = self._finalize_profile(bucket_freq, is_product=True)
+            for bucket, weight in profile.items():
+                rows.append(idx)
+                columns.append(bucket)
+                values.append(weight)
+        
+        shape = (len(product_ids), self.hash_features)
+        matrix = csr_matrix((np.asarray(values, dtype=self._dtype), (rows, columns)),
+                            shape=shape)
+        
+        self.product_profiles = {}
+        self.product_counts = {}
+        self.product_ids = product_ids
+        self.product_index = {pid: idx for idx, pid in enumerate(product_ids)}
+        self._row_lookup = None
+        self.vocabulary = {}
+        self.keywords = []
+        self.product_vectors = normalize(matrix)
+        self.product_count_matrix = csr_matrix(
+            (np.asarray(count_values, dtype=self._dtype), (count_rows, count_columns)),
+            shape=shape
+        )
+        self._has_profile = np.diff(matrix.indptr) > 0
+        self.ann_index = None
+    
+    @property
+    def keyword_profiles_available(self) -> bool:
+        """상품 키워드 프로필 조회 가능 여부 (해싱 모드는 버킷에서 키워드를 복원할 수 없음)"""
+        return not self.hash_features
+    
+    def profile_memory_usage(self) -> Dict[str, int]:
+        """
+        현재 상품 프로필 표현이 차지하는 메모리
+        
+        Returns:
+            Dict[str, int]: 딕셔너리(추정치)/행렬 바이트 수
+        """
+        return {
+            'dict_bytes': (estimate_dict_profiles_bytes(self.product_profiles)
+                           + estimate_dict_profiles_bytes(self.product_counts)),
+            'matrix_bytes': (csr_nbytes(self.product_vectors)
+                             + csr_nbytes(self.product_count_matrix)),
+        }
+    
+    def get_product_profile(self, product_id: int) -> Optional[Dict[str, float]]:
+        """
+        상품 키워드 프로필 조회 (컴팩트 모드에서는 CSR 행에서 복원)
+        
+        Args:
+            product_id (int): 상품 ID
+            
+        Returns:
+            Dict[str, float]: {keyword: weight} (상품이 없으면 None)
+            
+        Raises:
+            ValueError: 해싱 모드 (keyword_profiles_available이 False)
+        """
+        if not self.keyword_profiles_available:
+            raise ValueError("해싱 모드에서는 상품 키워드 프로필을 제공하지 않습니다.")
+        if not self.compact:
+            return self.product_profiles.get(product_id)
+        
+        idx = self.product_index.get(product_id)
+        if idx is None:
+            return None
+        
+        start, end = self.product_vectors.indptr[idx:idx + 2]
+        data = self.product_vectors.data[start:end]
+        total = float(data.sum())
+        if total <= 0:
+            return {}
+        
+        return {
+            self.keywords[column]: float(value) / total
+            for column, value in zip(self.product_vectors.indices[start:end], data)
+        }
+    
+    def _get_product_counts(self, product_id: int) -> Dict[str, float]:
+        """
+        상품의 원본 별점 가중 키워드 빈도 조회
+        
+        Args:
+            product_id (int): 상품 ID
+            
+        Returns:
+            Dict[str, float]: {keyword: 가중 빈도} (해싱 모드는 {bucket: 가중 빈도})
+        """
+        if not self._matrix_profiles:
+            return self.product_counts.get(product_id, {})
+        
+        idx = self.product_index.get(product_id)
+        if idx is None or self.product_count_matrix is None:
+            return {}
+        
+        start, end = self.product_count_matrix.indptr[idx:idx + 2]
+        if self.hash_features:
+            return {
+                int(column): float(value)
+                for column, value in zip(self.product_count_matrix.indices[start:end],
+                                         self.product_count_matrix.data[start:end])
+            }
+        return {
+            self.keywords[column]: float(value)
+            for column, value in zip(self.product_count_matrix.indices[start:end],
+                                     self.product_count_matrix.data[start:end])
+        }
+    
+    def apply_reviews(self, reviews: List[Tuple[int, str, int, str]]) -> int:
+        """
+        새 리뷰들을 상품 프로필에 증분 반영
+        
+        긍정 리뷰의 별점 가중 키워드 빈도를 해당 상품의 원본 빈도에 더하고,
+        변경된 상품의 프로필과 행렬 행만 다시 정규화합니다.
+        TF-IDF 모드에서는 학습된 어휘/IDF를 그대로 사용합니다
+        (어휘를 새로 학습하려면 build_all_product_profiles로 재생성).
+        
+        Args:
+            reviews: [(product_id, review_text, rating, sentiment), ...]
+            
+        Returns:
+            int: 프로필이 갱신된 상품 수
+        """
+        changed = {}
+        for product_id, review_text, rating, sentiment in reviews:
+            if not is_positive_review(rating, sentiment):
+                continue
+            
+            keyword_freq = changed.get(product_id)
+            if keyword_freq is None:
+                keyword_freq = dict(self._get_product_counts(product_id))
+                changed[product_id] = keyword_freq
+            
+            weight = rating_weight(rating)
+            keywords = self.cleaner.extract_keywords(review_text)
+            if self.hash_features:
+                for bucket, count in self._bucket_freq(Counter(keywords)).items():
+                    keyword_freq[bucket] = (keyword_freq.get(bucket, 0.0)
+                                            + count * weight)
+                continue
+            for keyword in keywords:
+                # 컴팩트 모드는 어휘 밖 키워드의 원본 빈도를 보관하지 않음
+                if self.compact and not self._in_vocabulary(keyword):
+                    continue
+                keyword_freq[keyword] = keyword_freq.get(keyword, 0.0) + weight
+        
+        if not changed:
+            return 0
+        
+        updated_profiles = {
+            product_id: self._finalize_profile(keyword_freq, is_product=True)
+            for product_id, keyword_freq in changed.items()
+        }
+        
+        if self._matrix_profiles:
+            self._update_product_rows(updated_profiles, changed)
+        else:
+            self.product_counts.update(changed)
+            self.product_profiles.update(updated_profiles)
+            if self.product_vectors is not None:
+                self._update_product_rows(updated_profiles)
+        
+        if self.product_vectors is not None:
+            self._update_similar_rows(list(updated_profiles))
+        
+        return len(changed)
+    
+    def add_review(self, product_id: int, review_text: str, rating: int,
+                   sentiment: str) -> bool:
+        """
+        리뷰 하나를 상품 프로필에 증분 반영
+        
+        Args:
+            product_id (int): 상품 ID
+            review_text (str): 리뷰 본문
+            rating (int): 별점
+            sentiment (str): 감성
+            
+        Returns:
+            bool: 프로필이 갱신되었으면 True (긍정 리뷰가 아니면 False)
+        """
+        return self.apply_reviews([(product_id, review_text, rating, sentiment)]) > 0
+    
+    def supports_incremental_refresh(self) -> bool:
+        """
+        증분 갱신 가능 여부 (원본 가중 빈도와 리뷰 rowid 기준점이 모두 있어야 함)
+        
+        Returns:
+            bool: 버전 1 이하 캐시처럼 증분 갱신 정보가 없으면 False
+        """
+        if self.last_review_rowid is None:
+            return False
+        if self._matrix_profiles:
+            return self.product_count_matrix is not None
+        return not self.product_profiles or bool(self.product_counts)
+    
+    def refresh_profiles_since(self, rowid: Optional[int] = None) -> int:
+        """
+        주어진 rowid 이후에 추가된 리뷰를 프로필에 증분 반영
+        
+        API 서버가 주기적으로 호출하는 용도이며, 리뷰는 추가만 된다고 가정합니다.
+        원본 빈도가 없는 이전 포맷 캐시에서는 전체 프로필을 재생성하고
+        PROFILES_REBUILT를 반환합니다 (호출한 쪽에서 유사 상품 목록 계산 및 저장).
+        
+        Args:
+            rowid (int): 이 rowid보다 큰 리뷰만 반영 (None이면 마지막 반영 지점)
+            
+        Returns:
+            int: 반영한 신규 리뷰 수 (전체 재생성했으면 PROFILES_REBUILT)
+        """
+        # 원본 빈도/기준점이 없으면 증분 갱신 불가 → 전체 재생성
+        if not self.supports_incremental_refresh():
+            print("⚠️  증분 갱신 정보가 없어 전체 상품 프로필을 재생성합니다.")
+            self.build_all_product_profiles()
+            return PROFILES_REBUILT
+        
+        if rowid is None:
+            rowid = self.last_review_rowid
+        
+        conn = get_connection(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT rowid, product_id, review_text, rating, sentiment, customer_id
+            FROM reviews
+            WHERE rowid > ?
+            ORDER BY rowid
+        """, (rowid,))
+        new_reviews = cursor.fetchall()
+        
+        if not new_reviews:
+            return 0
+        
+        had_ann_index = self.ann_index is not None
+        updated = self.apply_reviews([row[1:5] for row in new_reviews])
+        if self.purchase_index is not None:
+            self.purchase_index.add(
+                (row[5], row[1], is_positive_review(row[3], row[4]))
+                for row in new_reviews
+            )
+        self.last_review_rowid = new_reviews[-1][0]
+        
+        # 별점/감성 통계도 새 리뷰 기준으로 갱신
+        if self.product_stats is not None:
+            self.refresh_product_stats()
+        # ANN 인덱스를 쓰고 있었다면 배치 단위로 한 번만 재구축
+        if had_ann_index and self.ann_index is None:
+            self.build_ann_index()
+        
+        print(f"✓ 신규 리뷰 {len(new_reviews)}개 반영 "
+              f"(프로필 갱신 상품: {updated}개, rowid ≤ {self.last_review_rowid})")
+        
+        return len(new_reviews)
+    
+    @property
+    def _matrix_profiles(self) -> bool:
+        """상품 프로필/원본 빈도를 딕셔너리 없이 CSR 행렬로만 보관하는지 (컴팩트 또는 해싱 모드)"""
+        return self.compact or bool(self.hash_features)
+    
+    @property
+    def _dtype(self):
+        """상품/고객 벡터 dtype (컴팩트 모드는 float32)"""
+        return np.float32 if self.compact else np.float64
+    
+    def _n_columns(self, vocabulary: Dict[str, int]) -> int:
+        """
+        벡터 차원 (해싱 모드는 버킷 수로 고정, 아니면 어휘 크기)
+        
+        Args:
+            vocabulary: 키워드 → 열 인덱스
+            
+        Returns:
+            int: 열 개수
+        """
+        return self.hash_features or len(vocabulary)
+    
+    def _profile_columns(
+        self, profile: Dict[str, float],
+        vocabulary: Optional[Dict[str, int]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        키워드 프로필을 (열 인덱스, 가중치) 목록으로 변환
+        
+        해싱 모드에서는 같은 버킷에 들어간 키워드의 가중치를 합칩니다.
+        어휘 모드에서는 vocabulary에 없는 키워드를 새 열로 추가합니다.
+        
+        Args:
+            profile: {keyword: weight}
+            vocabulary: 키워드 → 열 인덱스 (어휘 모드에서 갱신됨)
+            
+        Returns:
+            List[Tuple[int, float]]: [(열 인덱스, 가중치), ...]
+        """
+        if self.hash_features:
+            buckets = defaultdict(float)
+            for keyword, weight in profile.items():
+                buckets[hash_keyword(keyword, self.hash_features)] += weight
+            return list(buckets.items())
+        
+        return [
+            (vocabulary.setdefault(keyword, len(vocabulary)), weight)
+            for keyword, weight in profile.items()
+        ]
+    
+    def build_product_matrix(self) -> csr_matrix:
+        """
+        상품 프로필을 L2 정규화된 CSR 행렬로 변환 (벡터화된 점수 계산용)
+        
+        Returns:
+            csr_matrix: (상품 수 x 키워드 수 또는 해시 버킷 수) 정규화 행렬
+        """
+        vocabulary = {}
+        indptr = [0]
+        indices = []
+        data = []
+        
+        product_ids = list(self.product_profiles.keys())
+        for product_id in product_ids:
+            for column, weight in self._profile_columns(
+                    self.product_profiles[product_id], vocabulary):
+                indices.append(column)
+                data.append(weight)
+            indptr.append(len(indices))
+        
+        matrix = csr_matrix(
+            (np.asarray(data, dtype=self._dtype), indices, indptr),
+            shape=(len(product_ids), self._n_columns(vocabulary))
+        )
+        
+        self.product_ids = product_ids
+        self.product_index = {pid: idx for idx, pid in enumerate(product_ids)}
+        self._row_lookup = None
+        self.vocabulary = vocabulary
+        self.keywords = list(vocabulary)
+        self.product_vectors = normalize(matrix)
+        self._has_profile = np.diff(matrix.indptr) > 0
+        # 어휘가 바뀌었으므로 기존 ANN 인덱스는 무효
+        self.ann_index = None
+        
+        return self.product_vectors
+    
+    def _update_product_rows(
+        self, updated_profiles: Dict[int, Dict[str, float]],
+        updated_counts: Optional[Dict[int, Dict[str, float]]] = None
+    ):
+        """
+        변경된 상품 행만 교체한 상품 행렬을 만들어 교체
+        
+        새 키워드는 열로(해싱 모드는 차원 고정), 새 상품은 행으로 추가하며
+        나머지 행은 그대로 둡니다. 변경된 행의 해시 코드가 달라지므로
+        ANN 인덱스는 무효화됩니다.
+        
+        Args:
+            updated_profiles: {product_id: 새 keyword_profile} (해싱 모드는 버킷 키)
+            updated_counts: {product_id: 새 원본 빈도} (컴팩트/해싱 모드의 빈도 행렬 갱신용)
+        """
+        vocabulary = dict(self.vocabulary)
+        product_ids = list(self.product_ids)
+        product_index = dict(self.product_index)
+        
+        rows, columns, values = [], [], []
+        for product_id, profile in updated_profiles.items():
+            idx = product_index.get(product_id)
+            if idx is None:
+                idx = len(product_ids)
+                product_ids.append(product_id)
+                product_index[product_id] = idx
+            
+            if self.hash_features:
+                entries = list(profile.items())
+            else:
+                entries = self._profile_columns(profile, vocabulary)
+            norm = np.sqrt(sum(w * w for _, w in entries))
+            for column, weight in entries:
+                rows.append(idx)
+                columns.append(column)
+                values.append(weight / norm)
+        
+        count_rows, count_columns, count_values = [], [], []
+        for product_id, keyword_freq in (updated_counts or {}).items():
+            for keyword, count in keyword_freq.items():
+                count_rows.append(product_index[product_id])
+                if self.hash_features:
+                    count_columns.append(keyword)
+                else:
+                    count_columns.append(
+                        vocabulary.setdefault(keyword, len(vocabulary))
+                    )
+                count_values.append(count)
+        
+        shape = (len(product_ids), self._n_columns(vocabulary))
+        changed_rows = np.array(
+            [product_index[pid] for pid in updated_profiles], dtype=np.int64
+        )
+        
+        has_profile = np.zeros(shape[0], dtype=bool)
+        has_profile[:len(self._has_profile)] = self._has_profile
+        has_profile[changed_rows] = [
+            bool(updated_profiles[pid]) for pid in updated_profiles
+        ]
+        
+        if updated_counts is not None:
+            self.product_count_matrix = _splice_rows(
+                self.product_count_matrix, shape, changed_rows,
+                count_rows, count_columns, count_values
+            )
+        
+        self.vocabulary = vocabulary
+        self.keywords = list(vocabulary)
+        self.product_ids = product_ids
+        self.product_index = product_index
+        self._row_lookup = None
+        self.product_vectors = _splice_rows(
+            self.product_vectors, shape, changed_rows, rows, columns, values
+        )
+        self._has_profile = has_profile
+        self.ann_index = None
+    
+    def build_ann_index(self, n_tables: int = 8,
+                        n_bits: Optional[int] = None) -> RandomProjectionLSH:
+        """
+        정규화된 상품 벡터 위에 근사 최근접 이웃(LSH) 인덱스 구축
+        
+        Args:
+            n_tables (int): 해시 테이블 개수
+            n_bits (int): 테이블당 해시 비트 수 (None이면 자동)
+            
+        Returns:
+            RandomProjectionLSH: 구축된 인덱스
+        """
+        if self.product_vectors is None:
+            self.build_product_matrix()
+        
+        self.ann_index = RandomProjectionLSH(n_tables=n_tables, n_bits=n_bits)
+        self.ann_index.fit(self.product_vectors)
+        
+        print(f"✓ ANN 인덱스 구축 완료 (테이블: {n_tables}개, "
+              f"비트: {self.ann_index.n_bits}개)")
+        
+        return self.ann_index
+    
+    def vectorize_profile(self, profile: Dict[str, float]) -> csr_matrix:
+        """
+        키워드 프로필을 상품 행렬과 같은 공간의 정규화된 희소 벡터로 변환
+        
+        상품 어휘에 없는 키워드는 내적에 기여하지 않지만 노름에는 포함되므로,
+        기존 calculate_similarity와 동일한 코사인 값을 얻기 위해
+        전체 프로필 노름으로 나눕니다. 해싱 모드에서는 모든 키워드가 버킷에
+        들어가므로 버킷 벡터의 노름으로 나눕니다.
+        
+        Args:
+            profile: {keyword: weight} 프로필
+            
+        Returns:
+            csr_matrix: (1 x 키워드 수 또는 해시 버킷 수) 벡터
+        """
+        return self.vectorize_profiles([profile])
+    
+    def vectorize_profiles(self, profiles: List[Dict[str, float]]) -> csr_matrix:
+        """
+        여러 키워드 프로필을 한 번에 정규화된 희소 행렬로 변환 (행마다 vectorize_profile과 동일)
+        
+        Args:
+            profiles: [{keyword: weight}, ...] 프로필 리스트
+            
+        Returns:
+            csr_matrix: (프로필 수 x 키워드 수 또는 해시 버킷 수) 행렬
+        """
+        rows, columns, values = [], [], []
+        for row, profile in enumerate(profiles):
+            if self.hash_features:
+                entries = self._profile_columns(profile)
+                norm = np.sqrt(sum(w * w for _, w in entries))
+            else:
+                norm = np.sqrt(sum(w * w for w in profile.values()))
+                entries = [
+                    (self.vocabulary[keyword], weight)
+                    for keyword, weight in profile.items() if keyword in self.vocabulary
+                ]
+            
+            for column, weight in entries:
+                rows.append(row)
+                columns.append(column)
+                values.append(weight / norm if norm > 0 else 0.0)
+        
+        return csr_matrix(
+            (np.asarray(values, dtype=self._dtype), (rows, columns)),
+            shape=(len(profiles), self._n_columns(self.vocabulary))
+        )
+    
+    def prepare_batch_scoring(self, exclude_purchased: bool = True):
+        """
+        배치 추천에 필요한 상품 행렬과 구매 인덱스가 없으면 생성
+        
+        Args:
+            exclude_purchased: 구매 인덱스도 준비할지 여부
+        """
+        if self.product_vectors is None:
+            if self.product_profiles:
+                self.build_product_matrix()
+            else:
+                self.build_all_product_profiles()
+        if exclude_purchased and self.purchase_index is None:
+            self.build_purchase_index()
     
-    def build_product_profile(self, product_id: int) -> Dict[str, float]:
+    def top_products_batch(
+        self, customer_ids: List[int], top_n: int = 5,
+        exclude_purchased: bool = True, engine: str = 'keyword'
+    ) -> Dict[int, List[Tuple[int, float]]]:
         """
-        상품 프로필 생성 (긍정 리뷰 기반)
+        여러 고객의 추천 상품을 행렬 곱 한 번으로 계산 (정확 계산, 상품 정보 조회 없음)
+        
+        고객 벡터를 블록 단위로 묶어 상품 행렬과 곱하므로 고객별로
+        recommend_products를 호출하는 것보다 훨씬 빠릅니다.
         
         Args:
-            product_id (int): 상품 ID
+            customer_ids: 고객 ID 리스트
+            top_n: 고객별 추천 상품 개수
+            exclude_purchased: 이미 리뷰 작성한 상품 제외 여부
+            engine: 추천 엔진 ('keyword' 또는 'als')
             
         Returns:
-            Dict[str, float]: {keyword: weight} 딕셔너리
+            Dict[int, List[Tuple[int, float]]]: {고객 ID: [(상품 ID, 점수), ...]}
+                (추천할 수 없는 고객은 빈 리스트)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if engine not in ENGINES:
+            raise ValueError(f"지원하지 않는 추천 엔진입니다: {engine}")
+        if engine == 'als':
+            return self._top_products_batch_latent(customer_ids, top_n,
+                                                   exclude_purchased)
         
-        # 상품의 긍정 리뷰 추출
-        query = """
-        SELECT review_text, rating
-        FROM reviews
-        WHERE product_id = ?
-        AND (rating >= 4 OR sentiment = 'Positive')
-        """
+        self.prepare_batch_scoring(exclude_purchased)
         
-        cursor.execute(query, (product_id,))
-        positive_reviews = cursor.fetchall()
+        profiles = self.build_customer_profiles(customer_ids)
+        results = {customer_id: [] for customer_id in profiles}
+        warm_ids = [customer_id for customer_id, profile in profiles.items() if profile]
         
-        conn.close()
+        n_products = len(self.product_ids)
+        n_select = min(top_n, n_products)
+        if n_select <= 0:
+            return results
         
-        # 키워드 빈도 계산
-        keyword_freq = defaultdict(int)
+        product_id_array = np.asarray(self.product_ids, dtype=np.int64)
+        block_size = max(1, SIMILARITY_BLOCK_ELEMENTS // max(n_products, 1))
         
-        for review_text, rating in positive_reviews:
-            keywords = self.cleaner.extract_keywords(review_text)
+        for start in range(0, len(warm_ids), block_size):
+            block = warm_ids[start:start + block_size]
+            vectors = self.vectorize_profiles([profiles[c] for c in block])
+            # 상품 행렬을 왼쪽에 두어 전치 복사 없이 CSR 그대로 곱함
+            scores = (self.product_vectors @ vectors.T).toarray().T
             
-            # 별점에 따라 가중치
-            weight = 1.5 if rating == 5 else 1.0
+            # 프로필 없는 상품과 구매한 상품 제외
+            scores[:, ~self._has_profile] = -np.inf
+            if exclude_purchased:
+                for row, customer_id in enumerate(block):
+                    purchased = self.purchase_index.get(customer_id)
+                    scores[row, self._product_rows(purchased)] = -np.inf
             
-            for keyword in keywords:
-                keyword_freq[keyword] += weight
-        
-        # 정규화
-        total = sum(keyword_freq.values())
-        if total > 0:
-            keyword_profile = {k: v / total for k, v in keyword_freq.items()}
-        else:
-            keyword_profile = {}
+            top, top_scores = top_k_rows(scores, n_select)
+            
+            for row, customer_id in enumerate(block):
+                valid = np.isfinite(top_scores[row])
+                results[customer_id] = list(zip(
+                    product_id_array[top[row][valid]].tolist(),
+                    top_scores[row][valid].tolist()
+                ))
         
-        return keyword_profile
+        return results
     
-    def build_all_product_profiles(self) -> Dict[int, Dict[str, float]]:
+    def _top_products_batch_latent(
+        self, customer_ids: List[int], top_n: int, exclude_purchased: bool
+    ) -> Dict[int, List[Tuple[int, float]]]:
         """
-        모든 상품의 프로필을 사전 계산
+        잠재 요인 엔진의 배치 추천 (학습 데이터에 있는 고객만, 나머지는 빈 리스트)
         
+        Args:
+            customer_ids: 고객 ID 리스트
+            top_n: 고객별 추천 상품 개수
+            exclude_purchased: 이미 리뷰 작성한 상품 제외 여부
+            
         Returns:
-            Dict[int, Dict[str, float]]: {product_id: keyword_profile}
+            Dict[int, List[Tuple[int, float]]]: {고객 ID: [(상품 ID, 점수), ...]}
         """
-        print("=" * 80)
-        print("전체 상품 프로필 생성 중...")
-        print("=" * 80)
+        if self.latent_model is None:
+            raise ValueError("잠재 요인 모델이 학습되지 않았습니다.")
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        model = self.latent_model
+        results = {customer_id: [] for customer_id in customer_ids}
+        known_ids = [c for c in results if c in model.customer_index]
+        n_select = min(top_n, len(model.product_ids))
+        if not known_ids or n_select <= 0:
+            return results
         
-        # 모든 상품 ID 가져오기
-        cursor.execute("SELECT product_id FROM products")
-        product_ids = [row[0] for row in cursor.fetchall()]
+        rows = np.array([model.customer_index[c] for c in known_ids], dtype=np.int64)
+        scores = self._latent_scores(model.customer_factors[rows], known_ids,
+                                     exclude_purchased)
         
-        conn.close()
+        top, top_scores = top_k_rows(scores, n_select)
+        
+        for row, customer_id in enumerate(known_ids):
+            valid = np.isfinite(top_scores[row])
+            results[customer_id] = list(zip(
+                model.product_ids[top[row][valid]].tolist(),
+                top_scores[row][valid].tolist()
+            ))
+        
+        return results
+    
+    def _select_top(self, scores: np.ndarray, candidates: np.ndarray,
+                    top_n: int) -> np.ndarray:
+        """
+        후보 중 점수 상위 N개의 인덱스를 내림차순으로 선택
+        
+        Args:
+            scores: 후보별 점수 (candidates와 같은 길이)
+            candidates: 상품 인덱스 배열
+            top_n: 선택 개수
+            
+        Returns:
+            np.ndarray: (candidates 내) 선택된 위치 배열
+        """
+        positions = np.arange(len(candidates))
+        if len(candidates) > top_n:
+            positions = np.argpartition(-scores, top_n - 1)[:top_n]
         
-        print(f"총 {len(product_ids)}개 상품 프로필 생성 시작...")
+        # 동점은 상품 순서대로 (기존 안정 정렬과 동일)
+        order = np.lexsort((candidates[positions], -scores[positions]))
+        return positions[order]
+    
+    def _select_diverse(self, scores: np.ndarray, candidates: np.ndarray, top_n: int,
+                        diversity: Optional[str], item_ids: np.ndarray,
+                        item_vectors) -> np.ndarray:
+        """
+        후보 중 상위 N개 선택 (diversity가 있으면 상위 풀을 다양성 재정렬)
         
-        product_profiles = {}
-        for idx, product_id in enumerate(product_ids, 1):
-            product_profiles[product_id] = self.build_product_profile(product_id)
+        Args:
+            scores: 후보별 점수 (candidates와 같은 길이)
+            candidates: 상품 인덱스 배열
+            top_n: 선택 개수
+            diversity: 'mmr', 'category' 또는 None
+            item_ids: 상품 인덱스 → 상품 ID 배열
+            item_vectors: 상품 인덱스별 벡터 (mmr 유사도 계산용, 희소/밀집)
             
-            if idx % 20 == 0:
-                print(f"  진행률: {idx}/{len(product_ids)} ({idx/len(product_ids)*100:.1f}%)")
+        Returns:
+            np.ndarray: (candidates 내) 선택된 위치 배열
+        """
+        if diversity is None:
+            return self._select_top(scores, candidates, top_n)
         
-        print(f"✓ {len(product_profiles)}개 상품 프로필 생성 완료")
+        pool = self._select_top(scores, candidates, max(DIVERSITY_POOL_SIZE, top_n))
+        rows = candidates[pool]
+        similarity = categories = None
+        if diversity == 'mmr':
+            # 후보 풀 내 코사인 유사도 부분 행렬 (풀 크기 x 풀 크기)
+            vectors = item_vectors[rows]
+            if hasattr(vectors, 'toarray'):
+                # 키워드 상품 행렬은 이미 L2 정규화됨
+                similarity = (vectors @ vectors.T).toarray()
+            else:
+                vectors = normalize(vectors)
+                similarity = vectors @ vectors.T
+        else:
+            categories = self.get_product_stats().category_codes_for(item_ids[rows])
         
-        self.product_profiles = product_profiles
-        return product_profiles
+        return pool[diversify(diversity, scores[pool], top_n, similarity, categories)]
     
     def calculate_similarity(self, customer_profile: Dict[str, float], 
                            product_profile: Dict[str, float]) -> float:
@@ -193,6 +1541,37 @@ class RecommendationSystem:
         
         return similarity
     
+    def build_purchase_index(self) -> PurchaseIndex:
+        """
+        고객 x 상품 구매 이력 인덱스 구축 (프로필과 같은 rowid 기준점까지)
+        
+        이후 신규 리뷰는 refresh_profiles_since에서 증분 반영됩니다.
+        
+        Returns:
+            PurchaseIndex: 구매 이력 인덱스
+        """
+        self.purchase_index = PurchaseIndex().build(self.db_path,
+                                                    self.last_review_rowid)
+        print(f"✓ 구매 이력 인덱스 생성 완료 (고객: {len(self.purchase_index)}명)")
+        return self.purchase_index
+    
+    def has_positive_reviews(self, customer_id: int) -> bool:
+        """
+        고객이 프로필에 반영되는 긍정 리뷰를 작성했는지 여부 (구매 이력 인덱스 조회)
+        
+        False이면 keyword 엔진의 고객 프로필이 비므로 바로 콜드 스타트 추천을 사용할 수 있습니다.
+        
+        Args:
+            customer_id (int): 고객 ID
+            
+        Returns:
+            bool: 긍정 리뷰 보유 여부
+        """
+        if self.purchase_index is None:
+            self.build_purchase_index()
+        
+        return self.purchase_index.has_positive(customer_id)
+    
     def get_purchased_products(self, customer_id: int) -> Set[int]:
         """
         고객이 이미 리뷰를 남긴 상품 ID 집합
@@ -203,23 +1582,163 @@ class RecommendationSystem:
         Returns:
             Set[int]: 구매(리뷰 작성) 상품 ID 집합
         """
-        conn = sqlite3.connect(self.db_path)
+        if self.purchase_index is None:
+            self.build_purchase_index()
+        
+        return {int(pid) for pid in self.purchase_index.get(customer_id)}
+    
+    def _product_rows(self, product_ids: np.ndarray) -> np.ndarray:
+        """
+        상품 ID 배열을 상품 행렬의 행 인덱스로 변환 (벡터화된 조회)
+        
+        Args:
+            product_ids: 상품 ID 배열
+            
+        Returns:
+            np.ndarray: 행 인덱스 배열 (행렬에 없는 상품은 제외)
+        """
+        if self._row_lookup is None:
+            # 상품 ID → 행 인덱스 조회 배열 (없는 ID는 -1)
+            id_array = np.asarray(self.product_ids, dtype=np.int64)
+            size = int(id_array.max()) + 1 if len(id_array) else 0
+            self._row_lookup = np.full(size, -1, dtype=np.int64)
+            self._row_lookup[id_array] = np.arange(len(id_array))
+        
+        product_ids = product_ids[product_ids < len(self._row_lookup)]
+        rows = self._row_lookup[product_ids]
+        return rows[rows >= 0]
+    
+    def train_latent_factors(self, n_factors: int = 32, regularization: float = 0.1,
+                             alpha: float = 2.0, iterations: int = 15) -> ImplicitALS:
+        """
+        고객 x 상품 별점 행렬로 잠재 요인(ALS) 모델 학습 (배치 작업용)
+        
+        프로필과 같은 rowid 기준점까지의 리뷰를 사용하며, 결과는 save_profiles로
+        아티팩트 번들에 함께 저장됩니다.
+        
+        Args:
+            n_factors (int): 잠재 요인 차원
+            regularization (float): L2 정규화 계수
+            alpha (float): 신뢰도 가중치
+            iterations (int): 반복 횟수
+            
+        Returns:
+            ImplicitALS: 학습된 모델
+        """
+        reviews, product_ids = load_interactions(self.db_path, self.last_review_rowid)
+        print(f"잠재 요인 모델 학습 중... (리뷰 {len(reviews)}개, k={n_factors})")
+        
+        model = ImplicitALS(
+            n_factors=n_factors, regularization=regularization,
+            alpha=alpha, iterations=iterations
+        ).fit(reviews, product_ids)
+        model.trained_rowid = self.last_review_rowid
+        self.latent_model = model
+        
+        print(f"✓ 잠재 요인 모델 학습 완료 (고객: {len(model.customer_ids)}명, "
+              f"상품: {len(model.product_ids)}개, {model.nbytes() / 1024 ** 2:.2f}MB)")
+        
+        return model
+    
+    def _latent_customer_vector(self, customer_id: int) -> Optional[np.ndarray]:
+        """
+        잠재 요인 고객 벡터 (학습 이후 리뷰를 남긴 고객은 fold-in으로 계산)
+        
+        Args:
+            customer_id (int): 고객 ID
+            
+        Returns:
+            np.ndarray: (k,) 고객 벡터 (리뷰가 없으면 None)
+        """
+        vector = self.latent_model.customer_vector(customer_id)
+        if vector is not None:
+            return vector
+        
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT DISTINCT product_id
+            SELECT product_id, rating, sentiment
             FROM reviews
             WHERE customer_id = ?
         """, (customer_id,))
+        reviews = cursor.fetchall()
+        
+        return self.latent_model.fold_in(reviews)
+    
+    def _latent_scores(self, customer_vectors: np.ndarray, customer_ids: List[int],
+                       exclude_purchased: bool) -> np.ndarray:
+        """
+        고객 벡터와 상품 요인 행렬의 내적 점수 (구매 상품은 -inf)
+        
+        Args:
+            customer_vectors: (고객 수 x k) 고객 벡터
+            customer_ids: 고객 ID 리스트 (구매 상품 제외용)
+            exclude_purchased: 이미 리뷰 작성한 상품 제외 여부
+            
+        Returns:
+            np.ndarray: (고객 수 x 모델 상품 수) 점수
+        """
+        scores = customer_vectors @ self.latent_model.product_factors.T
+        if exclude_purchased:
+            if self.purchase_index is None:
+                self.build_purchase_index()
+            for row, customer_id in enumerate(customer_ids):
+                purchased = self.purchase_index.get(customer_id)
+                scores[row, self.latent_model.product_rows(purchased)] = -np.inf
+        return scores
+    
+    def _recommend_latent(self, customer_id: int, top_n: int,
+                          exclude_purchased: bool,
+                          diversity: Optional[str] = None) -> List[Dict]:
+        """
+        잠재 요인 엔진 추천 (k차원 내적 한 번)
+        
+        Args:
+            customer_id (int): 고객 ID
+            top_n (int): 추천할 상품 개수
+            exclude_purchased (bool): 이미 리뷰 작성한 상품 제외 여부
+            diversity (str): 다양성 재정렬 방식 (mmr은 잠재 요인 코사인 유사도 사용)
+            
+        Returns:
+            List[Dict]: 추천 상품 리스트 (similarity_score는 내적 점수)
+        """
+        if self.latent_model is None:
+            raise ValueError("잠재 요인 모델이 학습되지 않았습니다. "
+                             "python -m src.latent_factors 를 먼저 실행하세요.")
+        
+        with stage_timer('profile'):
+            vector = self._latent_customer_vector(customer_id)
+        if vector is None:
+            print("⚠️  고객의 리뷰가 없어 추천할 수 없습니다.")
+            return []
         
-        purchased = {row[0] for row in cursor.fetchall()}
+        with stage_timer('scoring'):
+            scores = self._latent_scores(vector[np.newaxis, :], [customer_id],
+                                         exclude_purchased)[0]
+            candidates = np.flatnonzero(np.isfinite(scores))
+            model = self.latent_model
+            selected = self._select_diverse(scores[candidates], candidates, top_n,
+                                            diversity, model.product_ids,
+                                            model.product_factors)
         
-        conn.close()
+        with stage_timer('enrichment'):
+            recommendations = self._enrich_products([
+                (int(model.product_ids[candidates[pos]]),
+                 float(scores[candidates[pos]]))
+                for pos in selected
+            ])
+        print(f"✓ 추천 완료 (잠재 요인): {len(recommendations)}개 상품")
         
-        return purchased
+        return recommendations
     
+    @timed_operation('recommend')
     def recommend_products(self, customer_id: int, top_n: int = 5, 
-                          exclude_purchased: bool = True) -> List[Dict]:
+                          exclude_purchased: bool = True,
+                          use_ann: Optional[bool] = None,
+                          ann_probes: int = DEFAULT_ANN_PROBES,
+                          engine: str = 'keyword',
+                          diversity: Optional[str] = None) -> List[Dict]:
         """
         고객에게 상품 추천
         
@@ -227,14 +1746,30 @@ class RecommendationSystem:
             customer_id (int): 고객 ID
             top_n (int): 추천할 상품 개수
             exclude_purchased (bool): 이미 리뷰 작성한 상품 제외 여부
+            use_ann (bool): ANN 인덱스 사용 여부
+                (None이면 상품 수가 ANN_MIN_CATALOG 이상일 때만 사용)
+            ann_probes (int): ANN 조회 시 테이블당 추가 탐색 버킷 수
+                (클수록 재현율이 높아지고 느려짐)
+            engine (str): 추천 엔진 ('keyword' 또는 'als')
+            diversity (str): 다양성 재정렬 방식 ('mmr', 'category', None이면 점수 순)
+                점수 상위 DIVERSITY_POOL_SIZE개 후보 풀에서 최종 상품을 고릅니다.
             
         Returns:
             List[Dict]: 추천 상품 리스트
         """
+        if engine not in ENGINES:
+            raise ValueError(f"지원하지 않는 추천 엔진입니다: {engine}")
+        if diversity is not None and diversity not in DIVERSITY_MODES:
+            raise ValueError(f"지원하지 않는 다양성 방식입니다: {diversity}")
+        
         print(f"\n{'=' * 80}")
         print(f"고객 ID {customer_id}에게 상품 추천")
         print(f"{'=' * 80}")
         
+        if engine == 'als':
+            return self._recommend_latent(customer_id, top_n, exclude_purchased,
+                                          diversity)
+        
         # 고객 프로필 생성
         customer_profile = self.build_customer_profile(customer_id)
         
@@ -244,84 +1779,399 @@ class RecommendationSystem:
         
         print(f"✓ 고객 프로필 생성 완료 (키워드: {len(customer_profile)}개)")
         
-        # 이미 구매한 상품 제외
-        purchased_products = self.get_purchased_products(customer_id) if exclude_purchased else set()
-        
         # 전체 상품 프로필이 없으면 생성
-        if not self.product_profiles:
-            self.build_all_product_profiles()
+        if self.product_vectors is None:
+            if self.product_profiles:
+                self.build_product_matrix()
+            else:
+                self.build_all_product_profiles()
+        
+        if exclude_purchased and self.purchase_index is None:
+            self.build_purchase_index()
+        if use_ann is None:
+            use_ann = len(self.product_ids) >= ANN_MIN_CATALOG
+        if use_ann and self.ann_index is None:
+            self.build_ann_index()
         
         # 유사도 계산
         print(f"유사도 계산 중...")
-        similarities = []
-        
-        for product_id, product_profile in self.product_profiles.items():
-            # 이미 구매한 상품은 제외
-            if product_id in purchased_products:
-                continue
+        with stage_timer('scoring'):
+            # 추천 후보 마스크 (프로필이 있고 구매하지 않은 상품)
+            allowed = self._has_profile.copy()
+            if exclude_purchased:
+                purchased = self.purchase_index.get(customer_id)
+                allowed[self._product_rows(purchased)] = False
             
-            # 상품에 프로필이 없으면 스킵 (리뷰가 없는 상품)
-            if not product_profile:
-                continue
+            customer_vector = self.vectorize_profile(customer_profile)
+            
+            candidates = None
+            if use_ann:
+                candidates = self.ann_index.query(customer_vector, n_probes=ann_probes)
+                candidates = candidates[allowed[candidates]]
+                # 후보가 부족하면 정확 계산으로 대체
+                if len(candidates) < top_n:
+                    candidates = None
+            
+            if candidates is None:
+                # 정확 계산: 전체 상품과 한 번의 희소 행렬-벡터 곱
+                candidates = np.flatnonzero(allowed)
+                all_scores = (self.product_vectors @ customer_vector.T).toarray()
+                scores = all_scores.ravel()[candidates]
+            else:
+                candidate_vectors = self.product_vectors[candidates]
+                scores = (candidate_vectors @ customer_vector.T).toarray().ravel()
             
-            similarity = self.calculate_similarity(customer_profile, product_profile)
-            similarities.append((product_id, similarity))
+            # 상위 N개 추천 (다양성 재정렬 시 상위 후보 풀에서 선택)
+            selected = self._select_diverse(
+                scores, candidates, top_n, diversity,
+                np.asarray(self.product_ids, dtype=np.int64), self.product_vectors
+            )
+            top_recommendations = [
+                (self.product_ids[candidates[pos]], float(scores[pos]))
+                for pos in selected
+            ]
+        
+        # 상품 정보 조회 (사전 집계된 상품 통계 배열에서 조회)
+        with stage_timer('enrichment'):
+            recommendations = self._enrich_products(top_recommendations)
+        
+        print(f"✓ 추천 완료: {len(recommendations)}개 상품")
+        
+        return recommendations
+    
+    def get_customer_segment(self, customer_id: int) -> Tuple[str, str]:
+        """
+        고객의 세그먼트(연령대, 성별) 조회
         
-        # 유사도 기준 정렬
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        사전 적재된 매핑에 없는 (이후 가입한) 고객은 customers 테이블에서 조회하고,
+        그래도 없으면 전체 세그먼트를 반환합니다.
         
-        # 상위 N개 추천
-        top_recommendations = similarities[:top_n]
+        Args:
+            customer_id (int): 고객 ID
+            
+        Returns:
+            Tuple[str, str]: (age_group, gender)
+        """
+        segment = self.customer_segments.get(customer_id)
+        if segment is not None:
+            return segment
         
-        # 상품 정보 조회
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
         
-        recommendations = []
-        for product_id, similarity_score in top_recommendations:
-            cursor.execute("""
-                SELECT product_name, category, 
-                       (SELECT AVG(rating) FROM reviews WHERE product_id = ?) as avg_rating,
-                       (SELECT COUNT(*) FROM reviews WHERE product_id = ?) as review_count
-                FROM products
-                WHERE product_id = ?
-            """, (product_id, product_id, product_id))
-            
-            result = cursor.fetchone()
-            if result:
-                product_name, category, avg_rating, review_count = result
+        cursor.execute("""
+            SELECT age_group, gender
+            FROM customers
+            WHERE customer_id = ?
+        """, (customer_id,))
+        row = cursor.fetchone()
+        
+        return (row[0], row[1]) if row else ALL_SEGMENT
+    
+    def recommend_cold_start(self, customer_id: int, top_n: int = 5,
+                             exclude_purchased: bool = True) -> List[Dict]:
+        """
+        긍정 리뷰가 없는 고객을 위한 세그먼트 기반 추천 (사전 계산된 목록 조회)
+        
+        고객의 연령대/성별 세그먼트 목록을 사용하며, 세그먼트 목록이 없으면
+        전체 세그먼트 목록으로 대체합니다.
+        
+        Args:
+            customer_id (int): 고객 ID
+            top_n (int): 추천할 상품 개수 (최대 SEGMENT_TOP_K)
+            exclude_purchased (bool): 이미 리뷰 작성한 상품 제외 여부
+            
+        Returns:
+            List[Dict]: 추천 상품 리스트 (similarity_score는 세그먼트 프로필과의 유사도)
+        """
+        segment = self.get_customer_segment(customer_id)
+        scored = self._cold_start_scored(customer_id, top_n, exclude_purchased)
+        print(f"✓ 콜드 스타트 추천: 세그먼트 {segment[0]}/{segment[1]} ({len(scored)}개 상품)")
+        
+        return self._enrich_products(scored)
+    
+    def _cold_start_scored(self, customer_id: int, top_n: int,
+                           exclude_purchased: bool) -> List[Tuple[int, float]]:
+        """
+        고객 세그먼트의 사전 계산된 목록에서 (상품 ID, 점수) 선택
+        
+        Args:
+            customer_id (int): 고객 ID
+            top_n (int): 추천할 상품 개수
+            exclude_purchased (bool): 이미 리뷰 작성한 상품 제외 여부
+            
+        Returns:
+            List[Tuple[int, float]]: [(product_id, score), ...]
+        """
+        if self.segment_product_ids is None:
+            self.build_segment_recommendations()
+        
+        segment = self.get_customer_segment(customer_id)
+        row = self.segment_index.get(segment, self.segment_index.get(ALL_SEGMENT))
+        if row is None:
+            return []
+        
+        product_ids = self.segment_product_ids[row]
+        valid = product_ids >= 0
+        if exclude_purchased:
+            if self.purchase_index is None:
+                self.build_purchase_index()
+            valid &= ~np.isin(product_ids, self.purchase_index.get(customer_id))
+        
+        selected = np.flatnonzero(valid)[:top_n]
+        return [(int(product_ids[pos]), float(self.segment_scores[row, pos]))
+                for pos in selected]
+    
+    def recommend_products_batch(
+        self, customer_ids: List[int], top_n: int = 5,
+        exclude_purchased: bool = True, engine: str = 'keyword'
+    ) -> Dict[int, Tuple[List[Dict], str]]:
+        """
+        여러 고객의 추천 상품을 한 번에 계산 (배치 API용)
+        
+        전체 고객을 top_products_batch의 희소 행렬 곱으로 점수 계산하고,
+        추천된 상품들의 정보/통계/주요 키워드는 고유 상품당 한 번만 조회합니다.
+        추천할 수 없는 고객(긍정 리뷰 없음, ALS 학습 이후 고객)은 세그먼트 추천으로 대체합니다.
+        
+        Args:
+            customer_ids: 고객 ID 리스트
+            top_n: 고객별 추천 상품 개수
+            exclude_purchased: 이미 리뷰 작성한 상품 제외 여부
+            engine: 추천 엔진 ('keyword' 또는 'als')
+            
+        Returns:
+            Dict[int, Tuple[List[Dict], str]]: {customer_id: (추천 상품 리스트, 추천 전략)}
+                추천 전략은 'personalized' 또는 'segment'
+        """
+        scored = self.top_products_batch(customer_ids, top_n, exclude_purchased, engine)
+        
+        strategies = {}
+        for customer_id in customer_ids:
+            if scored.get(customer_id):
+                strategies[customer_id] = 'personalized'
+            else:
+                scored[customer_id] = self._cold_start_scored(customer_id, top_n,
+                                                              exclude_purchased)
+                strategies[customer_id] = 'segment'
+        
+        # 추천된 고유 상품의 정보를 한 번만 조회
+        unique_ids = sorted({pid for items in scored.values() for pid, _ in items})
+        product_info = {
+            item['product_id']: item
+            for item in self._enrich_products([(pid, 0.0) for pid in unique_ids])
+        }
+        
+        return {
+            customer_id: (
+                [
+                    {**product_info[pid], 'similarity_score': round(score, 4)}
+                    for pid, score in scored[customer_id] if pid in product_info
+                ],
+                strategies[customer_id]
+            )
+            for customer_id in customer_ids
+        }
+    
+    def _enrich_products(self, scored_products: List[Tuple[int, float]]) -> List[Dict]:
+        """
+        (상품 ID, 유사도) 목록에 상품 정보/통계/주요 키워드를 붙여 응답 형태로 변환
+        
+        해싱 모드에서는 top_keywords가 항상 빈 리스트입니다.
+        
+        Args:
+            scored_products: [(product_id, similarity_score), ...]
+            
+        Returns:
+            List[Dict]: 상품 정보 리스트
+        """
+        product_stats = self.get_product_stats()
+        
+        results = []
+        for product_id, similarity_score in scored_products:
+            stats = product_stats.get(product_id)
+            if stats:
+                avg_rating = stats['average_rating']
                 
-                # 상품 주요 키워드
-                product_keywords = sorted(
-                    self.product_profiles[product_id].items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:5]
+                # 상품 주요 키워드 (해싱 모드는 키워드를 복원할 수 없어 빈 리스트)
+                product_keywords = []
+                if self.keyword_profiles_available:
+                    product_keywords = sorted(
+                        (self.get_product_profile(product_id) or {}).items(),
+                        key=lambda x: x[1],
+                        reverse=True
+                    )[:5]
                 
-                recommendations.append({
+                results.append({
                     'product_id': product_id,
-                    'product_name': product_name,
-                    'category': category,
+                    'product_name': stats['product_name'],
+                    'category': stats['category'],
                     'similarity_score': round(similarity_score, 4),
                     'average_rating': round(avg_rating, 2) if avg_rating else 0,
-                    'review_count': review_count,
+                    'review_count': stats['review_count'],
                     'top_keywords': [
                         {'keyword': k, 'weight': round(w, 4)} 
                         for k, w in product_keywords
                     ]
                 })
         
-        conn.close()
+        return results
+    
+    def _compute_neighbours(self, rows: np.ndarray,
+                            k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        주어진 상품 행들의 상위 K개 유사 상품(코사인) 계산
         
-        print(f"✓ 추천 완료: {len(recommendations)}개 상품")
+        유사도 행렬 전체를 만들지 않고 SIMILARITY_BLOCK_ELEMENTS 크기의
+        dense 블록 단위로 계산하여 메모리를 일정하게 유지합니다.
         
-        return recommendations
+        Args:
+            rows: 상품 행 인덱스 배열
+            k: 이웃 수
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (이웃 상품 ID, 유사도) 배열, 각 (행 수 x k).
+                이웃이 k개보다 적으면 ID -1, 유사도 0으로 채움
+        """
+        n_products = len(self.product_ids)
+        neighbour_ids = np.full((len(rows), k), -1, dtype=np.int64)
+        neighbour_scores = np.zeros((len(rows), k), dtype=np.float32)
+        
+        n_candidates = min(k, n_products - 1)
+        if n_candidates <= 0:
+            return neighbour_ids, neighbour_scores
+        
+        product_id_array = np.asarray(self.product_ids, dtype=np.int64)
+        block_rows = max(1, SIMILARITY_BLOCK_ELEMENTS // n_products)
+        
+        for start in range(0, len(rows), block_rows):
+            block = rows[start:start + block_rows]
+            sims = (self.product_vectors[block] @ self.product_vectors.T).toarray()
+            sims = sims.astype(np.float32)
+            
+            # 자기 자신과 프로필 없는 상품 제외
+            sims[np.arange(len(block)), block] = -np.inf
+            sims[:, ~self._has_profile] = -np.inf
+            
+            top = np.argpartition(-sims, n_candidates - 1, axis=1)[:, :n_candidates]
+            top_scores = np.take_along_axis(sims, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind='stable')
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            
+            # 유사도가 0 이하인 상품은 이웃으로 보지 않음
+            valid = top_scores > 0
+            end = start + len(block)
+            neighbour_ids[start:end, :n_candidates] = np.where(
+                valid, product_id_array[top], -1
+            )
+            neighbour_scores[start:end, :n_candidates] = np.where(
+                valid, top_scores, 0.0
+            )
+        
+        return neighbour_ids, neighbour_scores
+    
+    def build_similar_products(self, k: int = SIMILAR_TOP_K) -> np.ndarray:
+        """
+        전체 상품의 상위 K개 유사 상품(아이템-아이템 이웃) 목록 사전 계산
+        
+        Args:
+            k (int): 상품별 이웃 수
+            
+        Returns:
+            np.ndarray: (상품 수 x k) 이웃 상품 ID 배열 (product_ids 순서)
+        """
+        if self.product_vectors is None:
+            self.build_product_matrix()
+        
+        print(f"상품별 유사 상품 Top {k} 계산 중...")
+        rows = np.arange(len(self.product_ids))
+        self.similar_product_ids, self.similar_scores = self._compute_neighbours(
+            rows, k
+        )
+        print(f"✓ {len(rows)}개 상품의 유사 상품 목록 생성 완료")
+        
+        return self.similar_product_ids
+    
+    def _update_similar_rows(self, product_ids: List[int]):
+        """
+        프로필이 바뀐 상품의 이웃 목록만 다시 계산 (새 상품은 행 추가)
+        
+        다른 상품의 이웃 목록은 다음 build_similar_products 때 갱신됩니다.
+        
+        Args:
+            product_ids: 변경된 상품 ID 리스트
+        """
+        if self.similar_product_ids is None:
+            return
+        
+        k = self.similar_product_ids.shape[1]
+        n_missing = len(self.product_ids) - len(self.similar_product_ids)
+        if n_missing > 0:
+            self.similar_product_ids = np.vstack([
+                self.similar_product_ids,
+                np.full((n_missing, k), -1, dtype=np.int64)
+            ])
+            self.similar_scores = np.vstack([
+                self.similar_scores, np.zeros((n_missing, k), dtype=np.float32)
+            ])
+        
+        rows = np.array([self.product_index[pid] for pid in product_ids],
+                        dtype=np.int64)
+        neighbour_ids, neighbour_scores = self._compute_neighbours(rows, k)
+        self.similar_product_ids[rows] = neighbour_ids
+        self.similar_scores[rows] = neighbour_scores
+    
+    def get_similar_products(self, product_id: int, top_n: int = 10) -> List[Dict]:
+        """
+        사전 계산된 이웃 목록에서 유사 상품 조회 (O(K))
+        
+        Args:
+            product_id (int): 기준 상품 ID
+            top_n (int): 반환할 유사 상품 개수 (최대 K)
+            
+        Returns:
+            List[Dict]: 유사 상품 리스트 (상품이 없거나 이웃이 없으면 빈 리스트)
+        """
+        if self.similar_product_ids is None:
+            self.build_similar_products()
+        
+        idx = self.product_index.get(product_id)
+        if idx is None:
+            return []
+        
+        neighbours = [
+            (int(pid), float(score))
+            for pid, score in zip(self.similar_product_ids[idx, :top_n],
+                                  self.similar_scores[idx, :top_n])
+            if pid >= 0
+        ]
+        
+        return self._enrich_products(neighbours)
+    
+    def _profile_settings(self) -> Dict:
+        """
+        저장된 프로필을 재사용할 수 있는지 판단하는 프로필 생성 설정
+        
+        Returns:
+            Dict: 가중치 방식/컴팩트 모드/어휘 가지치기 설정
+        """
+        return {
+            'weighting': self.weighting,
+            'compact': self.compact,
+            'min_df': self.min_df,
+            'max_features': self.max_features,
+            'profile_top_k': self.profile_top_k,
+            'hash_features': self.hash_features,
+        }
     
     def save_profiles(self, customer_profile_path: str = 'cache/customer_profiles.pkl',
                      product_profile_path: str = 'cache/product_profiles.pkl'):
         """
         프로필을 파일로 저장 (캐싱)
         
+        상품 프로필과 함께 가중치 방식, 학습된 TF-IDF 벡터라이저를
+        하나의 아티팩트 번들로 저장합니다.
+        
         Args:
             customer_profile_path: 고객 프로필 저장 경로
             product_profile_path: 상품 프로필 저장 경로
@@ -329,9 +2179,40 @@ class RecommendationSystem:
         import os
         os.makedirs('cache', exist_ok=True)
         
-        # 상품 프로필 저장
-        with open(product_profile_path, 'wb') as f:
-            pickle.dump(self.product_profiles, f)
+        artifacts = {
+            'format_version': ARTIFACT_VERSION,
+            'weighting': self.weighting,
+            'settings': self._profile_settings(),
+            'product_profiles': self.product_profiles,
+            'product_counts': self.product_counts,
+            'last_review_rowid': self.last_review_rowid,
+            'vectorizer': self.vectorizer,
+            'kept_keywords': self._kept_keywords,
+            'similar_product_ids': self.similar_product_ids,
+            'similar_scores': self.similar_scores,
+            'purchase_index': self.purchase_index,
+            'customer_segments': self.customer_segments,
+            'segment_profiles': self.segment_profiles,
+            'segment_product_ids': self.segment_product_ids,
+            'segment_scores': self.segment_scores,
+            'latent_model': self.latent_model,
+        }
+        # 컴팩트/해싱 모드는 딕셔너리 대신 행렬 자체를 저장
+        if self._matrix_profiles:
+            artifacts.update({
+                'product_ids': self.product_ids,
+                'keywords': self.keywords,
+                'product_vectors': self.product_vectors,
+                'product_count_matrix': self.product_count_matrix,
+            })
+        
+        # 상품 프로필 저장 (임시 파일에 쓴 뒤 교체하여 다른 프로세스가
+        # 쓰는 도중의 파일을 읽지 않도록 함)
+        tmp_path = f"{product_profile_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(artifacts, f)
+        os.replace(tmp_path, product_profile_path)
+        self.format_version = ARTIFACT_VERSION
         
         print(f"✓ 상품 프로필 저장: {product_profile_path}")
     
@@ -339,6 +2220,9 @@ class RecommendationSystem:
         """
         저장된 프로필 로드
         
+        저장된 포맷 버전(ARTIFACT_VERSION)이나 가중치 방식/생성 설정이 현재와 다르면
+        프로필을 새로 생성합니다.
+        
         Args:
             product_profile_path: 상품 프로필 파일 경로
         """
@@ -346,25 +2230,115 @@ class RecommendationSystem:
         
         if os.path.exists(product_profile_path):
             with open(product_profile_path, 'rb') as f:
-                self.product_profiles = pickle.load(f)
-            print(f"✓ 상품 프로필 로드: {len(self.product_profiles)}개")
+                artifacts = pickle.load(f)
+            
+            # 포맷 버전이 다른 캐시는 구조를 해석하지 않고 새로 생성
+            # (버전 정보가 없는 최초 포맷 {product_id: profile} 딕셔너리 포함)
+            format_version = artifacts.get('format_version')
+            if format_version != ARTIFACT_VERSION:
+                print(f"⚠️  저장된 프로필의 포맷 버전({format_version})이 "
+                      f"현재 버전({ARTIFACT_VERSION})과 다릅니다. 새로 생성합니다.")
+                self.build_all_product_profiles()
+                return
+            
+            if artifacts['weighting'] != self.weighting:
+                print(f"⚠️  저장된 프로필의 가중치 방식({artifacts['weighting']})이 "
+                      f"현재 설정({self.weighting})과 다릅니다. 새로 생성합니다.")
+                self.build_all_product_profiles()
+                return
+            
+            if artifacts['settings'] != self._profile_settings():
+                print(f"⚠️  저장된 프로필의 생성 설정이 현재 설정과 다릅니다. 새로 생성합니다.")
+                self.build_all_product_profiles()
+                return
+            
+            self.format_version = format_version
+            self.product_profiles = artifacts['product_profiles']
+            self.vectorizer = artifacts['vectorizer']
+            self._kept_keywords = artifacts['kept_keywords']
+            self.product_counts = artifacts['product_counts']
+            self.last_review_rowid = artifacts['last_review_rowid']
+            # 유사 상품/세그먼트 목록과 구매 이력 인덱스는 없으면(None) 나중에 계산
+            self.similar_product_ids = artifacts['similar_product_ids']
+            self.similar_scores = artifacts['similar_scores']
+            self.purchase_index = artifacts['purchase_index']
+            self.customer_segments = artifacts['customer_segments']
+            self.segment_profiles = artifacts['segment_profiles']
+            self.segment_index = {
+                key: idx for idx, key in enumerate(sorted(self.segment_profiles))
+            }
+            self.segment_product_ids = artifacts['segment_product_ids']
+            self.segment_scores = artifacts['segment_scores']
+            # 잠재 요인 모델은 별도 배치 작업으로 학습됨 (없으면 keyword 엔진만 사용)
+            self.latent_model = artifacts['latent_model']
+            
+            if self._matrix_profiles:
+                self.product_ids = artifacts['product_ids']
+                self.product_index = {
+                    pid: idx for idx, pid in enumerate(self.product_ids)
+                }
+                self._row_lookup = None
+                self.keywords = artifacts['keywords']
+                self.vocabulary = {k: idx for idx, k in enumerate(self.keywords)}
+                self.product_vectors = artifacts['product_vectors']
+                self.product_count_matrix = artifacts['product_count_matrix']
+                self._has_profile = np.diff(self.product_vectors.indptr) > 0
+                self.ann_index = None
+            else:
+                self.build_product_matrix()
+            print(f"✓ 상품 프로필 로드: {len(self.product_ids)}개")
         else:
             print("⚠️  저장된 프로필이 없습니다. 새로 생성합니다.")
             self.build_all_product_profiles()
 
 
+def create_recommender_from_env(
+    db_path: str = REVIEW_DB_PATH
+) -> RecommendationSystem:
+    """
+    환경변수 설정으로 추천 시스템 생성
+    
+    RECOMMENDER_WEIGHTING, RECOMMENDER_COMPACT, RECOMMENDER_MIN_DF,
+    RECOMMENDER_MAX_FEATURES, RECOMMENDER_PROFILE_TOP_K,
+    RECOMMENDER_HASH_FEATURES 를 읽습니다.
+    
+    Args:
+        db_path (str): 데이터베이스 파일 경로
+        
+    Returns:
+        RecommendationSystem: 추천 시스템
+    """
+    max_features = os.getenv('RECOMMENDER_MAX_FEATURES')
+    profile_top_k = os.getenv('RECOMMENDER_PROFILE_TOP_K')
+    hash_features = os.getenv('RECOMMENDER_HASH_FEATURES')
+    compact = os.getenv('RECOMMENDER_COMPACT', 'false').lower() in ('1', 'true', 'yes')
+    
+    return RecommendationSystem(
+        db_path=db_path,
+        weighting=os.getenv('RECOMMENDER_WEIGHTING', 'frequency'),
+        compact=compact,
+        min_df=int(os.getenv('RECOMMENDER_MIN_DF', '1')),
+        max_features=int(max_features) if max_features else None,
+        profile_top_k=int(profile_top_k) if profile_top_k else None,
+        hash_features=int(hash_features) if hash_features else None,
+    )
+
+
 def main():
     """메인 실행 함수"""
     print("=" * 80)
     print("추천 시스템 기초 구축 (Phase 3)")
     print("=" * 80)
     
-    # 추천 시스템 초기화
-    recommender = RecommendationSystem()
+    # 추천 시스템 초기화 (가중치 방식/컴팩트 모드는 환경변수로 선택)
+    recommender = create_recommender_from_env()
     
     # 전체 상품 프로필 생성
     recommender.build_all_product_profiles()
     
+    # 상품별 유사 상품 목록 사전 계산
+    recommender.build_similar_products()
+    
     # 프로필 저장
     recommender.save_profiles()
     
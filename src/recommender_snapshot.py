@@ -0,0 +1,197 @@
+"""
+추천 시스템 스냅샷 모듈
+
+API 서버가 사용하는 추천 시스템을 버전이 붙은 읽기 전용 스냅샷으로 관리합니다.
+갱신은 현재 스냅샷의 사본(또는 새로 저장된 아티팩트)으로 다음 스냅샷을 만든 뒤
+참조 하나만 교체하는 방식(read-copy-update)으로 이루어지므로, 진행 중인 요청은
+시작할 때 잡은 이전 스냅샷으로 끝까지 처리됩니다.
+"""
+import os
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from src.recommendation_system import (
+    PROFILES_REBUILT, RecommendationSystem, create_recommender_from_env
+)
+
+
+class RecommenderSnapshot:
+    """버전이 붙은 읽기 전용 추천 시스템 스냅샷 클래스"""
+
+    def __init__(self, recommender: RecommendationSystem, version: int, source: str):
+        """
+        RecommenderSnapshot 초기화
+
+        Args:
+            recommender (RecommendationSystem): 스냅샷으로 고정할 추천 시스템
+            version (int): 스냅샷 버전 (프로세스 내에서 단조 증가)
+            source (str): 생성 경로 ('build', 'artifact', 'incremental')
+        """
+        self.recommender = recommender
+        self.version = version
+        self.source = source
+        self.created_at = datetime.now().isoformat()
+        self.last_review_rowid = recommender.last_review_rowid
+
+    def info(self) -> Dict:
+        """
+        스냅샷 메타데이터 (헬스 체크 응답용)
+
+        Returns:
+            Dict: 버전, 생성 경로, 생성 시각, 반영된 마지막 리뷰 rowid
+        """
+        return {
+            'version': self.version,
+            'source': self.source,
+            'created_at': self.created_at,
+            'last_review_rowid': self.last_review_rowid,
+        }
+
+
+class SnapshotManager:
+    """추천 시스템 스냅샷을 만들고 원자적으로 교체하는 클래스"""
+
+    def __init__(self, factory: Callable[[], RecommendationSystem] = (
+                     create_recommender_from_env
+                 ),
+                 artifact_path: str = 'cache/product_profiles.pkl'):
+        """
+        SnapshotManager 초기화
+
+        Args:
+            factory: 빈 추천 시스템을 만드는 함수 (설정 적용)
+            artifact_path (str): 프로필 아티팩트 번들 경로
+        """
+        self.factory = factory
+        self.artifact_path = artifact_path
+        self._current = None
+        self._version = 0
+        self._artifact_mtime = None
+        # 스냅샷 생성(쓰기)만 직렬화하며, 읽기는 잠금 없이 current 참조만 가져감
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> Optional[RecommenderSnapshot]:
+        """현재 활성 스냅샷 (요청은 시작 시 한 번만 읽어 끝까지 사용)"""
+        return self._current
+
+    def _read_artifact_mtime(self) -> Optional[float]:
+        """아티팩트 파일 수정 시각 (없으면 None)"""
+        try:
+            return os.path.getmtime(self.artifact_path)
+        except OSError:
+            return None
+
+    def _publish(self, recommender: RecommendationSystem,
+                 source: str) -> RecommenderSnapshot:
+        """
+        새 스냅샷을 만들고 참조를 교체
+
+        Args:
+            recommender (RecommendationSystem): 준비가 끝난 추천 시스템
+            source (str): 생성 경로
+
+        Returns:
+            RecommenderSnapshot: 새 활성 스냅샷
+        """
+        self._version += 1
+        snapshot = RecommenderSnapshot(recommender, self._version, source)
+        self._current = snapshot
+        print(f"✓ 추천 스냅샷 v{snapshot.version} 활성화 ({source}, "
+              f"rowid ≤ {snapshot.last_review_rowid})")
+        return snapshot
+
+    def _load_from_artifacts(self) -> RecommendationSystem:
+        """
+        아티팩트 번들에서 추천 시스템을 새로 로드 (없거나 설정이 다르면 생성 후 저장)
+
+        Returns:
+            RecommendationSystem: 유사 상품 목록까지 준비된 추천 시스템
+        """
+        recommender = self.factory()
+        needs_save = False
+
+        if os.path.exists(self.artifact_path):
+            recommender.load_profiles(self.artifact_path)
+            print("✓ 상품 프로필 캐시 로드 완료")
+            # 증분 갱신 정보(원본 빈도, rowid)가 없는 이전 포맷 캐시는 한 번 재생성하여 저장
+            if not recommender.supports_incremental_refresh():
+                print("⚠️  캐시에 증분 갱신 정보가 없습니다. 상품 프로필을 새로 생성합니다...")
+                recommender.build_all_product_profiles()
+                needs_save = True
+        else:
+            print("⚠️  캐시가 없습니다. 상품 프로필을 새로 생성합니다...")
+            recommender.build_all_product_profiles()
+            needs_save = True
+
+        self._complete_and_save(recommender, needs_save)
+        return recommender
+
+    def _complete_and_save(self, recommender: RecommendationSystem, needs_save: bool):
+        """
+        캐시에 없는 유사 상품/세그먼트 추천 목록을 계산하고, 새로 만든 부분이 있으면 아티팩트 저장
+
+        Args:
+            recommender (RecommendationSystem): 프로필이 준비된 추천 시스템
+            needs_save (bool): 프로필을 새로 생성했는지 여부
+        """
+        # 유사 상품 목록이 캐시에 없으면 계산
+        if recommender.similar_product_ids is None:
+            recommender.build_similar_products()
+            needs_save = True
+
+        # 세그먼트별 콜드 스타트 추천 목록이 캐시에 없으면 계산
+        if recommender.segment_product_ids is None:
+            recommender.build_segment_recommendations()
+            needs_save = True
+
+        if needs_save:
+            recommender.save_profiles(product_profile_path=self.artifact_path)
+            print("✓ 상품 프로필 생성 및 저장 완료")
+
+        # 직접 저장한 파일을 외부에서 다시 저장된 아티팩트로 오인하지 않도록 기록
+        self._artifact_mtime = self._read_artifact_mtime()
+
+    def load(self) -> RecommenderSnapshot:
+        """
+        아티팩트로 첫 스냅샷 생성 (서버 시작 시)
+
+        Returns:
+            RecommenderSnapshot: 활성 스냅샷
+        """
+        with self._lock:
+            return self._publish(self._load_from_artifacts(), 'build')
+
+    def refresh(self) -> bool:
+        """
+        다음 스냅샷을 만들어 교체 (백그라운드 작업에서 호출)
+
+        아티팩트 파일이 외부에서 다시 저장되었으면 새로 로드하고, 아니면
+        현재 스냅샷의 사본에 신규 리뷰를 증분 반영합니다. 현재 스냅샷은 변경되지 않습니다.
+
+        Returns:
+            bool: 새 스냅샷으로 교체했으면 True
+        """
+        with self._lock:
+            if self._current is None:
+                self._publish(self._load_from_artifacts(), 'build')
+                return True
+
+            mtime = self._read_artifact_mtime()
+            if mtime is not None and mtime != self._artifact_mtime:
+                self._publish(self._load_from_artifacts(), 'artifact')
+                return True
+
+            candidate = self._current.recommender.clone()
+            refreshed = candidate.refresh_profiles_since()
+            if refreshed == PROFILES_REBUILT:
+                # 전체 재생성한 사본을 교체하고, 다음 갱신부터 증분 반영되도록 저장
+                self._complete_and_save(candidate, needs_save=True)
+                self._publish(candidate, 'build')
+                return True
+            if refreshed == 0:
+                return False
+
+            self._publish(candidate, 'incremental')
+            return True
@@ -4,6 +4,7 @@
 리뷰 텍스트를 전처리하고 정제하는 기능을 제공합니다.
 """
 import re
+import threading
 from typing import List, Optional
 from kiwipiepy import Kiwi
 
@@ -14,11 +15,10 @@ class KoreanTextCleaner:
     def __init__(self):
         """
         KoreanTextCleaner 초기화
-        Kiwi 형태소 분석기를 로드합니다.
+        Kiwi 형태소 분석기는 처음 사용할 때(또는 warm_up 호출 시) 로드합니다.
         """
-        print("Kiwi 형태소 분석기를 초기화합니다...")
-        self.kiwi = Kiwi()
-        print("✓ Kiwi 초기화 완료")
+        self._kiwi = None
+        self._kiwi_lock = threading.Lock()
         
         # 불용어 리스트 (stopwords)
         self.stopwords = {
@@ -28,6 +28,21 @@ class KoreanTextCleaner:
             '등', '이', '들', '안', '못', '점', '너무', '정말', '진짜', '아주'
         }
     
+    @property
+    def kiwi(self) -> Kiwi:
+        """Kiwi 형태소 분석기 (처음 접근할 때 한 번만 초기화, 스레드 안전)"""
+        if self._kiwi is None:
+            with self._kiwi_lock:
+                if self._kiwi is None:
+                    print("Kiwi 형태소 분석기를 초기화합니다...")
+                    self._kiwi = Kiwi()
+                    print("✓ Kiwi 초기화 완료")
+        return self._kiwi
+    
+    def warm_up(self):
+        """Kiwi 형태소 분석기를 미리 초기화하고 첫 분석을 실행 (첫 요청 지연 방지)"""
+        self.kiwi.tokenize("초기화 확인용 문장입니다.")
+    
     def remove_special_characters(self, text: str) -> str:
         """
         특수문자 제거
@@ -225,6 +240,29 @@ class KoreanTextCleaner:
         }
 
 
+# 프로세스 전역 정제기 (Kiwi 모델은 인스턴스마다 약 500MB이므로 프로세스당 하나만 로드)
+_shared_cleaner = None
+_shared_cleaner_lock = threading.Lock()
+
+
+def shared_cleaner() -> KoreanTextCleaner:
+    """
+    프로세스 전역 KoreanTextCleaner 조회 (없으면 생성)
+
+    추천 시스템과 부정 리뷰 분석기가 같은 Kiwi 인스턴스를 사용하며,
+    api.launcher가 fork 전에 초기화하면 워커 프로세스들이 모델 메모리를 공유합니다.
+
+    Returns:
+        KoreanTextCleaner: 공유 정제기
+    """
+    global _shared_cleaner
+    if _shared_cleaner is None:
+        with _shared_cleaner_lock:
+            if _shared_cleaner is None:
+                _shared_cleaner = KoreanTextCleaner()
+    return _shared_cleaner
+
+
 def example_usage():
     """사용 예제"""
     print("=" * 80)
@@ -0,0 +1,63 @@
+"""
+pytest 공통 픽스처
+
+테스트는 data/reviews.db를 임시 디렉토리로 복사해 사용하며, 캐시 파일도 임시 디렉토리에
+저장하므로 작업 트리의 데이터베이스와 cache/ 디렉토리는 변경되지 않습니다.
+"""
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+from src.db import close_connections
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 증분 갱신 테스트에서 나중에 추가할 리뷰 수
+HELD_OUT_REVIEWS = 200
+
+
+@pytest.fixture
+def review_db(tmp_path, monkeypatch):
+    """
+    리뷰 데이터베이스 사본 경로 (작업 디렉토리도 임시 디렉토리로 변경)
+
+    Returns:
+        str: 복사한 데이터베이스 파일 경로
+    """
+    db_path = str(tmp_path / 'reviews.db')
+    shutil.copy(os.path.join(ROOT, 'data', 'reviews.db'), db_path)
+    monkeypatch.chdir(tmp_path)
+    yield db_path
+    close_connections()
+
+
+@pytest.fixture
+def held_out_reviews(review_db):
+    """
+    마지막 HELD_OUT_REVIEWS개 리뷰를 지우고, 다시 추가하는 함수를 반환
+
+    Returns:
+        Callable[[], None]: 지운 리뷰를 원래 rowid 순서대로 다시 추가하는 함수
+    """
+    with sqlite3.connect(review_db) as conn:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(reviews)")]
+        max_rowid = conn.execute("SELECT MAX(rowid) FROM reviews").fetchone()[0]
+        cutoff = max_rowid - HELD_OUT_REVIEWS
+        rows = conn.execute(
+            "SELECT * FROM reviews WHERE rowid > ? ORDER BY rowid", (cutoff,)
+        ).fetchall()
+        conn.execute("DELETE FROM reviews WHERE rowid > ?", (cutoff,))
+    conn.close()
+
+    def restore():
+        placeholders = ', '.join('?' * len(columns))
+        with sqlite3.connect(review_db) as conn:
+            conn.executemany(
+                f"INSERT INTO reviews ({', '.join(columns)}) VALUES ({placeholders})",
+                rows
+            )
+        conn.close()
+
+    return restore
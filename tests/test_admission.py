@@ -0,0 +1,42 @@
+"""엔드포인트 동시 실행 제한 테스트"""
+import asyncio
+from collections import Counter
+
+from fastapi import HTTPException
+
+from api.admission import AdmissionLimiter
+
+
+async def _burst(limiter: AdmissionLimiter, requests: int, seconds: float) -> Counter:
+    """같은 이벤트 루프 틱에 요청을 한꺼번에 보내고 상태 코드별 개수 집계"""
+    async def call():
+        try:
+            async with limiter.slot():
+                await asyncio.sleep(seconds)
+            return 200
+        except HTTPException as e:
+            assert 'Retry-After' in e.headers
+            return e.status_code
+
+    return Counter(await asyncio.gather(*(call() for _ in range(requests))))
+
+
+def test_burst_admits_concurrency_plus_queue_and_sheds_rest():
+    limiter = AdmissionLimiter('test', concurrency=2, queue_size=4, queue_timeout=10)
+
+    results = asyncio.run(_burst(limiter, requests=50, seconds=0.05))
+
+    assert results == {200: 6, 429: 44}
+    assert limiter.rejected == {'queue_full': 44, 'timeout': 0}
+    assert limiter.active == 0
+    assert limiter.waiting == 0
+
+
+def test_queued_request_times_out_with_503():
+    limiter = AdmissionLimiter('test', concurrency=1, queue_size=1, queue_timeout=0.05)
+
+    results = asyncio.run(_burst(limiter, requests=3, seconds=0.5))
+
+    assert results == {200: 1, 503: 1, 429: 1}
+    assert limiter.active == 0
+    assert limiter.waiting == 0
@@ -0,0 +1,100 @@
+"""근사 최근접 이웃(LSH) 인덱스 테스트 (정확 계산 대비 재현율과 정확 계산 대체 경로 확인)"""
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+
+from src.ann_index import RandomProjectionLSH
+from src.recommendation_system import (
+    ANN_MIN_CATALOG, DEFAULT_ANN_PROBES, RecommendationSystem
+)
+
+# 재현율 측정용 합성 카탈로그 (군집 중심 주변에 흩어진 정규화 벡터)
+N_CLUSTERS = 60
+ITEMS_PER_CLUSTER = 50
+DIM = 128
+TOP_K = 10
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """행별 L2 정규화"""
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+@pytest.fixture(scope='module')
+def clustered_catalog():
+    """(상품 벡터, 질의 벡터) 합성 데이터"""
+    rng = np.random.default_rng(7)
+    centers = rng.standard_normal((N_CLUSTERS, DIM))
+    items = np.repeat(centers, ITEMS_PER_CLUSTER, axis=0)
+    items = _normalize(items + 0.5 * rng.standard_normal(items.shape))
+    queries = _normalize(centers + 0.5 * rng.standard_normal(centers.shape))
+    return csr_matrix(items.astype(np.float32)), queries.astype(np.float32)
+
+
+def test_lsh_recall_against_exact_top_k(clustered_catalog):
+    items, queries = clustered_catalog
+    index = RandomProjectionLSH().fit(items)
+
+    recalls = []
+    for query in queries:
+        exact = np.argsort(-(items @ query))[:TOP_K]
+        candidates = index.query(csr_matrix(query), n_probes=DEFAULT_ANN_PROBES)
+        recalls.append(np.isin(exact, candidates).mean())
+        # 후보만 스캔해야 의미가 있으므로 카탈로그 전체가 후보가 되면 안 됨
+        assert len(candidates) < items.shape[0]
+
+    assert np.mean(recalls) >= 0.9
+
+
+def test_query_before_fit_raises_value_error():
+    with pytest.raises(ValueError):
+        RandomProjectionLSH().query(csr_matrix(np.ones((1, 4), dtype=np.float32)))
+
+
+@pytest.fixture
+def recommender(review_db):
+    """실제 리뷰 데이터 사본으로 만든 추천 시스템 (상품 수 < ANN_MIN_CATALOG)"""
+    recommender = RecommendationSystem(db_path=review_db)
+    recommender.build_all_product_profiles()
+    return recommender
+
+
+def _product_ids(recommendations):
+    """추천 결과의 상품 ID 목록"""
+    return [item['product_id'] for item in recommendations]
+
+
+def test_small_catalog_uses_exact_scoring(recommender):
+    assert len(recommender.product_ids) < ANN_MIN_CATALOG
+    recommender.ann_index = None
+
+    automatic = recommender.recommend_products(100, top_n=5)
+
+    assert recommender.ann_index is None
+    assert automatic == recommender.recommend_products(100, top_n=5, use_ann=False)
+
+
+def test_too_few_candidates_falls_back_to_exact(recommender, monkeypatch):
+    exact = recommender.recommend_products(100, top_n=5, use_ann=False)
+    recommender.build_ann_index()
+    # 버킷에서 후보가 하나만 나오면 top_n보다 적으므로 정확 계산으로 대체
+    monkeypatch.setattr(recommender.ann_index, 'query',
+                        lambda vector, n_probes=0: np.array([0], dtype=np.int64))
+
+    assert recommender.recommend_products(100, top_n=5, use_ann=True) == exact
+
+
+def test_ann_recommendations_match_exact_on_real_catalog(recommender):
+    recommender.build_ann_index()
+
+    overlaps = []
+    for customer_id in (7, 50, 100, 200, 300):
+        exact = _product_ids(
+            recommender.recommend_products(customer_id, top_n=5, use_ann=False)
+        )
+        approximate = _product_ids(
+            recommender.recommend_products(customer_id, top_n=5, use_ann=True)
+        )
+        overlaps.append(len(set(exact) & set(approximate)) / max(len(exact), 1))
+
+    assert np.mean(overlaps) >= 0.8
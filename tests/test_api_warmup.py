@@ -0,0 +1,79 @@
+"""워밍업 전 API 동작 테스트 (추천 스냅샷 없이 리뷰 DB만 읽는 엔드포인트, 워밍업/스냅샷 갱신 실패 처리)"""
+import asyncio
+import pickle
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import api_server
+from api.response_cache import ResponseCache
+
+
+@pytest.fixture
+def client(review_db, monkeypatch):
+    """워밍업(서버 시작 이벤트)을 실행하지 않은 테스트 클라이언트 (리뷰 DB는 사본 사용)"""
+    monkeypatch.setattr(api_server, 'REVIEW_DB_PATH', review_db)
+    monkeypatch.setattr(api_server, 'response_cache', ResponseCache(review_db))
+    assert api_server.snapshots.current is None
+    return TestClient(api_server.app)
+
+
+def test_recommendations_wait_for_warm_up(client):
+    response = client.get('/api/v1/recommend/1')
+
+    assert response.status_code == 503
+    assert 'Retry-After' in response.headers
+
+
+def test_stats_overview_is_served_before_warm_up(client):
+    response = client.get('/api/v1/stats/overview')
+
+    assert response.status_code == 200
+    overview = response.json()['overview']
+    assert overview['total_reviews'] > 0
+    assert overview['total_customers'] > 0
+
+
+def test_negative_analysis_export_is_served_before_warm_up(client):
+    with client.stream('GET', '/api/v1/export/negative-analysis') as response:
+        assert response.status_code == 200
+        first_line = next(response.iter_lines())
+
+    assert 'product_id' in first_line
+
+
+def test_warm_up_failure_is_reported_without_detail(client, monkeypatch):
+    def fail_load():
+        raise sqlite3.OperationalError('unable to open database file /secret/path')
+
+    monkeypatch.setattr(api_server.snapshots, 'load', fail_load)
+    monkeypatch.setattr(api_server, 'PROFILE_REFRESH_INTERVAL', 0)
+    monkeypatch.setattr(api_server, 'warmup_failed', False)
+    asyncio.run(api_server.warm_up())
+
+    response = client.get('/ready')
+
+    assert response.status_code == 503
+    assert '워밍업 실패' in response.json()['message']
+    assert '/secret/path' not in response.text
+
+
+def test_refresh_loop_survives_snapshot_errors(monkeypatch):
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ValueError('bad artifact')
+        if len(calls) == 2:
+            raise pickle.UnpicklingError('truncated artifact')
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(api_server.snapshots, 'refresh', refresh)
+    monkeypatch.setattr(api_server, 'PROFILE_REFRESH_INTERVAL', 0)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(api_server.refresh_profiles_periodically())
+
+    assert len(calls) == 3
@@ -0,0 +1,56 @@
+"""상품 프로필 증분 갱신 테스트 (증분 반영 결과가 전체 재생성과 같은지 확인)"""
+import numpy as np
+import pytest
+
+from src.recommendation_system import RecommendationSystem
+
+
+def _vectors_by_product(recommender: RecommendationSystem, product_ids) -> np.ndarray:
+    """상품 ID 순서대로 정렬한 상품 벡터 행렬"""
+    rows = [recommender.product_index[pid] for pid in product_ids]
+    return recommender.product_vectors[rows].toarray()
+
+
+@pytest.mark.parametrize('settings', [
+    pytest.param({}, id='default'),
+    pytest.param({'compact': True}, id='compact'),
+    pytest.param({'profile_top_k': 10}, id='top_k'),
+    pytest.param({'hash_features': 4096}, id='hash'),
+    pytest.param({'hash_features': 4096, 'compact': True}, id='hash-compact'),
+])
+def test_incremental_refresh_matches_rebuild(review_db, held_out_reviews, settings):
+    incremental = RecommendationSystem(db_path=review_db, **settings)
+    incremental.build_all_product_profiles()
+
+    held_out_reviews()
+    refreshed = incremental.refresh_profiles_since()
+
+    rebuilt = RecommendationSystem(db_path=review_db, **settings)
+    rebuilt.build_all_product_profiles()
+
+    assert refreshed > 0
+    assert incremental.last_review_rowid == rebuilt.last_review_rowid
+    assert sorted(incremental.product_ids) == sorted(rebuilt.product_ids)
+    if settings.get('hash_features'):
+        # 해시 버킷은 열 순서가 고정이므로 벡터를 그대로 비교
+        np.testing.assert_allclose(
+            _vectors_by_product(incremental, rebuilt.product_ids),
+            _vectors_by_product(rebuilt, rebuilt.product_ids),
+            atol=1e-6
+        )
+        return
+
+    # 어휘 모드는 새 키워드가 뒤에 추가되어 열 순서가 다르므로 키워드별로 비교
+    for product_id in rebuilt.product_ids:
+        expected = rebuilt.get_product_profile(product_id)
+        actual = incremental.get_product_profile(product_id)
+        assert actual.keys() == expected.keys()
+        for keyword, weight in expected.items():
+            assert actual[keyword] == pytest.approx(weight, abs=1e-6)
+
+
+def test_refresh_without_new_reviews_is_noop(review_db):
+    recommender = RecommendationSystem(db_path=review_db)
+    recommender.build_all_product_profiles()
+
+    assert recommender.refresh_profiles_since() == 0
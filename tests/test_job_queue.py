@@ -0,0 +1,155 @@
+"""백그라운드 작업 큐 테스트 (리스/heartbeat 기반 복구, 결과 기록, 작업 파라미터 검증)"""
+import sqlite3
+import time
+
+import pytest
+
+from api.api_server import JobRequest
+from src.db import close_connections
+from src.job_queue import JobQueue
+from src.job_worker import JOB_FAILURE_MESSAGE, JOB_HANDLERS, JobWorker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """조작 가능한 시계 (clock[0]을 바꾸면 time.time()이 그 값을 반환)"""
+    now = [time.time()]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """임시 파일 작업 큐"""
+    yield JobQueue(str(tmp_path / 'jobs.db'))
+    close_connections()
+
+
+def test_heartbeat_keeps_slow_job_running(queue, clock):
+    job_id = queue.enqueue('send-report', {'recipient_email': 'a@example.com'})
+    job = queue.claim('worker-1', lease=60)
+    assert job['job_id'] == job_id
+
+    # 리스 기간보다 오래 실행되어도 heartbeat로 연장하면 다시 대기열로 가지 않음
+    for _ in range(5):
+        clock[0] += 30
+        assert queue.heartbeat(job_id, 'worker-1', lease=60)
+        assert queue.recover_stale(lease=60) == 0
+
+    assert queue.get(job_id)['status'] == 'running'
+    assert queue.claim('worker-2', lease=60) is None
+
+
+def test_expired_lease_is_requeued_and_old_worker_loses_it(queue, clock):
+    job_id = queue.enqueue('negative-analysis', {'top_n': 3})
+    queue.claim('worker-1', lease=60)
+
+    clock[0] += 61
+    assert queue.recover_stale(lease=60) == 1
+    assert queue.get(job_id)['status'] == 'queued'
+    # 죽은 것으로 판단된 워커는 더 이상 리스를 연장할 수 없음
+    assert not queue.heartbeat(job_id, 'worker-1', lease=60)
+
+    job = queue.claim('worker-2', lease=60)
+    assert job['job_id'] == job_id
+    assert job['attempts'] == 2
+
+
+def test_old_worker_cannot_finish_reclaimed_job(queue, clock):
+    job_id = queue.enqueue('negative-analysis', {'top_n': 3})
+    queue.claim('worker-1', lease=60)
+    clock[0] += 61
+    queue.recover_stale(lease=60)
+    queue.claim('worker-2', lease=60)
+
+    # 리스를 잃은 이전 워커가 늦게 끝나도 새 워커의 실행을 덮어쓰지 않음
+    assert not queue.fail(job_id, 'worker-1', 'late failure')
+    assert not queue.complete(job_id, 'worker-1', {'stale': True})
+    assert queue.get(job_id)['status'] == 'running'
+
+    assert queue.complete(job_id, 'worker-2', {'ok': True})
+    job = queue.get(job_id)
+    assert job['status'] == 'succeeded'
+    assert job['result'] == {'ok': True}
+
+
+def test_failed_job_stores_generic_error(tmp_path, monkeypatch):
+    def broken_handler(params, db_path):
+        raise RuntimeError('connection refused: smtp.internal:587')
+
+    monkeypatch.setitem(JOB_HANDLERS, 'send-report', broken_handler)
+    worker = JobWorker(str(tmp_path / 'jobs.db'), 'unused.db')
+    job_id = worker.queue.enqueue('send-report', {'recipient_email': 'a@example.com'})
+
+    assert worker.run_once()
+    job = worker.queue.get(job_id)
+    assert job['status'] == 'failed'
+    assert job['error'] == JOB_FAILURE_MESSAGE
+    close_connections()
+
+
+def test_expired_lease_fails_after_max_attempts(queue, clock):
+    job_id = queue.enqueue('negative-analysis')
+    for _ in range(2):
+        queue.claim('worker', lease=60)
+        clock[0] += 61
+        queue.recover_stale(max_attempts=2, lease=60)
+
+    job = queue.get(job_id)
+    assert job['status'] == 'failed'
+    assert job['attempts'] == 2
+
+
+def test_old_queue_file_gains_lease_column(tmp_path, clock):
+    db_path = str(tmp_path / 'jobs.db')
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE jobs (
+                job_id TEXT PRIMARY KEY, job_type TEXT NOT NULL, params TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued', result TEXT, error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0, worker TEXT,
+                created_at REAL NOT NULL, started_at REAL, finished_at REAL
+            )
+        """)
+        conn.execute(
+            "INSERT INTO jobs (job_id, job_type, params, status, attempts, worker, "
+            "created_at, started_at) VALUES ('old', 'negative-analysis', '{}', "
+            "'running', 1, 'worker', ?, ?)", (clock[0], clock[0])
+        )
+    conn.close()
+
+    queue = JobQueue(db_path)
+    columns = {row[1] for row in queue._conn().execute("PRAGMA table_info(jobs)")}
+    assert 'lease_expires_at' in columns
+
+    # 리스 없이 시작된 작업은 시작 시각 + lease가 지나야 복구
+    assert queue.recover_stale(lease=60) == 0
+    clock[0] += 61
+    assert queue.recover_stale(lease=60) == 1
+    assert queue.get('old')['status'] == 'queued'
+    close_connections()
+
+
+@pytest.mark.parametrize('job_type, params', [
+    ('negative-analysis', {'top_n': 'abc'}),
+    ('negative-analysis', {'top_n': 0}),
+    ('negative-analysis', {'top_n': 51}),
+    ('negative-analysis', {'limit': 3}),
+    ('send-report', {}),
+    ('send-report', {'recipient_email': 'not-an-email'}),
+    ('send-report', {'recipient_email': 'a@example.com', 'attach_raw_data': 'maybe'}),
+])
+def test_invalid_job_params_are_rejected(job_type, params):
+    with pytest.raises(ValueError):
+        JobRequest(job_type=job_type, params=params).validated_params()
+
+
+def test_job_params_defaults_are_filled():
+    negative = JobRequest(job_type='negative-analysis', params={})
+    report = JobRequest(job_type='send-report',
+                        params={'recipient_email': 'a@example.com'})
+
+    assert negative.validated_params() == {'top_n': 5}
+    assert report.validated_params() == {
+        'recipient_email': 'a@example.com', 'attach_raw_data': False
+    }
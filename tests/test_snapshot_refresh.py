@@ -0,0 +1,96 @@
+"""추천 스냅샷 갱신 테스트 (이전 포맷/버전 아티팩트를 재생성하고 증분 갱신으로 전환되는지 확인)"""
+import os
+import pickle
+
+from src.recommendation_system import ARTIFACT_VERSION, RecommendationSystem
+from src.recommender_snapshot import SnapshotManager
+from api.request_metrics import render_metrics
+
+ARTIFACT_PATH = os.path.join('cache', 'product_profiles.pkl')
+
+
+def _manager(db_path: str) -> SnapshotManager:
+    """임시 데이터베이스를 사용하는 SnapshotManager"""
+    return SnapshotManager(
+        factory=lambda: RecommendationSystem(db_path=db_path),
+        artifact_path=ARTIFACT_PATH
+    )
+
+
+def _write_legacy_artifact(db_path: str):
+    """증분 갱신 정보가 없는 이전 포맷({상품 ID: 프로필}) 아티팩트 저장"""
+    recommender = RecommendationSystem(db_path=db_path)
+    recommender.build_all_product_profiles()
+    os.makedirs('cache', exist_ok=True)
+    with open(ARTIFACT_PATH, 'wb') as f:
+        pickle.dump(recommender.product_profiles, f)
+
+
+def test_legacy_artifact_is_rebuilt_and_saved_on_load(review_db, held_out_reviews):
+    _write_legacy_artifact(review_db)
+
+    manager = _manager(review_db)
+    snapshot = manager.load()
+
+    assert snapshot.recommender.supports_incremental_refresh()
+    with open(ARTIFACT_PATH, 'rb') as f:
+        artifacts = pickle.load(f)
+    assert artifacts['last_review_rowid'] == snapshot.last_review_rowid
+    assert artifacts['product_counts']
+
+    # 다시 저장한 아티팩트 기준으로 다음 갱신부터 신규 리뷰만 증분 반영
+    assert manager.refresh() is False
+    held_out_reviews()
+    assert manager.refresh() is True
+    assert manager.current.source == 'incremental'
+    assert manager.current.version == snapshot.version + 1
+
+
+def test_refresh_rebuilds_snapshot_without_incremental_state(review_db):
+    manager = _manager(review_db)
+    previous = manager.load()
+    previous_rowid = previous.last_review_rowid
+
+    # 증분 갱신 정보가 없는 스냅샷 (이전 포맷 캐시에서 로드한 상태)
+    previous.recommender.product_counts = {}
+    previous.recommender.last_review_rowid = None
+    assert not previous.recommender.supports_incremental_refresh()
+
+    assert manager.refresh() is True
+    current = manager.current
+    assert current is not previous
+    assert current.source == 'build'
+    assert current.recommender.supports_incremental_refresh()
+    assert current.last_review_rowid == previous_rowid
+    # 재생성본을 저장했으므로 다음 갱신은 증분 경로에서 변경 없음
+    assert manager.refresh() is False
+
+
+def test_artifact_with_other_format_version_is_rebuilt(review_db):
+    _manager(review_db).load()
+
+    # 이전 버전 번들: 버전 번호가 다르고 이후 버전에서 추가된 항목이 없음
+    with open(ARTIFACT_PATH, 'rb') as f:
+        artifacts = pickle.load(f)
+    artifacts['format_version'] = ARTIFACT_VERSION - 1
+    del artifacts['purchase_index']
+    with open(ARTIFACT_PATH, 'wb') as f:
+        pickle.dump(artifacts, f)
+
+    snapshot = _manager(review_db).load()
+
+    assert snapshot.recommender.supports_incremental_refresh()
+    with open(ARTIFACT_PATH, 'rb') as f:
+        assert pickle.load(f)['format_version'] == ARTIFACT_VERSION
+
+
+def test_metrics_report_loaded_artifact_format(review_db):
+    _manager(review_db).load()
+
+    # 외부에서 저장된 아티팩트를 그대로 로드한 스냅샷의 형식 버전을 내보냄
+    snapshot = _manager(review_db).load()
+    assert snapshot.recommender.format_version == ARTIFACT_VERSION
+
+    cache_stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'entries': 0}
+    metrics = render_metrics(cache_stats, snapshot)
+    assert f'artifact_format="{ARTIFACT_VERSION}"' in metrics